@@ -0,0 +1,103 @@
+"""
+Build a self-contained, single-file ``aamad.pyz`` executable.
+
+The archive holds the ``aamad`` package, both artifact bundles and a
+``__main__.py`` entry point. It needs nothing but a Python 3.9+ interpreter:
+without PyYAML the converters fall back to ``aamad.miniyaml``, and bundles are
+read straight from the archive (``aamad.installer.open_bundle``), never
+extracted to a temporary directory.
+
+The nested bundles are stored uncompressed so reading them is a plain copy,
+and bytecode for the building interpreter is embedded next to the sources so
+start-up skips compilation (other interpreters fall back to the sources).
+
+Usage:
+    python scripts/build_zipapp.py [--output dist/aamad.pyz] [--no-compile]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import py_compile
+import stat
+import tempfile
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "src" / "aamad"
+DEFAULT_OUTPUT = ROOT / "dist" / "aamad.pyz"
+
+SHEBANG = b"#!/usr/bin/env python3\n"
+MAIN_PY = """import sys
+
+from aamad.cli import main
+
+sys.exit(main())
+"""
+
+
+def _bytecode(source: Path) -> bytes:
+    """Compile ``source`` to an unchecked hash-based .pyc (valid inside a zip)."""
+    fd, tmp = tempfile.mkstemp(suffix=".pyc")
+    os.close(fd)
+    try:
+        py_compile.compile(
+            str(source),
+            cfile=tmp,
+            dfile=f"aamad/{source.relative_to(PACKAGE_DIR).as_posix()}",
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        return Path(tmp).read_bytes()
+    finally:
+        os.unlink(tmp)
+
+
+def build_zipapp(output: Path = DEFAULT_OUTPUT, *, compile_bytecode: bool = True) -> Path:
+    """
+    Write the zipapp to ``output`` and make it executable.
+
+    Args:
+        output: Destination ``.pyz`` path.
+        compile_bytecode: Embed ``.pyc`` files for the running interpreter.
+
+    Returns:
+        The written path.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f".{output.name}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(SHEBANG)
+        with zipfile.ZipFile(fh, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("__main__.py", MAIN_PY)
+            for source in sorted(PACKAGE_DIR.rglob("*.py")):
+                if "__pycache__" in source.parts:
+                    continue
+                arcname = f"aamad/{source.relative_to(PACKAGE_DIR).as_posix()}"
+                zf.write(source, arcname)
+                if compile_bytecode:
+                    zf.writestr(arcname + "c", _bytecode(source))
+            for bundle in sorted((PACKAGE_DIR / "data").glob("*.zip")):
+                # Already compressed; storing keeps reads a straight copy
+                zf.write(bundle, f"aamad/data/{bundle.name}", compress_type=zipfile.ZIP_STORED)
+    os.replace(tmp, output)
+    output.chmod(output.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return output
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the single-file aamad.pyz executable.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Output path (default: dist/aamad.pyz).")
+    parser.add_argument("--no-compile", dest="compile_bytecode", action="store_false", help="Ship sources only.")
+    args = parser.parse_args(argv)
+    path = build_zipapp(args.output, compile_bytecode=args.compile_bytecode)
+    print(f"Built {path} ({path.stat().st_size} bytes, magic {importlib.util.MAGIC_NUMBER.hex()})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
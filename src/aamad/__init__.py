@@ -10,12 +10,15 @@ from __future__ import annotations
 
 from importlib import metadata
 
-from .installer import ArtifactInstaller, extract_artifacts, get_bundle_path
+from .installer import ArtifactInstaller, extract_artifacts, get_bundle_path, install_artifacts
+from .report import InstallReport
 
 __all__ = [
     "ArtifactInstaller",
     "extract_artifacts",
     "get_bundle_path",
+    "install_artifacts",
+    "InstallReport",
     "__version__",
 ]
 
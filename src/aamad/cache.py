@@ -0,0 +1,43 @@
+"""
+Local cache directory shared by AAMAD's derived artifacts.
+
+The location is ``$AAMAD_CACHE_DIR`` when set (e.g. a shared directory for a
+CI fleet), else ``$XDG_CACHE_HOME/aamad`` or ``~/.cache/aamad``. Entries are
+published by writing a private temporary file and renaming it into place, so
+concurrent writers never expose partial files and readers need no locks.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR_ENV = "AAMAD_CACHE_DIR"
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return (without creating) the cache directory, or a sub-directory of it."""
+    base = os.environ.get(CACHE_DIR_ENV)
+    if base:
+        root = Path(base)
+    else:
+        root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "aamad"
+    return root.joinpath(*parts).expanduser()
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> Path:
+    """Publish ``data`` at ``path`` via a temporary file and an atomic rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; entries may be shared
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+    return path
@@ -10,30 +10,17 @@ from __future__ import annotations
 
 import json
 import re
+import time
 from pathlib import Path
-from typing import Any
-
-# Rule order for CLAUDE.md summary and split output (dependency order)
-RULE_ORDER = [
-    "aamad-core",
-    "development-workflow",
-    "epics-index",
-    "adapter-registry",
-    "adapter-crewai",
-    "adapter-claude-agent-sdk",
-    "adapter-cursor-sdk",
-]
-
-# Agent files to convert (exclude dev-crew.md index)
-AGENT_IDS = [
-    "product-mgr",
-    "system-arch",
-    "project-mgr",
-    "frontend-eng",
-    "backend-eng",
-    "integration-eng",
-    "qa-eng",
-]
+from typing import Any, Iterable
+
+from .compact import CompactStats, compact_bodies
+from .events import EventSink, file_event
+from .globs import split_globs
+from .miniyaml import load_yaml
+from .rewrite import CLAUDE_CODE_REWRITER
+from .runtime import DEFAULT_RUNTIME, RUNTIME_ENV
+from .sources import AGENT_IDS, RULE_ORDER, agent_stems, rule_stems, source_stems
 
 # Default tools for Claude Code agents (most personas need these)
 DEFAULT_TOOLS = "Read, Edit, Write, Bash, Grep, Glob"
@@ -42,14 +29,19 @@ DEFAULT_TOOLS = "Read, Edit, Write, Bash, Grep, Glob"
 DISALLOW_WEBFETCH_IDS = {"backend-eng", "frontend-eng", "integration-eng", "qa-eng", "project-mgr"}
 
 
+def _converted(on_event: EventSink | None, path: Path, start: float) -> None:
+    """Report one written output as a ``converted`` file event (see aamad.events)."""
+    if on_event is not None:
+        on_event(file_event("converted", path, duration=time.perf_counter() - start))
+
+
 def _parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
     """Split YAML frontmatter and body. Returns (frontmatter_dict, body)."""
     match = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)$", content, re.DOTALL)
     if not match:
         return {}, content.strip()
     try:
-        import yaml
-        fm = yaml.safe_load(match.group(1)) or {}
+        fm = load_yaml(match.group(1)) or {}
     except Exception:
         fm = {}
     body = match.group(2).strip()
@@ -57,16 +49,36 @@ def _parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
 
 
 def _rule_body_to_claude(body: str) -> str:
-    """Update path references from .cursor/rules/ to .claude/rules/ for Claude Code."""
-    # Update .cursor/rules/foo.mdc -> .claude/rules/foo.md
-    body = re.sub(
-        r"\.cursor/rules/([^\s\)\"']+\.)mdc",
-        r".claude/rules/\1md",
-        body,
-    )
-    # Catch any remaining .cursor/rules/ (without .mdc)
-    body = body.replace(".cursor/rules/", ".claude/rules/")
-    return body
+    """Update .cursor/ path references (rules, agents, prompts) for Claude Code."""
+    return CLAUDE_CODE_REWRITER.rewrite(body)
+
+
+def _rule_paths(fm: dict[str, Any]) -> list[str]:
+    """
+    Map Cursor alwaysApply/globs to Claude Code rule ``paths``.
+
+    Returns an empty list for rules that must stay global (alwaysApply, or no
+    globs). Negated globs are dropped; Claude Code has no exclusion syntax.
+    """
+    if fm.get("alwaysApply") is True:
+        return []
+    paths: list[str] = []
+    for pattern in split_globs(fm.get("globs")):
+        if not pattern.startswith("!") and pattern not in paths:
+            paths.append(pattern)
+    if "**" in paths:
+        return []
+    return paths
+
+
+def _rule_frontmatter(paths: list[str]) -> str:
+    """Claude Code path-scoped rule frontmatter (empty for global rules)."""
+    if not paths:
+        return ""
+    lines = ["---", "paths:"]
+    lines.extend(f"  - {json.dumps(p)}" for p in paths)
+    lines.extend(["---", "", ""])
+    return "\n".join(lines)
 
 
 def convert_rules(
@@ -74,14 +86,24 @@ def convert_rules(
     out_dir: Path,
     *,
     style: str = "split",
+    compact: bool = False,
+    compact_stats: CompactStats | None = None,
+    on_event: EventSink | None = None,
 ) -> list[Path]:
     """
     Convert .mdc rules to Claude Code format.
 
+    Rules with Cursor ``globs`` (and no ``alwaysApply``) are written with a
+    ``paths`` frontmatter so Claude Code only loads them for matching files;
+    CLAUDE.md lists which rules stay global.
+
     Args:
         cursor_rules_dir: Path to .cursor/rules/
         out_dir: Base output dir (e.g. project root); writes .claude/CLAUDE.md and .claude/rules/
         style: "split" (CLAUDE.md + rules/*.md) or "single" (one CLAUDE.md)
+        compact: Remove duplicate paragraphs across rules and strip decorative markdown
+        compact_stats: Optional accumulator for the compact size reduction
+        on_event: Receives a ``converted`` file event per written file
 
     Returns:
         List of created file paths.
@@ -92,22 +114,29 @@ def convert_rules(
 
     created: list[Path] = []
     rule_bodies: dict[str, str] = {}
+    rule_paths: dict[str, list[str]] = {}
 
-    for name in RULE_ORDER:
+    for name in source_stems(cursor_rules_dir, ".mdc", RULE_ORDER):
         mdc_path = cursor_rules_dir / f"{name}.mdc"
-        if not mdc_path.exists():
-            continue
         text = mdc_path.read_text(encoding="utf-8")
-        _, body = _parse_frontmatter(text)
-        body = _rule_body_to_claude(body)
-        rule_bodies[name] = body
+        fm, body = _parse_frontmatter(text)
+        rule_bodies[name] = _rule_body_to_claude(body)
+        rule_paths[name] = _rule_paths(fm)
+
+    scoped = [name for name, paths in rule_paths.items() if paths]
+    if compact:
+        rule_bodies = compact_bodies(rule_bodies, compact_stats, scoped=scoped)
 
-        if style == "split":
+    if style == "split":
+        for name, body in rule_bodies.items():
+            start = time.perf_counter()
             out_path = rules_out / f"{name}.md"
-            out_path.write_text(body, encoding="utf-8")
+            out_path.write_text(_rule_frontmatter(rule_paths[name]) + body, encoding="utf-8")
             created.append(out_path)
+            _converted(on_event, out_path, start)
 
     # CLAUDE.md: summary + cross-references for split; full consolidation for single
+    start = time.perf_counter()
     claude_md_path = claude_dir / "CLAUDE.md"
     if style == "split":
         lines = [
@@ -118,9 +147,16 @@ def convert_rules(
             "",
             "## Rule Files",
         ]
-        for name in RULE_ORDER:
-            if name in rule_bodies:
+        for name in rule_bodies:
+            if not rule_paths[name]:
                 lines.append(f"- [{name}](.claude/rules/{name}.md)")
+        if scoped:
+            lines.append("")
+            lines.append("## Path-Scoped Rule Files")
+            for name in scoped:
+                lines.append(
+                    f"- [{name}](.claude/rules/{name}.md) — {', '.join(rule_paths[name])}"
+                )
         lines.append("")
         lines.append("---")
         lines.append("")
@@ -128,12 +164,12 @@ def convert_rules(
         claude_md_path.write_text("\n".join(lines), encoding="utf-8")
     else:
         sections = []
-        for name in RULE_ORDER:
-            if name in rule_bodies:
-                sections.append(f"## {name.replace('-', ' ').title()}\n\n{rule_bodies[name]}")
+        for name in rule_bodies:
+            sections.append(f"## {name.replace('-', ' ').title()}\n\n{rule_bodies[name]}")
         claude_md_path.write_text("\n\n---\n\n".join(sections), encoding="utf-8")
 
     created.append(claude_md_path)
+    _converted(on_event, claude_md_path, start)
     return created
 
 
@@ -183,20 +219,21 @@ def _format_instructions(fm: dict) -> str:
 def convert_agents(
     cursor_agents_dir: Path,
     out_dir: Path,
+    *,
+    on_event: EventSink | None = None,
 ) -> list[Path]:
     """
     Convert .cursor/agents/*.md to .claude/agents/*.md with Claude Code frontmatter.
 
-    Skips dev-crew.md (index file). Converts only files matching AGENT_IDS.
+    Skips dev-crew.md (index file). Agents in AGENT_IDS come first, in that order.
     """
     claude_agents = out_dir / ".claude" / "agents"
     claude_agents.mkdir(parents=True, exist_ok=True)
     created: list[Path] = []
 
-    for agent_id in AGENT_IDS:
+    for agent_id in source_stems(cursor_agents_dir, ".md", AGENT_IDS):
+        start = time.perf_counter()
         md_path = cursor_agents_dir / f"{agent_id}.md"
-        if not md_path.exists():
-            continue
         text = md_path.read_text(encoding="utf-8")
         fm, body = _parse_frontmatter(text)
 
@@ -218,10 +255,11 @@ def convert_agents(
         frontmatter_lines.append("")
 
         # Ensure body has proper heading; keep original body
-        new_content = "\n".join(frontmatter_lines) + body
+        new_content = "\n".join(frontmatter_lines) + _rule_body_to_claude(body)
         out_path = claude_agents / f"{agent_id}.md"
         out_path.write_text(new_content, encoding="utf-8")
         created.append(out_path)
+        _converted(on_event, out_path, start)
 
     return created
 
@@ -229,6 +267,8 @@ def convert_agents(
 def convert_prompts(
     cursor_prompts_dir: Path,
     out_dir: Path,
+    *,
+    on_event: EventSink | None = None,
 ) -> list[Path]:
     """
     Convert Phase 1 prompt to Claude Code command.
@@ -243,13 +283,15 @@ def convert_prompts(
     if not prompt_path.exists():
         return []
 
-    content = prompt_path.read_text(encoding="utf-8")
+    start = time.perf_counter()
+    content = _rule_body_to_claude(prompt_path.read_text(encoding="utf-8"))
     out_path = claude_commands / "phase-1-define.md"
     out_path.write_text(content, encoding="utf-8")
+    _converted(on_event, out_path, start)
     return [out_path]
 
 
-def write_settings(out_dir: Path) -> Path:
+def write_settings(out_dir: Path, *, runtime: str = DEFAULT_RUNTIME) -> Path:
     """Write .claude/settings.json with permissions and AAMAD_TARGET_RUNTIME."""
     claude_dir = out_dir / ".claude"
     claude_dir.mkdir(parents=True, exist_ok=True)
@@ -268,18 +310,42 @@ def write_settings(out_dir: Path) -> Path:
             ]
         },
         "env": {
-            "AAMAD_TARGET_RUNTIME": "crewai",
+            RUNTIME_ENV: runtime,
         },
     }
     settings_path.write_text(json.dumps(settings, indent=2), encoding="utf-8")
     return settings_path
 
 
+def get_claude_planned_paths(dest: Path, sources: Iterable[str]) -> list[Path]:
+    """
+    Return the paths install_claude_code would create from ``sources`` (for dry-run).
+
+    Args:
+        dest: Output directory
+        sources: Bundle-relative names of the ``.cursor/`` sources to convert
+    """
+    dest = dest.resolve()
+    sources = list(sources)
+    paths = [dest / ".claude" / "rules" / f"{name}.md" for name in rule_stems(sources)]
+    paths.append(dest / ".claude" / "CLAUDE.md")
+    paths.extend(dest / ".claude" / "agents" / f"{agent_id}.md" for agent_id in agent_stems(sources))
+    if ".cursor/prompts/prompt-phase-1" in sources:
+        paths.append(dest / ".claude" / "commands" / "phase-1-define.md")
+    paths.append(dest / ".claude" / "settings.json")
+    return paths
+
+
 def install_claude_code(
     cursor_root: Path,
     dest: Path,
     *,
     overwrite: bool = False,
+    compact: bool = False,
+    compact_stats: CompactStats | None = None,
+    cache: bool = False,
+    on_event: EventSink | None = None,
+    runtime: str = DEFAULT_RUNTIME,
 ) -> list[Path]:
     """
     Run full Claude Code conversion: rules, agents, prompts, settings.
@@ -288,6 +354,12 @@ def install_claude_code(
         cursor_root: Project root containing .cursor/
         dest: Output directory (usually same as cursor_root)
         overwrite: If False, raise FileExistsError when target exists
+        compact: Emit deduplicated, minified rule context (see aamad.compact)
+        compact_stats: Optional accumulator for the compact size reduction
+        cache: Reuse converted outputs for unchanged sources (see aamad.conversion_cache)
+        on_event: Receives conversion-cache events and a ``converted`` file
+            event per output as it is written (see aamad.events)
+        runtime: Value of AAMAD_TARGET_RUNTIME in .claude/settings.json
 
     Returns:
         List of all created file paths.
@@ -311,12 +383,39 @@ def install_claude_code(
                 f"{claude_dir} already exists and contains files. Use overwrite=True to replace."
             )
 
-    created.extend(convert_rules(cursor_rules, dest, style="split"))
-    if cursor_agents.exists():
-        created.extend(convert_agents(cursor_agents, dest))
-    if cursor_prompts.exists():
-        created.extend(convert_prompts(cursor_prompts, dest))
-    write_settings(dest)
-    created.append(dest / ".claude" / "settings.json")
+    def convert(stats: CompactStats | None) -> list[Path]:
+        paths = convert_rules(
+            cursor_rules,
+            dest,
+            style="split",
+            compact=compact,
+            compact_stats=stats,
+            on_event=on_event,
+        )
+        if cursor_agents.exists():
+            paths.extend(convert_agents(cursor_agents, dest, on_event=on_event))
+        if cursor_prompts.exists():
+            paths.extend(convert_prompts(cursor_prompts, dest, on_event=on_event))
+        return paths
+
+    if cache:
+        from .conversion_cache import convert_cached
+
+        created.extend(
+            convert_cached(
+                cursor_root,
+                dest,
+                target="claude-code",
+                options={"compact": compact, "style": "split"},
+                convert=convert,
+                compact_stats=compact_stats,
+                on_event=on_event,
+            )
+        )
+    else:
+        created.extend(convert(compact_stats))
+    start = time.perf_counter()
+    created.append(write_settings(dest, runtime=runtime))
+    _converted(on_event, created[-1], start)
 
     return created
@@ -1,12 +1,40 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from dataclasses import asdict
 from pathlib import Path
 
-from .installer import ArtifactInstaller, extract_artifacts, get_bundle_path
+from .installer import ArtifactInstaller, BundleSource, extract_artifacts, get_bundle_resource
+from .limits import DEFAULT_LIMITS, ExtractLimits, LimitExceeded, parse_limits
+from .runtime import RUNTIMES
+from .selection import parse_selection
 
 IDE_CHOICES = ["cursor", "claude-code", "vscode"]
 
+# init output formats written while the install runs
+STREAM_FORMATS = ("jsonl", "fast-import")
+
+
+def _add_bundle_arguments(cmd: argparse.ArgumentParser) -> None:
+    cmd.add_argument(
+        "--bundle",
+        type=Path,
+        default=None,
+        help="Base bundle (zip or directory) to use instead of the embedded one.",
+    )
+    cmd.add_argument(
+        "--overlay",
+        type=Path,
+        action="append",
+        default=[],
+        help="Zip or directory layered over the bundle; later overlays win (repeatable).",
+    )
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -27,8 +55,11 @@ def build_parser() -> argparse.ArgumentParser:
     init_cmd.add_argument(
         "--ide",
         choices=IDE_CHOICES,
-        default="cursor",
-        help="Target IDE: cursor (default), claude-code, or vscode.",
+        default=None,
+        help=(
+            "Target IDE: cursor (default), claude-code, or vscode. "
+            "With --format fast-import the default is every IDE."
+        ),
     )
     init_cmd.add_argument(
         "--overwrite",
@@ -40,6 +71,135 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Preview extracted files without writing.",
     )
+    init_cmd.add_argument(
+        "--no-snapshot",
+        dest="snapshot",
+        action="store_false",
+        help="Do not snapshot replaced files before an --overwrite install.",
+    )
+    init_cmd.add_argument(
+        "--keep-snapshots",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of snapshots to retain under .aamad/snapshots/ (default: 10).",
+    )
+    init_cmd.add_argument(
+        "--compact",
+        action="store_true",
+        help=(
+            "Deduplicate and minify generated rule context (claude-code and vscode) "
+            "and report the size reduction."
+        ),
+    )
+    init_cmd.add_argument(
+        "--set",
+        dest="set_values",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Template value rendered into .cursor/templates/ and project-context/ (repeatable).",
+    )
+    init_cmd.add_argument(
+        "--values",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="YAML or JSON file of template values; --set entries take precedence.",
+    )
+    init_cmd.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Extraction threads (default: all CPUs for large bundles, else 1).",
+    )
+    init_cmd.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help=(
+            "Always re-run IDE conversion instead of reusing cached outputs "
+            "(the CLI caches by default; the Python API only with cache=True)."
+        ),
+    )
+    init_cmd.add_argument(
+        "--format",
+        choices=["text", "jsonl", "fast-import"],
+        default="text",
+        help=(
+            "Output format; jsonl streams phase and per-file events as they happen, "
+            "fast-import writes a git fast-import stream committing the install "
+            "instead of writing to DEST."
+        ),
+    )
+    init_cmd.add_argument(
+        "--branch",
+        default="main",
+        help="Branch the fast-import commit is created on (default: main).",
+    )
+    init_cmd.add_argument(
+        "--message",
+        default=None,
+        help="Commit message of the fast-import commit.",
+    )
+    init_cmd.add_argument(
+        "--from",
+        dest="parent",
+        default=None,
+        metavar="COMMIT",
+        help="Parent of the fast-import commit (required to add to an existing branch).",
+    )
+    init_cmd.add_argument(
+        "--split-templates",
+        action="store_true",
+        help="Also write each template as per-section files with an index, loaded on demand by agents.",
+    )
+    init_cmd.add_argument(
+        "--runtime",
+        choices=RUNTIMES,
+        default=None,
+        help=(
+            "Target runtime: install only its adapter rule and set AAMAD_TARGET_RUNTIME "
+            "(default: install every adapter)."
+        ),
+    )
+    init_cmd.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="SELECTOR",
+        help=(
+            "Install only matching files (repeatable): a component (agents, rules, templates, "
+            "prompts, project-context, docs, settings), an agent id or a glob."
+        ),
+    )
+    init_cmd.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="SELECTOR",
+        help="Do not install matching files (repeatable); same selectors as --only.",
+    )
+    init_cmd.add_argument(
+        "--limit",
+        dest="limits",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help=(
+            "Override an extraction limit (repeatable): total-bytes, member-bytes, ratio, "
+            "members or depth; 'none' disables it."
+        ),
+    )
+    init_cmd.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Give up if another install into DEST holds the lock this long (default: wait).",
+    )
+    _add_bundle_arguments(init_cmd)
 
     info_cmd = sub.add_parser(
         "bundle-info", help="Show the files bundled in the distribution."
@@ -55,35 +215,579 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print one path per line instead of a summarized count.",
     )
+    info_cmd.add_argument(
+        "--json",
+        action="store_true",
+        help=(
+            "Stream one JSON object per member (name, size, compressed size, CRC, ratio) "
+            "followed by a totals line."
+        ),
+    )
+    info_cmd.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only report members matching this glob (repeatable).",
+    )
+    info_cmd.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip members matching this glob (repeatable).",
+    )
+    _add_bundle_arguments(info_cmd)
+
+    rollback_cmd = sub.add_parser(
+        "rollback", help="Restore the files replaced by an --overwrite install."
+    )
+    rollback_cmd.add_argument(
+        "--dest",
+        type=Path,
+        default=Path.cwd(),
+        help="Install root (defaults to current working directory).",
+    )
+    rollback_cmd.add_argument(
+        "--to",
+        dest="snapshot_id",
+        default=None,
+        metavar="ID",
+        help="Snapshot id to restore (defaults to the newest).",
+    )
+    rollback_cmd.add_argument(
+        "--list",
+        action="store_true",
+        help="List stored snapshots instead of restoring.",
+    )
+
+    verify_cmd = sub.add_parser(
+        "verify", help="Check installed artifacts for drift from the bundle."
+    )
+    verify_cmd.add_argument(
+        "--dest",
+        type=Path,
+        default=Path.cwd(),
+        help="Install root (defaults to current working directory).",
+    )
+    verify_cmd.add_argument(
+        "--ide",
+        choices=IDE_CHOICES,
+        default="cursor",
+        help="Bundle the installation came from: cursor (default), claude-code, or vscode.",
+    )
+    verify_cmd.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of hashing threads.",
+    )
+    verify_cmd.add_argument(
+        "--full",
+        action="store_true",
+        help="Hash every file instead of skipping those whose size and mtime match the manifest.",
+    )
+    verify_cmd.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the drift report as JSON.",
+    )
+    _add_bundle_arguments(verify_cmd)
+
+    stats_cmd = sub.add_parser(
+        "context-stats",
+        help="Report the bytes and approximate tokens each agent request loads.",
+    )
+    stats_cmd.add_argument(
+        "--dest",
+        type=Path,
+        default=Path.cwd(),
+        help="Project root with installed artifacts (defaults to current working directory).",
+    )
+    stats_cmd.add_argument(
+        "--ide",
+        choices=IDE_CHOICES,
+        default="cursor",
+        help="Which IDE layout to measure: cursor (default), claude-code, or vscode.",
+    )
+    stats_cmd.add_argument(
+        "--file",
+        default=None,
+        help="Workspace-relative file being edited; path-scoped rules matching it are counted.",
+    )
+    stats_cmd.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON.",
+    )
+    stats_cmd.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="Exit with status 1 when the per-request token estimate exceeds this budget.",
+    )
+
+    context_cmd = sub.add_parser(
+        "context",
+        help="Index project-context/ artifacts by section and query them.",
+    )
+    context_sub = context_cmd.add_subparsers(dest="context_command", required=True)
+    index_cmd = context_sub.add_parser(
+        "index", help="Create or incrementally update the section index."
+    )
+    query_cmd = context_sub.add_parser(
+        "query", help="Print only the sections matching the given terms."
+    )
+    query_cmd.add_argument("terms", nargs="+", help="Search terms.")
+    query_cmd.add_argument(
+        "--limit",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Maximum number of sections to print (default: 5).",
+    )
+    query_cmd.add_argument(
+        "--json",
+        action="store_true",
+        help="Print matches as JSON.",
+    )
+    for cmd in (index_cmd, query_cmd):
+        cmd.add_argument(
+            "--dest",
+            type=Path,
+            default=Path.cwd(),
+            help="Project root containing project-context/ (defaults to current working directory).",
+        )
+
+    status_cmd = sub.add_parser(
+        "status",
+        help="Report workflow steps whose outputs are missing or stale after upstream edits.",
+    )
+    status_cmd.add_argument(
+        "--dest",
+        type=Path,
+        default=Path.cwd(),
+        help="Project root (defaults to current working directory).",
+    )
+    status_cmd.add_argument(
+        "--record",
+        nargs="*",
+        default=None,
+        metavar="AGENT",
+        help="Mark these steps (default: all) as up to date with their current inputs.",
+    )
+    status_cmd.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the status as JSON.",
+    )
+
+    run_cmd = sub.add_parser(
+        "run",
+        help="Run the out-of-date agent steps of the workflow, independent ones in parallel.",
+    )
+    run_cmd.add_argument(
+        "targets",
+        nargs="*",
+        metavar="AGENT",
+        help="Steps to bring up to date, with their upstream steps (default: all).",
+    )
+    run_cmd.add_argument(
+        "--dest",
+        type=Path,
+        default=Path.cwd(),
+        help="Project root (defaults to current working directory).",
+    )
+    run_cmd.add_argument(
+        "--command",
+        dest="agent_command",
+        default=None,
+        metavar="TEMPLATE",
+        help=(
+            "Shell command that runs one agent; {agent}, {inputs} and {outputs} are "
+            "substituted (default: $AAMAD_AGENT_COMMAND)."
+        ),
+    )
+    run_cmd.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Maximum agents running at once (default: all that are ready).",
+    )
+    run_cmd.add_argument(
+        "--force",
+        action="store_true",
+        help="Run every selected step even if it is up to date.",
+    )
+    run_cmd.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the run report as JSON.",
+    )
+
+    serve_cmd = sub.add_parser(
+        "serve",
+        help="Run a local daemon that keeps bundles in memory for fast init/bundle-info.",
+    )
+    serve_cmd.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Unix socket path (default: $AAMAD_SOCKET or a per-user runtime path).",
+    )
+    serve_cmd.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the running daemon instead of starting one.",
+    )
+    serve_cmd.add_argument(
+        "--status",
+        action="store_true",
+        help="Report whether a daemon is listening on the socket.",
+    )
     return parser
 
 
+def _resolve_bundle(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    limits: ExtractLimits = DEFAULT_LIMITS,
+) -> BundleSource:
+    """The embedded bundle for ``--ide``, or the merged ``--bundle``/``--overlay`` stack."""
+    if args.bundle is None and not args.overlay:
+        return get_bundle_resource(args.ide)
+    from .layers import resolve_layers
+
+    base = args.bundle if args.bundle is not None else get_bundle_resource(args.ide)
+    try:
+        return resolve_layers([base, *args.overlay], limits=limits)
+    except (OSError, zipfile.BadZipFile) as exc:
+        parser.error(str(exc))
+    except LimitExceeded as exc:
+        if getattr(args, "format", "text") == "jsonl":
+            raise  # reported as an error event by init
+        # Same report as a rejected init: the violations on stderr, exit status 1
+        parser.exit(1, f"{exc}\n")
+
+
+def _ratio(compressed: int, size: int) -> float:
+    """Compressed size as a fraction of the original (1.0 for empty members)."""
+    return round(compressed / size, 4) if size else 1.0
+
+
+def _member_record(member: zipfile.ZipInfo) -> dict[str, object]:
+    return {
+        "type": "member",
+        "name": member.filename,
+        "size": member.file_size,
+        "compressed_size": member.compress_size,
+        "crc": f"{member.CRC:08x}",
+        "ratio": _ratio(member.compress_size, member.file_size),
+    }
+
+
+def _init_fast_import(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    values: dict[str, str],
+    limits: ExtractLimits,
+) -> int:
+    """``aamad init --format fast-import``: commit the install as a stream on stdout."""
+    from .fast_import import DEFAULT_MESSAGE, EXPORT_IDES, export_install
+
+    if args.dry_run:
+        parser.error("--dry-run cannot be combined with --format fast-import")
+    ides = [args.ide] if args.ide else list(EXPORT_IDES)
+    bundles = None
+    if args.bundle is not None or args.overlay:
+        bundles = {
+            ide: _resolve_bundle(argparse.Namespace(**{**vars(args), "ide": ide}), parser, limits)
+            for ide in ides
+        }
+    try:
+        export_install(
+            sys.stdout.buffer,
+            ides,
+            branch=args.branch,
+            message=args.message or DEFAULT_MESSAGE,
+            parent=args.parent,
+            bundles=bundles,
+            compact=args.compact,
+            values=values or None,
+            jobs=args.jobs,
+            cache=args.cache,
+            split_templates=args.split_templates,
+            runtime=args.runtime,
+            limits=limits,
+            only=args.only,
+            exclude=args.exclude,
+        )
+    except (FileNotFoundError, LimitExceeded) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    sys.stdout.buffer.flush()
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    streaming = any(f"--format={f}" in argv for f in STREAM_FORMATS) or any(
+        a == "--format" and b in STREAM_FORMATS for a, b in zip(argv, argv[1:])
+    )
+    if argv and argv[0] in ("init", "bundle-info") and not streaming:
+        from .server import forward
+
+        # Served by `aamad serve` when one is running; otherwise run in-process.
+        # Streamed (jsonl, fast-import) output is not forwarded: the daemon replies only at the end.
+        code = forward(argv)
+        if code is not None:
+            return code
+
     parser = build_parser()
     args = parser.parse_args(argv)
 
     if args.command == "init":
-        paths = extract_artifacts(
-            destination=args.dest,
-            ide=args.ide,
-            overwrite=args.overwrite,
-            dry_run=args.dry_run,
-        )
+        values: dict[str, str] = {}
+        if args.values is not None or args.set_values:
+            from .templates import load_values, parse_set_args
+
+            try:
+                if args.values is not None:
+                    values.update(load_values(args.values))
+                values.update(parse_set_args(args.set_values))
+            except (OSError, ValueError) as exc:
+                parser.error(str(exc))
+        try:
+            limits = parse_limits(args.limits)
+            parse_selection(args.only, args.exclude)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if args.format == "fast-import":
+            return _init_fast_import(args, parser, values, limits)
+        args.ide = args.ide or "cursor"
+        compact_stats = None
+        if args.compact:
+            from .compact import CompactStats
+
+            compact_stats = CompactStats()
+        emit = None
+        if args.format == "jsonl":
+            from .events import JsonlEmitter
+
+            emit = JsonlEmitter(sys.stdout)
+            started = time.perf_counter()
+            emit({"event": "start", "command": "init", "ide": args.ide, "dest": str(args.dest)})
+        try:
+            paths = extract_artifacts(
+                destination=args.dest,
+                ide=args.ide,
+                overwrite=args.overwrite,
+                dry_run=args.dry_run,
+                compact=args.compact,
+                compact_stats=compact_stats,
+                values=values or None,
+                snapshot=args.snapshot,
+                snapshot_keep=args.keep_snapshots,
+                bundle=_resolve_bundle(args, parser, limits),
+                jobs=args.jobs,
+                cache=args.cache,
+                split_templates=args.split_templates,
+                runtime=args.runtime,
+                limits=limits,
+                only=args.only,
+                exclude=args.exclude,
+                on_event=emit,
+                lock_timeout=args.lock_timeout,
+            )
+        except (FileExistsError, FileNotFoundError, TimeoutError, LimitExceeded) as exc:
+            if emit is None:
+                if isinstance(exc, TimeoutError):
+                    parser.error(str(exc))
+                if isinstance(exc, LimitExceeded):
+                    print(exc, file=sys.stderr)
+                    return 1
+                raise
+            emit({"event": "error", "error": type(exc).__name__, "message": str(exc)})
+            return 1
+        if emit is not None:
+            done = {
+                "event": "done",
+                "files": len(paths),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+            if compact_stats is not None:
+                done["compact"] = asdict(compact_stats)
+            emit(done)
+            return 0
         if args.dry_run:
             print("Would create:")
         else:
             print("Created:")
         for path in paths:
             print(f" - {path}")
+        if compact_stats is not None and compact_stats.bytes_before:
+            print(compact_stats.summary())
         return 0
 
     if args.command == "bundle-info":
-        installer = ArtifactInstaller(get_bundle_path(args.ide))
-        files = installer.preview()
-        if args.verbose:
-            print("\n".join(files))
+        installer = ArtifactInstaller(_resolve_bundle(args, parser))
+        members = installer.iter_members()
+        if args.include or args.exclude:
+            from .globs import match_any
+
+            patterns = (args.include or ["**"]) + [f"!{p}" for p in args.exclude]
+            members = (m for m in members if match_any(patterns, m.filename))
+        if args.json:
+            # JSON Lines, one member at a time, so large bundles stream in constant memory
+            totals = {"type": "totals", "files": 0, "size": 0, "compressed_size": 0}
+            for member in members:
+                if member.is_dir():
+                    continue
+                record = _member_record(member)
+                totals["files"] += 1
+                totals["size"] += member.file_size
+                totals["compressed_size"] += member.compress_size
+                print(json.dumps(record))
+            totals["ratio"] = _ratio(totals["compressed_size"], totals["size"])
+            print(json.dumps(totals))
+            return 0
+        count = 0
+        for member in members:
+            count += 1
+            if args.verbose:
+                print(member.filename)
+        if not args.verbose:
+            print(f"{count} files bundled ({args.ide})")
+        return 0
+
+    if args.command == "rollback":
+        from .snapshots import list_snapshots, rollback
+
+        if args.list:
+            snapshots = list_snapshots(args.dest)
+            if not snapshots:
+                print("No snapshots.")
+            for snap in snapshots:
+                print(f"{snap.id}  {snap.size:,} bytes")
+            return 0
+        try:
+            paths = rollback(args.dest, args.snapshot_id)
+        except FileNotFoundError as exc:
+            print(exc)
+            return 1
+        print("Restored:")
+        for path in paths:
+            print(f" - {path}")
+        return 0
+
+    if args.command == "verify":
+        from .verify import verify_installation
+
+        result = verify_installation(
+            args.dest, _resolve_bundle(args, parser), workers=args.jobs, full=args.full
+        )
+        if args.json:
+            print(json.dumps(result.to_dict(), indent=2))
+        else:
+            print(result.report())
+        return 0 if result.ok else 1
+
+    if args.command == "status":
+        from .workflow import format_status, load_workflow, record_steps, workflow_status
+
+        workflow = load_workflow(args.dest)
+        if args.record is not None:
+            unknown = [sid for sid in args.record if sid not in workflow.steps]
+            if unknown:
+                parser.error(f"unknown workflow step(s): {', '.join(unknown)}")
+            record_steps(args.dest, args.record or workflow.order, workflow)
+        statuses = workflow_status(args.dest, workflow)
+        if args.json:
+            print(json.dumps([asdict(s) for s in statuses], indent=2))
+        else:
+            print(format_status(statuses))
+        return 0
+
+    if args.command == "run":
+        from .runner import COMMAND_ENV, CommandRunner, run_workflow
+        from .workflow import load_workflow
+
+        command = args.agent_command or os.environ.get(COMMAND_ENV)
+        if not command:
+            parser.error(f"no agent command: pass --command or set ${COMMAND_ENV}")
+        workflow = load_workflow(args.dest)
+        unknown = [sid for sid in args.targets if sid not in workflow.steps]
+        if unknown:
+            parser.error(f"unknown workflow step(s): {', '.join(unknown)}")
+        report = run_workflow(
+            args.dest,
+            CommandRunner(command),
+            targets=args.targets or None,
+            jobs=args.jobs,
+            force=args.force,
+            workflow=workflow,
+        )
+        if args.json:
+            print(json.dumps(report.to_dict(), indent=2))
+        else:
+            print(report.summary())
+        return 0 if report.ok else 1
+
+    if args.command == "context":
+        from .context_index import build_index, format_matches, query_index
+
+        if args.context_command == "index":
+            update = build_index(args.dest)
+            print(
+                f"Indexed {update.sections} sections in {update.files} files "
+                f"({len(update.reindexed)} re-indexed, {len(update.removed)} removed)."
+            )
+            return 0
+        matches = query_index(args.dest, " ".join(args.terms), limit=args.limit)
+        if args.json:
+            print(json.dumps([m.to_dict() for m in matches], indent=2))
         else:
-            print(f"{len(files)} files bundled ({args.ide})")
+            print(format_matches(matches))
+        return 0 if matches else 1
+
+    if args.command == "context-stats":
+        from .context_stats import collect_context_stats, format_context_stats
+
+        stats = collect_context_stats(args.dest, ide=args.ide, file=args.file)
+        if args.json:
+            print(json.dumps(stats.to_dict(), indent=2))
+        else:
+            print(format_context_stats(stats))
+        if args.max_tokens is not None and stats.request_tokens > args.max_tokens:
+            print(
+                f"Context budget exceeded: ~{stats.request_tokens} tokens > {args.max_tokens}"
+            )
+            return 1
+        return 0
+
+    if args.command == "serve":
+        from .server import default_socket_path, request, serve
+
+        socket_path = args.socket or default_socket_path()
+        if args.stop or args.status:
+            try:
+                response = request({"op": "shutdown" if args.stop else "ping"}, socket_path=socket_path)
+            except OSError:
+                print(f"No aamad daemon on {socket_path}")
+                return 1
+            if args.stop:
+                print(f"Stopped aamad daemon on {socket_path}")
+            else:
+                print(f"aamad daemon (pid {response.get('pid')}) listening on {socket_path}")
+            return 0
+        try:
+            print(f"Serving on {socket_path}", flush=True)
+            serve(socket_path)
+        except FileExistsError as exc:
+            print(exc)
+            return 1
         return 0
 
     parser.error("Unknown command")
@@ -0,0 +1,212 @@
+"""
+Compact emit mode for generated rule context.
+
+The runtime adapter rules share long boilerplate sections, so concatenated or
+always-applied output repeats the same guidance several times per request.
+``compact_bodies`` removes paragraphs already emitted by an earlier rule,
+strips decorative markdown and collapses whitespace, recording the size
+reduction in a ``CompactStats``.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+\S")
+_RULE_LINE_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# Bold markers delimited by whitespace/punctuation, so globs (``src/**/*.py``)
+# and dunder names (``__init__.py``) are never mistaken for emphasis
+_EMPHASIS_RE = re.compile(
+    r"(?<![^\s(\[])(\*\*|__)(?=[^\s*_/])((?:(?!\1).)+?)(?<=[^\s*_/])\1(?=[.,;:!?)\]]?(?:\s|$))"
+)
+_CODE_SPAN_RE = re.compile(r"(`+).+?\1")
+_PLACEHOLDER_RE = re.compile("\x00(\\d+)\x00")
+_INDENT_RE = re.compile(r"^(\s*)(.*)$")
+_ITEM_RE = re.compile(r"^(?:[-*+]|\d+[.)])\s+\S")
+
+
+@dataclass
+class CompactStats:
+    """Size accounting for a compact conversion run."""
+
+    bytes_before: int = 0
+    bytes_after: int = 0
+    duplicates_removed: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of bytes removed (0.0 when nothing was compacted)."""
+        if not self.bytes_before:
+            return 0.0
+        return self.bytes_saved / self.bytes_before
+
+    def summary(self) -> str:
+        return (
+            f"Compacted rule context: {self.bytes_before:,} -> {self.bytes_after:,} bytes "
+            f"(-{self.reduction:.1%}, {self.duplicates_removed} duplicate paragraphs removed)"
+        )
+
+
+def _blocks(text: str) -> list[tuple[str, str]]:
+    """
+    Split markdown into ``(kind, text)`` blocks: ``code`` fences, ``heading``
+    lines, top-level ``item`` list entries (with nested lines) and ``para``
+    paragraphs.
+    """
+    blocks: list[tuple[str, str]] = []
+    current: list[str] = []
+    kind = "para"
+    in_fence = False
+
+    def flush() -> None:
+        if current:
+            blocks.append((kind, "\n".join(current)))
+            current.clear()
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            if not in_fence:
+                flush()
+                kind = "code"
+            current.append(line)
+            in_fence = not in_fence
+            if not in_fence:
+                flush()
+                kind = "para"
+            continue
+        if in_fence:
+            current.append(line)
+            continue
+        if not stripped:
+            flush()
+            kind = "para"
+        elif _HEADING_RE.match(stripped):
+            flush()
+            blocks.append(("heading", stripped))
+            kind = "para"
+        elif _ITEM_RE.match(line):
+            flush()
+            kind = "item"
+            current.append(line)
+        else:
+            current.append(line)
+    flush()
+    return blocks
+
+
+def _join(blocks: list[tuple[str, str]]) -> str:
+    """Reassemble blocks, keeping headings and list items on adjacent lines."""
+    out: list[str] = []
+    prev = ""
+    for kind, text in blocks:
+        if out:
+            tight = prev == "heading" or (prev == "item" and kind == "item")
+            out.append("\n" if tight else "\n\n")
+        out.append(text)
+        prev = kind
+    return "".join(out)
+
+
+def _outside_code(text: str, transform: Callable[[str], str]) -> str:
+    """Apply ``transform`` to ``text`` with its inline code spans left untouched."""
+    spans: list[str] = []
+
+    def hide(match: re.Match[str]) -> str:
+        spans.append(match.group(0))
+        return f"\x00{len(spans) - 1}\x00"
+
+    hidden = transform(_CODE_SPAN_RE.sub(hide, text))
+    return _PLACEHOLDER_RE.sub(lambda m: spans[int(m.group(1))], hidden)
+
+
+def _minify_block(block: str) -> str:
+    """Strip decorative markdown and redundant whitespace from a non-code block."""
+    lines = []
+    for line in block.splitlines():
+        if _RULE_LINE_RE.match(line):
+            continue
+        indent, rest = _INDENT_RE.match(line.rstrip()).groups()
+        # Keep list nesting; collapse whitespace runs and drop bold markers outside inline code
+        rest = _outside_code(rest, lambda t: _EMPHASIS_RE.sub(r"\2", re.sub(r"\s{2,}", " ", t)))
+        lines.append(indent + rest)
+    return "\n".join(line for line in lines if line.strip())
+
+
+def _dedupe_key(block: str) -> str:
+    return re.sub(r"\s+", " ", block).strip().lower()
+
+
+def _drop_empty_sections(blocks: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Remove headings whose section lost all its content to deduplication."""
+    kept: list[tuple[str, str]] = []
+    for i, (kind, text) in enumerate(blocks):
+        if kind == "heading":
+            level = len(_HEADING_RE.match(text).group(1))
+            has_content = False
+            for nxt_kind, nxt_text in blocks[i + 1 :]:
+                if nxt_kind != "heading":
+                    has_content = True
+                    break
+                if len(_HEADING_RE.match(nxt_text).group(1)) <= level:
+                    break
+            if not has_content:
+                continue
+        kept.append((kind, text))
+    return kept
+
+
+def compact_bodies(
+    bodies: dict[str, str],
+    stats: CompactStats | None = None,
+    *,
+    scoped: Iterable[str] = (),
+) -> dict[str, str]:
+    """
+    Compact rule bodies, removing paragraphs already emitted by an earlier rule.
+
+    Paragraphs and top-level list items are deduplicated across rules on their
+    whitespace- and case-normalised text; headings and code blocks are kept.
+
+    Args:
+        bodies: Rule name -> markdown body, in emit (dependency) order.
+        stats: Optional accumulator updated with before/after sizes.
+        scoped: Names of path-scoped rules. They are deduplicated against global
+            rules, but their own paragraphs never suppress later rules because
+            they are not always loaded.
+
+    Returns:
+        Rule name -> compacted body, in the same order.
+    """
+    scoped = set(scoped)
+    seen: set[str] = set()
+    result: dict[str, str] = {}
+    for name, body in bodies.items():
+        kept: list[tuple[str, str]] = []
+        for kind, text in _blocks(_HTML_COMMENT_RE.sub("", body)):
+            if kind in ("heading", "code"):
+                kept.append((kind, text))
+                continue
+            text = _minify_block(text)
+            if not text.strip():
+                continue
+            key = _dedupe_key(text)
+            if key in seen:
+                if stats is not None:
+                    stats.duplicates_removed += 1
+                continue
+            if name not in scoped:
+                seen.add(key)
+            kept.append((kind, text))
+        result[name] = _join(_drop_empty_sections(kept))
+        if stats is not None:
+            stats.bytes_before += len(body.encode("utf-8"))
+            stats.bytes_after += len(result[name].encode("utf-8"))
+    return result
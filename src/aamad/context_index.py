@@ -0,0 +1,289 @@
+"""
+Section index over the markdown artifacts in ``project-context/``.
+
+Agents usually need one requirement or decision from ``prd.md`` or ``sad.md``,
+not the whole document. ``build_index`` splits every markdown artifact into
+heading-delimited sections and keeps an inverted index (term -> sections) in
+``.aamad/context-index.json``. Updates are incremental: only files whose size
+or mtime changed are re-read. ``query_index`` ranks sections with BM25 and
+returns just the matching slices (``aamad context index`` /
+``aamad context query "<terms>"``).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .cache import atomic_write_bytes
+
+CONTEXT_DIR = "project-context"
+INDEX_PATH = Path(".aamad") / "context-index.json"
+
+# Bump when the stored layout changes; older indexes are rebuilt
+INDEX_FORMAT = 1
+
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+# BM25 parameters; headings count extra so a section titled with a term ranks first
+_K1 = 1.2
+_B = 0.75
+_HEADING_WEIGHT = 3
+
+_HEADING_RE = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+_FENCE_RE = re.compile(r"^[ \t]*(```|~~~)")
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9_-]*[a-z0-9]|[a-z0-9]")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was "
+    "were will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased index terms of ``text``, without stopwords and single characters."""
+    return [
+        t for t in _TERM_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS
+    ]
+
+
+def slugify(heading: str) -> str:
+    """GitHub-style anchor for a heading."""
+    slug = re.sub(r"[^\w\s-]", "", heading.strip().lower())
+    return re.sub(r"\s+", "-", slug)
+
+
+@dataclass
+class Section:
+    """One heading-delimited slice of a markdown file (lines are 1-based, inclusive)."""
+
+    path: str
+    heading: str
+    anchor: str
+    level: int
+    start_line: int
+    end_line: int
+
+
+@dataclass
+class Match:
+    """A query hit: the section, its score and its text."""
+
+    section: Section
+    score: float
+    text: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self.section), "score": self.score, "text": self.text}
+
+
+def split_sections(
+    text: str, path: str, *, max_level: int = 6
+) -> list[tuple[Section, str]]:
+    """
+    Split markdown into sections at every ATX heading (``#`` .. ``######``).
+
+    Each section runs to the next heading of any level up to ``max_level``,
+    so sections never overlap; deeper headings stay inside their section.
+    Text before the first heading becomes a section with an empty heading
+    when it is not blank. Headings inside fenced code blocks are ignored.
+    """
+    lines = text.splitlines()
+    starts: list[tuple[int, int, str]] = []  # (line index, level, heading)
+    in_fence = False
+    for i, line in enumerate(lines):
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        m = _HEADING_RE.match(line)
+        if m and len(m.group(1)) <= max_level:
+            starts.append((i, len(m.group(1)), m.group(2).strip()))
+
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, 0, ""))
+    sections: list[tuple[Section, str]] = []
+    anchors: Counter[str] = Counter()
+    for n, (begin, level, heading) in enumerate(starts):
+        end = starts[n + 1][0] if n + 1 < len(starts) else len(lines)
+        body = "\n".join(lines[begin:end])
+        if not heading and not body.strip():
+            continue
+        anchor = slugify(heading)
+        if anchors[anchor]:
+            # Same de-duplication GitHub applies to repeated headings
+            anchor_id = f"{anchor}-{anchors[anchor]}"
+        else:
+            anchor_id = anchor
+        anchors[anchor] += 1
+        section = Section(path, heading, anchor_id, level, begin + 1, max(begin + 1, end))
+        sections.append((section, body))
+    return sections
+
+
+def _section_terms(section: Section, body: str) -> Counter[str]:
+    terms = Counter(tokenize(body))
+    for term in tokenize(section.heading):
+        terms[term] += _HEADING_WEIGHT - 1  # the heading line is already in ``body``
+    return terms
+
+
+def _index_entry(section: Section, terms: Counter[str]) -> dict[str, Any]:
+    return {**asdict(section), "length": sum(terms.values()), "terms": dict(terms)}
+
+
+def _iter_markdown(root: Path) -> list[Path]:
+    context = root / CONTEXT_DIR
+    if not context.is_dir():
+        return []
+    return sorted(
+        p for p in context.rglob("*") if p.is_file() and p.suffix.lower() in MARKDOWN_SUFFIXES
+    )
+
+
+def _load(root: Path) -> dict[str, Any]:
+    try:
+        data = json.loads((root / INDEX_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("format") == INDEX_FORMAT else {}
+
+
+@dataclass
+class IndexUpdate:
+    """What ``build_index`` did."""
+
+    files: int
+    sections: int
+    reindexed: list[str]
+    removed: list[str]
+
+
+def build_index(root: Path | str) -> IndexUpdate:
+    """
+    Create or incrementally update the section index of ``root/project-context``.
+
+    Files whose size and mtime match the stored index are not read again.
+    The index is only rewritten when something changed.
+
+    Args:
+        root: Project root containing ``project-context/``.
+
+    Returns:
+        IndexUpdate listing re-indexed and removed files.
+    """
+    root = Path(root).expanduser().resolve()
+    old = _load(root)
+    old_files: dict[str, Any] = old.get("files", {})
+    files: dict[str, Any] = {}
+    reindexed: list[str] = []
+    for path in _iter_markdown(root):
+        rel = path.relative_to(root).as_posix()
+        st = path.stat()
+        stamp = [st.st_size, st.st_mtime_ns]
+        previous = old_files.get(rel)
+        if previous is not None and previous["stamp"] == stamp:
+            files[rel] = previous
+            continue
+        text = path.read_text(encoding="utf-8", errors="replace")
+        files[rel] = {
+            "stamp": stamp,
+            "sections": [
+                _index_entry(section, _section_terms(section, body))
+                for section, body in split_sections(text, rel)
+            ],
+        }
+        reindexed.append(rel)
+    removed = sorted(set(old_files) - set(files))
+
+    if reindexed or removed or (files and not old):
+        postings: dict[str, list[list[Any]]] = {}
+        lengths: list[int] = []
+        for rel in sorted(files):
+            for n, entry in enumerate(files[rel]["sections"]):
+                lengths.append(entry["length"])
+                for term, tf in entry["terms"].items():
+                    postings.setdefault(term, []).append([rel, n, tf])
+        data = {
+            "format": INDEX_FORMAT,
+            "files": files,
+            "postings": postings,
+            "sections": len(lengths),
+            "avg_length": (sum(lengths) / len(lengths)) if lengths else 0.0,
+        }
+        atomic_write_bytes(root / INDEX_PATH, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+    count = sum(len(f["sections"]) for f in files.values())
+    return IndexUpdate(files=len(files), sections=count, reindexed=reindexed, removed=removed)
+
+
+def query_index(
+    root: Path | str,
+    terms: str,
+    *,
+    limit: int = 5,
+    refresh: bool = True,
+) -> list[Match]:
+    """
+    Return the sections of ``project-context/`` that best match ``terms``.
+
+    Args:
+        root: Project root containing ``project-context/``.
+        terms: Free-text query; every term that occurs in the index contributes.
+        limit: Maximum number of sections to return.
+        refresh: Bring the index up to date first (cheap: files are only
+            stat'ed unless they changed).
+
+    Returns:
+        Matches ordered by descending BM25 score, each with the section text.
+    """
+    root = Path(root).expanduser().resolve()
+    if refresh:
+        build_index(root)
+    data = _load(root)
+    if not data:
+        return []
+    files = data["files"]
+    total = data["sections"]
+    avg_length = data["avg_length"] or 1.0
+    scores: Counter[tuple[str, int]] = Counter()
+    for term in set(tokenize(terms)):
+        postings = data["postings"].get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+        for rel, n, tf in postings:
+            length = files[rel]["sections"][n]["length"]
+            norm = tf + _K1 * (1 - _B + _B * length / avg_length)
+            scores[(rel, n)] += idf * tf * (_K1 + 1) / norm
+
+    matches: list[Match] = []
+    lines_cache: dict[str, list[str]] = {}
+    for (rel, n), score in sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]:
+        entry = files[rel]["sections"][n]
+        section = Section(**{k: v for k, v in entry.items() if k not in ("length", "terms")})
+        if rel not in lines_cache:
+            try:
+                lines_cache[rel] = (root / rel).read_text(encoding="utf-8", errors="replace").splitlines()
+            except OSError:  # removed since the index was built (refresh=False)
+                lines_cache[rel] = []
+        text = "\n".join(lines_cache[rel][section.start_line - 1 : section.end_line]).rstrip()
+        matches.append(Match(section=section, score=round(score, 4), text=text))
+    return matches
+
+
+def format_matches(matches: list[Match]) -> str:
+    """Render query matches as plain text, one ``path#anchor`` block per section."""
+    if not matches:
+        return "No matching sections."
+    blocks = []
+    for m in matches:
+        s = m.section
+        ref = f"{s.path}#{s.anchor}" if s.anchor else s.path
+        blocks.append(f"==> {ref} (lines {s.start_line}-{s.end_line}, score {m.score})\n{m.text}")
+    return "\n\n".join(blocks)
@@ -0,0 +1,265 @@
+"""
+Context-weight statistics for installed AAMAD artifacts.
+
+Reports how many bytes and approximate tokens an IDE loads into each agent
+request, broken down by rule and agent. Scoping follows the installed
+frontmatter: Cursor ``alwaysApply``/``globs``, Claude Code ``paths`` and
+VS Code ``applyTo``. Token counts come from a local estimator, so the report
+runs offline and is stable enough to track in CI.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .claude_code import _parse_frontmatter
+from .globs import match_any, split_globs
+
+# Scope labels, in report order
+SCOPE_ALWAYS = "always"  # loaded into every request
+SCOPE_MATCHED = "matched"  # path-scoped and the given file matches
+SCOPE_SCOPED = "scoped"  # path-scoped, not loaded for the given file
+SCOPE_ON_DEMAND = "on-demand"  # loaded only when the persona/rule is invoked
+
+SCOPE_ORDER = [SCOPE_ALWAYS, SCOPE_MATCHED, SCOPE_SCOPED, SCOPE_ON_DEMAND]
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the BPE token count of ``text`` without a tokenizer.
+
+    Words count as one token per started group of four characters and every
+    punctuation mark as one token, which tracks common LLM tokenizers closely
+    enough for budgeting.
+    """
+    total = 0
+    for piece in _TOKEN_RE.findall(text):
+        if piece[0].isalnum() or piece[0] == "_":
+            total += math.ceil(len(piece) / 4)
+        else:
+            total += 1
+    return total
+
+
+@dataclass
+class ContextEntry:
+    """One rule, memory or agent file and how it is loaded."""
+
+    kind: str
+    name: str
+    path: str
+    scope: str
+    bytes: int
+    tokens: int
+    patterns: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ContextStats:
+    """Context-weight report for one IDE layout."""
+
+    ide: str
+    file: str | None
+    entries: list[ContextEntry] = field(default_factory=list)
+
+    @property
+    def loaded(self) -> list[ContextEntry]:
+        """Entries loaded into every request for ``file`` (always + matched)."""
+        return [e for e in self.entries if e.scope in (SCOPE_ALWAYS, SCOPE_MATCHED)]
+
+    @property
+    def request_bytes(self) -> int:
+        return sum(e.bytes for e in self.loaded)
+
+    @property
+    def request_tokens(self) -> int:
+        return sum(e.tokens for e in self.loaded)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ide": self.ide,
+            "file": self.file,
+            "request_bytes": self.request_bytes,
+            "request_tokens": self.request_tokens,
+            "entries": [asdict(e) for e in self.entries],
+        }
+
+
+def _entry(
+    kind: str,
+    name: str,
+    path: Path,
+    root: Path,
+    scope: str,
+    text: str,
+    patterns: list[str] | None = None,
+) -> ContextEntry:
+    return ContextEntry(
+        kind=kind,
+        name=name,
+        path=path.relative_to(root).as_posix(),
+        scope=scope,
+        bytes=len(text.encode("utf-8")),
+        tokens=estimate_tokens(text),
+        patterns=list(patterns or []),
+    )
+
+
+def _scoped(patterns: list[str], file: str | None) -> str:
+    if file is not None and match_any(patterns, file):
+        return SCOPE_MATCHED
+    return SCOPE_SCOPED
+
+
+def _collect_agents_md(root: Path, entries: list[ContextEntry]) -> None:
+    path = root / "AGENTS.md"
+    if path.is_file():
+        entries.append(
+            _entry("memory", "AGENTS.md", path, root, SCOPE_ALWAYS, path.read_text(encoding="utf-8"))
+        )
+
+
+def _collect_cursor(root: Path, file: str | None) -> list[ContextEntry]:
+    entries: list[ContextEntry] = []
+    for path in sorted((root / ".cursor" / "rules").glob("*.mdc")):
+        fm, body = _parse_frontmatter(path.read_text(encoding="utf-8"))
+        patterns = split_globs(fm.get("globs"))
+        if fm.get("alwaysApply") is True:
+            scope = SCOPE_ALWAYS
+        elif patterns:
+            scope = _scoped(patterns, file)
+        else:
+            # No alwaysApply and no globs: agent-requested or manual rule
+            scope = SCOPE_ON_DEMAND
+        entries.append(_entry("rule", path.stem, path, root, scope, body, patterns))
+    for path in sorted((root / ".cursor" / "agents").glob("*.md")):
+        entries.append(
+            _entry("agent", path.stem, path, root, SCOPE_ON_DEMAND, path.read_text(encoding="utf-8"))
+        )
+    _collect_agents_md(root, entries)
+    return entries
+
+
+def _collect_claude(root: Path, file: str | None) -> list[ContextEntry]:
+    entries: list[ContextEntry] = []
+    claude_md = root / ".claude" / "CLAUDE.md"
+    if claude_md.is_file():
+        entries.append(
+            _entry("memory", "CLAUDE.md", claude_md, root, SCOPE_ALWAYS, claude_md.read_text(encoding="utf-8"))
+        )
+    for path in sorted((root / ".claude" / "rules").glob("*.md")):
+        fm, body = _parse_frontmatter(path.read_text(encoding="utf-8"))
+        patterns = split_globs(fm.get("paths"))
+        scope = _scoped(patterns, file) if patterns else SCOPE_ALWAYS
+        entries.append(_entry("rule", path.stem, path, root, scope, body, patterns))
+    for path in sorted((root / ".claude" / "agents").glob("*.md")):
+        entries.append(
+            _entry("agent", path.stem, path, root, SCOPE_ON_DEMAND, path.read_text(encoding="utf-8"))
+        )
+    return entries
+
+
+def _collect_vscode(root: Path, file: str | None) -> list[ContextEntry]:
+    entries: list[ContextEntry] = []
+    copilot_md = root / ".github" / "copilot-instructions.md"
+    if copilot_md.is_file():
+        entries.append(
+            _entry(
+                "memory",
+                "copilot-instructions.md",
+                copilot_md,
+                root,
+                SCOPE_ALWAYS,
+                copilot_md.read_text(encoding="utf-8"),
+            )
+        )
+    for path in sorted((root / ".github" / "instructions").glob("*.instructions.md")):
+        fm, body = _parse_frontmatter(path.read_text(encoding="utf-8"))
+        patterns = split_globs(fm.get("applyTo"))
+        if not patterns:
+            scope = SCOPE_ON_DEMAND
+        elif "**" in patterns:
+            scope = SCOPE_ALWAYS
+        else:
+            scope = _scoped(patterns, file)
+        name = path.name[: -len(".instructions.md")]
+        entries.append(_entry("rule", name, path, root, scope, body, patterns))
+    for path in sorted((root / ".github" / "agents").glob("*.agent.md")):
+        name = path.name[: -len(".agent.md")]
+        entries.append(
+            _entry("agent", name, path, root, SCOPE_ON_DEMAND, path.read_text(encoding="utf-8"))
+        )
+    _collect_agents_md(root, entries)
+    return entries
+
+
+_COLLECTORS = {
+    "cursor": _collect_cursor,
+    "claude-code": _collect_claude,
+    "claude_code": _collect_claude,  # alias
+    "vscode": _collect_vscode,
+}
+
+
+def collect_context_stats(
+    root: Path | str,
+    *,
+    ide: str = "cursor",
+    file: str | None = None,
+) -> ContextStats:
+    """
+    Measure the context an IDE would load from the AAMAD artifacts under ``root``.
+
+    Args:
+        root: Project root containing the installed IDE artifacts.
+        ide: Target IDE — "cursor" (default), "claude-code", or "vscode".
+        file: Optional workspace-relative path being edited; path-scoped rules
+            matching it count towards the per-request total.
+
+    Returns:
+        ContextStats with one entry per rule, memory file and agent.
+    """
+    if ide not in _COLLECTORS:
+        raise ValueError(f"Unknown IDE: {ide}")
+    root = Path(root).expanduser().resolve()
+    if file is not None:
+        file_path = Path(file)
+        if file_path.is_absolute():
+            try:
+                file_path = file_path.resolve().relative_to(root)
+            except ValueError:
+                pass
+        file = file_path.as_posix()
+    entries = _COLLECTORS[ide](root, file)
+    entries.sort(key=lambda e: (SCOPE_ORDER.index(e.scope), e.kind != "memory", e.name))
+    return ContextStats(ide=ide, file=file, entries=entries)
+
+
+def format_context_stats(stats: ContextStats) -> str:
+    """Render ContextStats as a plain-text table."""
+    target = f", file: {stats.file}" if stats.file else ""
+    lines = [f"Context loaded per request ({stats.ide}{target})"]
+    if not stats.entries:
+        lines.append("  (no AAMAD artifacts found)")
+    for e in stats.entries:
+        lines.append(
+            f"  {e.scope:<9}  {e.kind:<6}  {e.name:<26}  {e.bytes:>8,} B  ~{e.tokens:>6,} tok"
+        )
+    lines.append(
+        f"Per-request total: {stats.request_bytes:,} bytes, ~{stats.request_tokens:,} tokens"
+    )
+    agents = [e for e in stats.entries if e.kind == "agent"]
+    if agents:
+        largest = max(agents, key=lambda e: e.tokens)
+        lines.append(
+            f"With largest agent ({largest.name}): "
+            f"{stats.request_bytes + largest.bytes:,} bytes, "
+            f"~{stats.request_tokens + largest.tokens:,} tokens"
+        )
+    return "\n".join(lines)
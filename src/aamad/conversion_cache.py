@@ -0,0 +1,222 @@
+"""
+Persistent cache of converted IDE outputs.
+
+A conversion (``install_claude_code``/``install_vscode_copilot``) is keyed by
+the content of every ``.cursor/`` source it reads, the target, its options and
+the converter version (a fingerprint of the converter modules, so any code
+change invalidates old entries). Entries are small zips under
+``<cache>/conversions/`` (see ``aamad.cache``); ``$AAMAD_CACHE_DIR`` can point
+at a directory shared by a CI fleet. Entries are published by atomic rename,
+so concurrent writers need no locking and readers never see partial entries.
+A shared cache is untrusted input: an entry with an unsafe member path (see
+``aamad.limits``), beyond the extraction limits or with a member outside the
+files its target's converter writes (``TARGET_OUTPUTS``) is treated as a miss.
+
+Whole conversions are cached rather than single documents because compact
+mode and the generated CLAUDE.md depend on every rule at once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import time
+import zipfile
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping
+
+from .cache import atomic_write_bytes, cache_dir
+from .events import file_event
+from .limits import check_members
+
+if TYPE_CHECKING:
+    from .compact import CompactStats
+    from .events import EventSink
+
+# Bump when the cached layout changes
+CACHE_FORMAT = 1
+
+# Modules whose code determines converted output
+CONVERTER_MODULES = (
+    "claude_code.py",
+    "vscode_copilot.py",
+    "compact.py",
+    "rewrite.py",
+    "sources.py",
+    "globs.py",
+    "miniyaml.py",
+)
+
+SOURCE_DIRS = ("rules", "agents", "prompts")
+
+# Paths (directory prefixes end in "/") a cached conversion may write per target;
+# IDE settings are written after the conversion and never cached
+TARGET_OUTPUTS = {
+    "claude-code": (".claude/rules/", ".claude/agents/", ".claude/commands/", ".claude/CLAUDE.md"),
+    "vscode": (".github/instructions/", ".github/agents/", ".github/prompts/"),
+}
+
+
+@lru_cache(maxsize=1)
+def converter_version() -> str:
+    """Fingerprint of the converter code and YAML backend in this process."""
+    digest = hashlib.sha256(f"format-{CACHE_FORMAT}\n".encode("utf-8"))
+    package = resources.files("aamad")
+    for name in CONVERTER_MODULES:
+        digest.update(name.encode("utf-8") + b"\0" + package.joinpath(name).read_bytes())
+    try:
+        import yaml
+
+        digest.update(f"pyyaml-{yaml.__version__}".encode("utf-8"))
+    except ImportError:
+        digest.update(b"miniyaml")
+    return digest.hexdigest()[:16]
+
+
+def conversion_key(cursor_root: Path, target: str, options: Mapping[str, Any]) -> str:
+    """Cache key for converting the ``.cursor/`` sources under ``cursor_root``."""
+    digest = hashlib.sha256()
+    digest.update(f"{converter_version()}\n{target}\n".encode("utf-8"))
+    digest.update(json.dumps(dict(options), sort_keys=True).encode("utf-8") + b"\n")
+    cursor_dir = cursor_root / ".cursor"
+    for sub in SOURCE_DIRS:
+        directory = cursor_dir / sub
+        if not directory.is_dir():
+            continue
+        for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+            rel = path.relative_to(cursor_dir).as_posix()
+            file_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+            digest.update(f"{rel}\0{file_hash}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir("conversions", key[:2]) / f"{key}.zip"
+
+
+@dataclass
+class CachedConversion:
+    """Converted files (relative path -> bytes) plus compact statistics."""
+
+    files: dict[str, bytes] = field(default_factory=dict)
+    compact: dict[str, int] = field(default_factory=dict)
+
+    def write(self, dest: Path, on_event: EventSink | None = None) -> list[Path]:
+        """
+        Write the cached outputs under ``dest``; returns the written paths.
+
+        ``on_event`` receives a ``converted`` file event per file as it is written.
+        """
+        paths: list[Path] = []
+        for rel, data in self.files.items():
+            start = time.perf_counter()
+            path = dest / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            paths.append(path)
+            if on_event is not None:
+                on_event(file_event("converted", path, len(data), time.perf_counter() - start))
+        return paths
+
+    def apply_stats(self, stats: CompactStats | None) -> None:
+        if stats is None:
+            return
+        stats.bytes_before += self.compact.get("bytes_before", 0)
+        stats.bytes_after += self.compact.get("bytes_after", 0)
+        stats.duplicates_removed += self.compact.get("duplicates_removed", 0)
+
+
+def _is_output(name: str, target: str) -> bool:
+    return any(
+        name.startswith(out) if out.endswith("/") else name == out
+        for out in TARGET_OUTPUTS.get(target, ())
+    )
+
+
+def load(key: str, target: str) -> CachedConversion | None:
+    """
+    Return the cached ``target`` conversion for ``key``, or None on a miss.
+
+    Unreadable entries, entries rejected by ``check_members`` (e.g. a ``../``
+    member written into a shared cache) and entries with a member that the
+    ``target`` converter never writes (e.g. ``.git/hooks/post-checkout``) are
+    misses; the conversion then runs and replaces the entry.
+    """
+    path = _entry_path(key)
+    try:
+        with zipfile.ZipFile(path, "r") as zf:
+            # LimitExceeded is a ValueError; checked before anything is decompressed
+            check_members(zf.infolist())
+            names = [m.filename for m in zf.infolist() if not m.is_dir()]
+            if not all(_is_output(name, target) for name in names):
+                return None
+            meta = json.loads(zf.comment.decode("utf-8") or "{}")
+            files = {name: zf.read(name) for name in names}
+    except (OSError, zipfile.BadZipFile, ValueError):
+        return None
+    return CachedConversion(files=files, compact=meta.get("compact", {}))
+
+
+def store(
+    key: str,
+    dest: Path,
+    paths: Iterable[Path],
+    *,
+    compact: Mapping[str, int] | None = None,
+) -> Path:
+    """Publish the converted files ``paths`` (under ``dest``) as the entry for ``key``."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in paths:
+            zf.write(path, path.relative_to(dest).as_posix())
+        zf.comment = json.dumps({"compact": dict(compact or {})}).encode("utf-8")
+    return atomic_write_bytes(_entry_path(key), buf.getvalue())
+
+
+def convert_cached(
+    cursor_root: Path,
+    dest: Path,
+    *,
+    target: str,
+    options: Mapping[str, Any],
+    convert: Callable[[CompactStats], list[Path]],
+    compact_stats: CompactStats | None = None,
+    on_event: EventSink | None = None,
+) -> list[Path]:
+    """
+    Run ``convert`` through the cache.
+
+    On a hit the cached outputs are written to ``dest`` without parsing any
+    source; on a miss ``convert`` runs and its outputs are stored.
+
+    Args:
+        cursor_root: Root containing the ``.cursor/`` sources.
+        dest: Output root the converted paths are relative to.
+        target: Converter name (``claude-code``, ``vscode``).
+        options: Converter options that change the output.
+        convert: Performs the conversion with a fresh CompactStats accumulator
+            and returns the written paths.
+        compact_stats: Caller's accumulator; cached statistics are added to it.
+        on_event: Receives a ``cache`` hit/miss event (see aamad.events), and
+            on a hit a ``converted`` file event per file written.
+    """
+    key = conversion_key(cursor_root, target, options)
+    hit = load(key, target)
+    if on_event is not None:
+        on_event({"event": "cache", "action": "miss" if hit is None else "hit", "target": target})
+    if hit is not None:
+        hit.apply_stats(compact_stats)
+        return hit.write(dest, on_event)
+
+    from .compact import CompactStats
+
+    run_stats = CompactStats()
+    paths = convert(run_stats)
+    entry = CachedConversion(compact=asdict(run_stats))
+    store(key, dest, paths, compact=entry.compact)
+    entry.apply_stats(compact_stats)
+    return paths
@@ -0,0 +1,111 @@
+"""
+Install progress events.
+
+``extract_artifacts`` and ``ArtifactInstaller.extract`` accept an ``on_event``
+callback that receives one dict per event as it happens:
+
+- ``{"event": "phase_start", "phase": ...}``
+- ``{"event": "file", "phase": ..., "action": ..., "path": ..., "bytes": ..., "duration_ms": ...}``
+  where ``action`` is ``written``, ``overwritten``, ``skipped`` (identical
+  file already in place), ``converted`` (emitted by the claude-code/vscode
+  converters as each file is written) or ``planned`` (dry run); extracted
+  members also carry ``compressed_bytes`` read from the bundle
+- ``{"event": "cache", "phase": ..., "action": "hit" | "miss", "target": ...}``
+  for conversions looked up in the conversion cache
+- ``{"event": "phase_end", "phase": ..., "files": ..., "bytes": ..., "duration_ms": ...}``
+
+``JsonlEmitter`` writes them as JSON Lines (``aamad init --format jsonl``),
+flushing after every event so orchestrators can consume an install
+incrementally.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, Optional
+
+Event = Dict[str, Any]
+EventSink = Callable[[Event], None]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class JsonlEmitter:
+    """Thread-safe event sink writing one flushed JSON object per line."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        line = json.dumps({"ts": round(time.time(), 6), **event}, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+class Phase:
+    """Event sink for one install phase; counts the files and bytes it reports."""
+
+    def __init__(self, emit: EventSink, name: str) -> None:
+        self.name = name
+        self.files = 0
+        self.bytes = 0
+        self._emit = emit
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        if event.get("event") == "file":
+            with self._lock:
+                self.files += 1
+                self.bytes += event.get("bytes") or 0
+        self._emit({**event, "phase": self.name} if "phase" not in event else event)
+
+    def file(self, action: str, path: Path, size: int | None = None, duration: float = 0.0) -> None:
+        """Report one file; ``size`` defaults to the file's size on disk."""
+        self(file_event(action, path, size, duration))
+
+
+def file_event(action: str, path: Path, size: int | None = None, duration: float = 0.0) -> Event:
+    """A ``file`` event; ``size`` defaults to the file's size on disk."""
+    if size is None:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+    return {
+        "event": "file",
+        "action": action,
+        "path": str(path),
+        "bytes": size,
+        "duration_ms": _ms(duration),
+    }
+
+
+@contextmanager
+def phase(emit: Optional[EventSink], name: str) -> Iterator[Optional[Phase]]:
+    """Emit ``phase_start``/``phase_end`` around a block; yields None without a sink."""
+    if emit is None:
+        yield None
+        return
+    current = Phase(emit, name)
+    emit({"event": "phase_start", "phase": name})
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        emit(
+            {
+                "event": "phase_end",
+                "phase": name,
+                "files": current.files,
+                "bytes": current.bytes,
+                "duration_ms": _ms(time.perf_counter() - start),
+            }
+        )
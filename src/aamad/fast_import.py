@@ -0,0 +1,201 @@
+"""
+Installs as ``git fast-import`` streams.
+
+Seeding many repositories with ``aamad init`` normally needs a checkout, an
+install and a ``git add``/``git commit`` each. ``export_install`` renders the
+full install instead: every IDE layout, ``AGENTS.md`` and the install
+manifest. It writes them as a ``git fast-import`` stream that creates one
+commit on a branch::
+
+    aamad init --format fast-import --branch main | git -C repo.git fast-import
+
+The repository's working tree and index are never touched, so bare and large
+repositories are bootstrapped without a checkout. The converters work on
+files, so the install is rendered in a private temporary directory first.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any, Iterable, Mapping
+
+from .events import EventSink
+from .installer import AGENTS_MD_TEMPLATE, BundleSource, _agents_dir_note, extract_artifacts
+from .verify import MANIFEST_PATH
+
+# Every IDE target, in install order (later layouts may overwrite shared files)
+EXPORT_IDES = ("cursor", "claude-code", "vscode")
+
+DEFAULT_BRANCH = "main"
+DEFAULT_MESSAGE = "Add AAMAD framework artifacts"
+DEFAULT_AUTHOR = "aamad <aamad@localhost>"
+
+# Paths with these characters must be C-quoted in fast-import commands
+_QUOTE = {'"': '\\"', "\\": "\\\\", "\n": "\\n"}
+
+
+def _quote_path(path: str) -> str:
+    if not any(ch in path for ch in _QUOTE) and not path.startswith('"'):
+        return path
+    return '"' + "".join(_QUOTE.get(ch, ch) for ch in path) + '"'
+
+
+def _identity(author: str | None) -> str:
+    """``Name <email>`` from ``author``, the git environment or the default."""
+    if author:
+        return author
+    name = os.environ.get("GIT_AUTHOR_NAME")
+    email = os.environ.get("GIT_AUTHOR_EMAIL")
+    if name and email:
+        return f"{name} <{email}>"
+    return DEFAULT_AUTHOR
+
+
+def _ref(branch: str) -> str:
+    return branch if branch.startswith("refs/") else f"refs/heads/{branch}"
+
+
+def stage_install(
+    stage: Path,
+    ides: Iterable[str] = EXPORT_IDES,
+    *,
+    bundles: Mapping[str, BundleSource] | None = None,
+    on_event: EventSink | None = None,
+    **options: Any,
+) -> list[str]:
+    """
+    Install every IDE in ``ides`` into ``stage``.
+
+    Args:
+        stage: Empty staging directory.
+        ides: IDE targets to install.
+        bundles: Bundle per IDE instead of the embedded one.
+        on_event: Progress callback (see aamad.events).
+        **options: Further ``extract_artifacts`` keyword arguments.
+
+    Returns:
+        Sorted POSIX paths, relative to ``stage``, of the files to commit:
+        the installed files, ``AGENTS.md`` and the install manifest.
+    """
+    ides = list(ides)
+    for ide in ides:
+        extract_artifacts(
+            stage,
+            ide=ide,
+            overwrite=True,
+            snapshot=False,
+            bundle=(bundles or {}).get(ide),
+            on_event=on_event,
+            **options,
+        )
+    # One AGENTS.md pointing at every layout rather than the last one installed
+    note = "\n".join(_agents_dir_note(ide) for ide in ides)
+    (stage / "AGENTS.md").write_text(AGENTS_MD_TEMPLATE.format(agents_dir_note=note), encoding="utf-8")
+    state = stage / MANIFEST_PATH.parent
+    return sorted(
+        path.relative_to(stage).as_posix()
+        for path in stage.rglob("*")
+        if path.is_file() and (path.parent != state or path.name == MANIFEST_PATH.name)
+    )
+
+
+def write_stream(
+    out: IO[bytes],
+    root: Path,
+    paths: Iterable[str],
+    *,
+    branch: str = DEFAULT_BRANCH,
+    message: str = DEFAULT_MESSAGE,
+    parent: str | None = None,
+    author: str | None = None,
+    timestamp: int | None = None,
+) -> int:
+    """
+    Write a fast-import stream committing ``paths`` (relative to ``root``).
+
+    Args:
+        out: Binary output, e.g. the stdin of ``git fast-import``.
+        root: Directory the paths are read from.
+        paths: POSIX paths relative to ``root``.
+        branch: Branch name or full ref to commit to.
+        message: Commit message.
+        parent: Commit-ish the commit builds on; its files are kept. Without
+            it the commit is a root commit, which fast-import refuses to put
+            on an existing branch.
+        author: ``Name <email>`` (default: ``$GIT_AUTHOR_NAME``/``$GIT_AUTHOR_EMAIL``).
+        timestamp: Commit time in seconds (default: ``$SOURCE_DATE_EPOCH`` or now).
+
+    Returns:
+        Number of files in the commit.
+    """
+    ref = _ref(branch)
+    if timestamp is None:
+        timestamp = int(os.environ.get("SOURCE_DATE_EPOCH") or time.time())
+    who = f"{_identity(author)} {timestamp} +0000"
+    body = message.encode("utf-8")
+    if not body.endswith(b"\n"):
+        body += b"\n"
+    # "done" makes fast-import reject a truncated stream instead of committing part of it
+    out.write(b"feature done\n")
+    out.write(f"commit {ref}\nauthor {who}\ncommitter {who}\ndata {len(body)}\n".encode("utf-8"))
+    out.write(body)
+    if parent is not None:
+        # Starting a branch from itself needs ^0 (see git-fast-import(1))
+        out.write(f"from {parent + '^0' if _ref(parent) == ref else parent}\n".encode("utf-8"))
+    count = 0
+    for rel in paths:
+        path = root / rel
+        mode = "100755" if os.access(path, os.X_OK) else "100644"
+        data = path.read_bytes()
+        out.write(f"M {mode} inline {_quote_path(rel)}\ndata {len(data)}\n".encode("utf-8"))
+        out.write(data)
+        out.write(b"\n")
+        count += 1
+    out.write(b"\ndone\n")
+    return count
+
+
+def export_install(
+    out: IO[bytes],
+    ides: Iterable[str] = EXPORT_IDES,
+    *,
+    branch: str = DEFAULT_BRANCH,
+    message: str = DEFAULT_MESSAGE,
+    parent: str | None = None,
+    author: str | None = None,
+    timestamp: int | None = None,
+    bundles: Mapping[str, BundleSource] | None = None,
+    on_event: EventSink | None = None,
+    **options: Any,
+) -> int:
+    """
+    Render the install for ``ides`` as a fast-import stream on ``out``.
+
+    Takes the ``stage_install`` and ``write_stream`` arguments; ``options``
+    are passed to ``extract_artifacts`` (``values``, ``compact``, ``runtime``,
+    ``limits``...).
+
+    Returns:
+        Number of files in the commit.
+
+    Raises:
+        ValueError: if ``dry_run`` is requested (a stream always has content).
+    """
+    if options.pop("dry_run", False):
+        raise ValueError("A fast-import stream cannot be a dry run")
+    with tempfile.TemporaryDirectory(prefix="aamad-export-") as tmp:
+        stage = Path(tmp)
+        paths = stage_install(stage, ides, bundles=bundles, on_event=on_event, **options)
+        return write_stream(
+            out,
+            stage,
+            paths,
+            branch=branch,
+            message=message,
+            parent=parent,
+            author=author,
+            timestamp=timestamp,
+        )
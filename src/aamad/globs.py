@@ -0,0 +1,151 @@
+"""
+Glob helpers shared by the AAMAD converters and context tooling.
+
+Cursor rules scope themselves with ``globs`` (a YAML list or a comma-joined
+string), VS Code instructions with a comma-joined ``applyTo`` string and Claude
+Code rules with a ``paths`` list. These helpers normalise those forms and match
+workspace-relative paths against them.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Iterable
+
+
+def _split_top_level(value: str) -> list[str]:
+    """Split on commas that are not nested inside ``{...}`` brace groups."""
+    parts: list[str] = []
+    depth = 0
+    current: list[str] = []
+    for char in value:
+        if char == "{":
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def split_globs(value: Any) -> list[str]:
+    """
+    Normalise a ``globs``/``applyTo``/``paths`` value into a list of patterns.
+
+    Accepts a list, a comma-joined string or None. Commas inside brace groups
+    (``*.{ts,tsx}``) are kept with their pattern; surrounding quotes and blank
+    entries are dropped.
+    """
+    if not value:
+        return []
+    items = value if isinstance(value, (list, tuple)) else [value]
+    patterns: list[str] = []
+    for item in items:
+        if item is None:
+            continue
+        for part in _split_top_level(str(item)):
+            part = part.strip().strip("\"'").strip()
+            if part:
+                patterns.append(part)
+    return patterns
+
+
+def expand_braces(pattern: str) -> list[str]:
+    """Expand ``{a,b}`` groups into separate patterns (``src/*.{ts,tsx}`` -> two patterns)."""
+    match = re.search(r"\{([^{}]*)\}", pattern)
+    if not match:
+        return [pattern]
+    head, tail = pattern[: match.start()], pattern[match.end() :]
+    expanded: list[str] = []
+    for option in match.group(1).split(","):
+        expanded.extend(expand_braces(head + option + tail))
+    return expanded
+
+
+def _translate(pattern: str) -> str:
+    """Translate a glob into an (unanchored) regex fragment."""
+    out: list[str] = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif char == "{":
+            end = pattern.find("}", i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                options = pattern[i + 1 : end].split(",")
+                out.append("(?:" + "|".join(_translate(o) for o in options) + ")")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+@lru_cache(maxsize=512)
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """
+    Compile a workspace glob into a regex.
+
+    Supports ``**`` (any number of directories), ``*``, ``?``, ``[...]`` and
+    ``{a,b}``. Patterns without a ``/`` match the basename at any depth, the
+    same way Cursor and .gitignore treat them.
+    """
+    pattern = pattern.strip().lstrip("/")
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    if "/" not in pattern and pattern != "**":
+        pattern = "**/" + pattern
+    return re.compile("(?s:" + _translate(pattern) + r")\Z")
+
+
+def glob_match(pattern: str, path: str) -> bool:
+    """Return True when the workspace-relative ``path`` matches ``pattern``."""
+    path = path.replace("\\", "/").lstrip("/")
+    if path.startswith("./"):
+        path = path[2:]
+    return glob_to_regex(pattern).match(path) is not None
+
+
+def match_any(patterns: Iterable[str], path: str) -> bool:
+    """
+    Return True when ``path`` matches at least one positive pattern and no
+    negated (``!``-prefixed) pattern.
+    """
+    positive = False
+    for pattern in patterns:
+        if pattern.startswith("!"):
+            if glob_match(pattern[1:], path):
+                return False
+            continue
+        if not positive and glob_match(pattern, path):
+            positive = True
+    return positive
@@ -1,15 +1,37 @@
 from __future__ import annotations
 
+import heapq
+import io
+import os
 import shutil
+import tempfile
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from importlib import resources
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Union
+
+from .events import EventSink, Phase, phase
+
+if TYPE_CHECKING:
+    from importlib.abc import Traversable
+
+    from .compact import CompactStats
+    from .limits import ExtractLimits
+    from .report import InstallReport
+    from .selection import Selection
+
+# A bundle on disk, or a package resource inside a zip (e.g. the aamad.pyz zipapp)
+BundleSource = Union[Path, "Traversable"]
 
 BUNDLE_CURSOR = "data/aamad_bundle.zip"
 BUNDLE_CLAUDE = "data/aamad_claude_bundle.zip"
 
+# Bundles with at least this many members are extracted on all CPUs by default
+PARALLEL_MIN_MEMBERS = 256
+
 IDE_BUNDLES = {
     "cursor": BUNDLE_CURSOR,
     "claude-code": BUNDLE_CLAUDE,
@@ -38,19 +60,96 @@ See the full agent definitions in the IDE-specific directories.
 
 ## Rules
 All development follows AAMAD core rules. See project-context/ for artifacts.
+To look up one requirement or decision, run `aamad context query "<terms>"`
+instead of reading whole artifacts; it prints only the matching sections.
 
 ## Agent Definitions
 {agents_dir_note}
 """
 
 
+@dataclass(frozen=True)
+class MemoryBundle:
+    """A bundle held in memory, re-packed uncompressed so member reads are plain copies."""
+
+    name: str
+    data: bytes
+
+    def read_bytes(self) -> bytes:
+        return self.data
+
+
+# Bundles loaded by ``preload_bundles`` (kept hot by ``aamad serve``)
+_PRELOADED: dict[str, MemoryBundle] = {}
+
+
+def get_bundle_resource(ide: str = "cursor") -> BundleSource:
+    """
+    Return the embedded artifact bundle for the given IDE without copying it.
+
+    This is a plain Path for an installed package, a zip-backed Traversable
+    when aamad runs from a zipapp, or a MemoryBundle after ``preload_bundles``;
+    open it with ``open_bundle``.
+    """
+    bundle_name = IDE_BUNDLES.get(ide, IDE_BUNDLES["cursor"])
+    return _PRELOADED.get(bundle_name) or resources.files("aamad") / bundle_name
+
+
+def preload_bundles() -> dict[str, MemoryBundle]:
+    """
+    Decompress every embedded bundle into memory for this process.
+
+    Later ``get_bundle_resource`` calls return the in-memory copies. Member
+    CRCs are unchanged, so verification and manifests are unaffected.
+    """
+    for bundle_name in sorted(set(IDE_BUNDLES.values())):
+        if bundle_name in _PRELOADED:
+            continue
+        buf = io.BytesIO()
+        with open_bundle(resources.files("aamad") / bundle_name) as src, zipfile.ZipFile(
+            buf, "w", compression=zipfile.ZIP_STORED
+        ) as dst:
+            for member in src.infolist():
+                info = zipfile.ZipInfo(member.filename, member.date_time)
+                info.external_attr = member.external_attr
+                dst.writestr(info, src.read(member))
+        _PRELOADED[bundle_name] = MemoryBundle(bundle_name, buf.getvalue())
+    return dict(_PRELOADED)
+
+
+def _balanced_batches(members: list[zipfile.ZipInfo], count: int) -> list[list[zipfile.ZipInfo]]:
+    """Split members into ``count`` batches of similar total size (largest first)."""
+    batches: list[list[zipfile.ZipInfo]] = [[] for _ in range(count)]
+    loads = [(0, i) for i in range(count)]
+    for member in sorted(members, key=lambda m: m.file_size, reverse=True):
+        load, i = heapq.heappop(loads)
+        batches[i].append(member)
+        heapq.heappush(loads, (load + member.file_size, i))
+    return [b for b in batches if b]
+
+
 def get_bundle_path(ide: str = "cursor") -> Path:
     """Return a filesystem path to the embedded artifact bundle for the given IDE."""
     bundle_name = IDE_BUNDLES.get(ide, IDE_BUNDLES["cursor"])
-    with resources.as_file(resources.files("aamad") / bundle_name) as bundle:
+    resource = resources.files("aamad") / bundle_name
+    if isinstance(resource, Path):
+        return resource
+    with resources.as_file(resource) as bundle:
         return bundle
 
 
+def open_bundle(bundle: BundleSource | str) -> zipfile.ZipFile:
+    """
+    Open a bundle for reading.
+
+    Paths are opened directly; a bundle stored inside another archive (the
+    zipapp) is read into memory, so no temporary file is extracted.
+    """
+    if isinstance(bundle, (str, os.PathLike)):
+        return zipfile.ZipFile(bundle, "r")
+    return zipfile.ZipFile(io.BytesIO(bundle.read_bytes()), "r")
+
+
 def _agents_dir_note(ide: str) -> str:
     """Return the IDE-specific pointer for agent definitions."""
     if ide in ("claude-code", "claude_code"):
@@ -91,12 +190,71 @@ def write_agents_md(
     return path
 
 
+def _stage_cursor_sources(
+    stage: Path, selection: Selection | None = None, bundle: BundleSource | None = None
+) -> Path:
+    """
+    Extract the Cursor bundle's `.cursor/` sources into ``stage`` for on-the-fly conversion.
+
+    The `.cursor/` members of ``bundle`` (e.g. a layered stack with overlay
+    rules and agents) are extracted over them. With a ``selection``, only the
+    sources it converts for claude-code are extracted.
+    """
+    sources = [get_bundle_resource("cursor")] + ([bundle] if bundle is not None else [])
+    for source in sources:
+        with open_bundle(source) as zf:
+            for member in zf.infolist():
+                if not member.filename.startswith(".cursor/") or member.is_dir():
+                    continue
+                if selection and not selection.converts(member.filename, "claude-code"):
+                    continue
+                zf.extract(member, stage)
+    (stage / ".cursor" / "rules").mkdir(parents=True, exist_ok=True)
+    return stage
+
+
+def _cursor_sources(bundle: BundleSource | None) -> list[str]:
+    """Members of ``bundle`` the claude-code converter reads (none in the stock bundle)."""
+    from .selection import converted_name
+
+    if bundle is None:
+        return []
+    with open_bundle(bundle) as zf:
+        return [n for n in zf.namelist() if converted_name(n, "claude-code") is not None]
+
+
+def _copy_selected_sources(root: Path, stage: Path, selection: Selection, target: str) -> Path:
+    """Copy the `.cursor/` sources under ``root`` that ``selection`` converts into ``stage``."""
+    for path in sorted((root / ".cursor").rglob("*")):
+        rel = path.relative_to(root).as_posix()
+        if path.is_file() and selection.converts(rel, target):
+            (stage / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, stage / rel)
+    (stage / ".cursor" / "rules").mkdir(parents=True, exist_ok=True)
+    return stage
+
+
 def extract_artifacts(
     destination: Path | str,
     *,
     ide: str = "cursor",
     overwrite: bool = False,
     dry_run: bool = False,
+    compact: bool = False,
+    compact_stats: CompactStats | None = None,
+    values: Mapping[str, str] | None = None,
+    snapshot: bool = True,
+    snapshot_keep: int | None = None,
+    bundle: BundleSource | None = None,
+    jobs: int | None = None,
+    cache: bool = False,
+    split_templates: bool = False,
+    runtime: str | None = None,
+    limits: ExtractLimits | None = None,
+    only: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    on_event: EventSink | None = None,
+    lock_timeout: float | None = None,
 ) -> list[Path]:
     """
     Extract the bundled artifacts into ``destination``.
@@ -110,41 +268,335 @@ def extract_artifacts(
         ide: Target IDE — "cursor" (default), "claude-code", or "vscode".
         overwrite: If False, raises FileExistsError when target already exists.
         dry_run: When True, no files are written; returns the would-be paths.
+        compact: For "claude-code" and "vscode", emit deduplicated, minified rule
+            context. Claude Code rules are then re-rendered from the Cursor sources
+            instead of copied from the prebuilt bundle.
+        compact_stats: Optional accumulator for the compact size reduction.
+        values: Template values rendered into `.cursor/templates/` and
+            `project-context/` files (see aamad.templates).
+        snapshot: When overwriting, first store the files about to be replaced
+            in `.aamad/snapshots/` so `aamad rollback` can restore them.
+        snapshot_keep: Snapshot retention limit (default: aamad.snapshots.DEFAULT_KEEP).
+        bundle: Bundle to install instead of the embedded one for ``ide`` (e.g. a
+            layered bundle from ``aamad.layers.resolve_layers``). For
+            claude-code, `.cursor/` rules, agents and prompts it carries are
+            converted over the Cursor bundle's, whatever ``compact`` is.
+        jobs: Extraction threads (see ``ArtifactInstaller.extract``).
+        cache: Reuse converted claude-code/vscode outputs for unchanged sources
+            from the conversion cache (see aamad.conversion_cache). Off by
+            default so library callers write nothing outside ``destination``
+            unless they opt in; ``aamad init`` turns it on (``--no-cache``).
+        split_templates: Also write each template as per-section files with an
+            index and point installed agents at it (see aamad.template_sections).
+            Skipped for dry runs.
+        runtime: Target runtime (see aamad.runtime.RUNTIMES). Only its adapter
+            rule is installed, references to the others are removed and
+            AAMAD_TARGET_RUNTIME is set in the IDE settings. Default: install
+            every adapter.
+        limits: Extraction limits (see aamad.limits; default DEFAULT_LIMITS).
+            A bundle exceeding them raises LimitExceeded before any write.
+        only: Selectors to install (components, agent ids or globs; see
+            aamad.selection). Default: everything.
+        exclude: Selectors not to install. Unselected bundle members are
+            never decompressed or written and are recorded as excluded in the
+            install manifest; unselected sources are not converted.
+        on_event: Progress callback receiving phase and per-file events
+            (see aamad.events).
+        lock_timeout: Seconds to wait for another install into ``destination``
+            to finish (default: wait indefinitely).
+
+    Installs into one destination are serialised with an advisory lock
+    (see aamad.locking). A request that waited for an identical one returns
+    that install's paths instead of repeating it.
     """
-    dest = Path(destination).expanduser().resolve()
-    installer = ArtifactInstaller(get_bundle_path(ide))
-    paths = list(installer.extract(dest, overwrite=overwrite, dry_run=dry_run))
+    options = dict(
+        ide=ide,
+        overwrite=overwrite,
+        dry_run=dry_run,
+        compact=compact,
+        compact_stats=compact_stats,
+        values=values,
+        snapshot=snapshot,
+        snapshot_keep=snapshot_keep,
+        bundle=bundle,
+        jobs=jobs,
+        cache=cache,
+        split_templates=split_templates,
+        runtime=runtime,
+        limits=limits,
+        selection=None,
+        on_event=on_event,
+    )
+    if only or exclude:
+        from .selection import parse_selection
 
-    if ide == "vscode":
-        if dry_run:
-            from aamad.vscode_copilot import get_vscode_planned_paths
+        options["selection"] = parse_selection(only, exclude)
+    if runtime is not None:
+        from .runtime import RUNTIMES
 
-            paths.extend(get_vscode_planned_paths(dest))
-        else:
-            from aamad.vscode_copilot import install_vscode_copilot
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Unknown runtime: {runtime} (expected one of {', '.join(RUNTIMES)})")
+    if dry_run:
+        return _install_artifacts(destination, **options)
 
-            paths.extend(install_vscode_copilot(dest, dest, overwrite=overwrite))
+    from .limits import DEFAULT_LIMITS, check_members
+    from .locking import request_key, run_exclusive
 
-    # Add AGENTS.md (generated, not from bundle)
-    agents_path = write_agents_md(
-        destination,
+    # Reject a bad bundle before the lock and state files are created
+    with open_bundle(bundle if bundle is not None else get_bundle_resource(ide)) as zf:
+        check_members(zf.infolist(), DEFAULT_LIMITS if limits is None else limits)
+
+    key = request_key(
         ide=ide,
         overwrite=overwrite,
-        dry_run=dry_run,
+        compact=compact,
+        values=dict(values or {}),
+        snapshot=snapshot,
+        split_templates=split_templates,
+        runtime=runtime,
+        only=sorted(only or ()),
+        exclude=sorted(exclude or ()),
+        bundle=str(bundle if bundle is not None else get_bundle_resource(ide)),
     )
-    if agents_path is not None:
-        paths.append(agents_path)
+
+    def on_wait() -> None:
+        if on_event is not None:
+            on_event({"event": "lock", "action": "wait", "path": str(destination)})
+
+    paths, joined = run_exclusive(
+        destination,
+        key,
+        lambda: _install_artifacts(destination, **options),
+        timeout=lock_timeout,
+        on_wait=on_wait,
+    )
+    if joined and on_event is not None:
+        on_event({"event": "lock", "action": "joined", "files": len(paths)})
     return paths
 
 
+def install_artifacts(
+    destination: Path | str,
+    *,
+    on_event: EventSink | None = None,
+    **options: Any,
+) -> InstallReport:
+    """
+    Like ``extract_artifacts``, but return a structured report.
+
+    Args:
+        destination: Install root.
+        on_event: Optional callback that also receives every progress event.
+        **options: Keyword arguments of ``extract_artifacts``.
+
+    Returns:
+        InstallReport with the installed paths, per-file actions, bytes read
+        and written, files decompressed, cache hits and phase durations
+        (see aamad.report).
+    """
+    from .report import ReportBuilder
+
+    builder = ReportBuilder(on_event)
+    paths = extract_artifacts(destination, on_event=builder, **options)
+    return builder.finish(paths)
+
+
+def _install_artifacts(
+    destination: Path | str,
+    *,
+    ide: str = "cursor",
+    overwrite: bool = False,
+    dry_run: bool = False,
+    compact: bool = False,
+    compact_stats: CompactStats | None = None,
+    values: Mapping[str, str] | None = None,
+    snapshot: bool = True,
+    snapshot_keep: int | None = None,
+    bundle: BundleSource | None = None,
+    jobs: int | None = None,
+    cache: bool = False,
+    split_templates: bool = False,
+    runtime: str | None = None,
+    limits: ExtractLimits | None = None,
+    selection: Selection | None = None,
+    on_event: EventSink | None = None,
+) -> list[Path]:
+    """Unlocked implementation of ``extract_artifacts``."""
+    dest = Path(destination).expanduser().resolve()
+    if overwrite and snapshot and not dry_run:
+        from .snapshots import DEFAULT_KEEP, create_snapshot
+
+        with phase(on_event, "snapshot") as events:
+            planned = _install_artifacts(
+                dest,
+                ide=ide,
+                dry_run=True,
+                values=values,
+                bundle=bundle,
+                split_templates=split_templates,
+                limits=limits,
+                selection=selection,
+            )
+            snap = create_snapshot(
+                dest,
+                planned,
+                keep=DEFAULT_KEEP if snapshot_keep is None else snapshot_keep,
+            )
+            if events is not None and snap is not None:
+                events.file("written", snap.path)
+
+    installer = ArtifactInstaller(bundle if bundle is not None else get_bundle_resource(ide))
+    with phase(on_event, "extract") as events:
+        paths = list(
+            installer.extract(
+                dest,
+                overwrite=overwrite,
+                dry_run=dry_run,
+                values=values,
+                jobs=jobs,
+                on_event=events,
+                limits=limits,
+                selection=selection,
+            )
+        )
+
+    generated: list[Path] = []
+    if ide == "vscode":
+        with phase(on_event, "convert") as events:
+            if dry_run:
+                from aamad.vscode_copilot import get_vscode_planned_paths
+
+                converted = get_vscode_planned_paths(dest, installer.preview())
+                if selection:
+                    converted = [
+                        p for p in converted
+                        if selection.keeps_output(p.relative_to(dest).as_posix(), "vscode")
+                    ]
+            else:
+                from aamad.vscode_copilot import install_vscode_copilot
+
+                with tempfile.TemporaryDirectory() as tmp:
+                    # Convert only the selected sources, wherever they came from
+                    source_root = (
+                        _copy_selected_sources(dest, Path(tmp), selection, "vscode")
+                        if selection
+                        else dest
+                    )
+                    converted = install_vscode_copilot(
+                        source_root,
+                        dest,
+                        overwrite=overwrite,
+                        compact=compact,
+                        compact_stats=compact_stats,
+                        cache=cache,
+                        on_event=events,
+                        handoff_agents=selection.converted_agents("vscode") if selection else None,
+                    )
+            paths.extend(converted)
+            # .vscode/settings.json is merged into the user's settings, so not pinned
+            generated.extend(p for p in converted if p != dest / ".vscode" / "settings.json")
+            if dry_run:
+                _report(events, "planned", converted)
+    elif ide in ("claude-code", "claude_code") and (compact or _cursor_sources(bundle)):
+        # Compact output, or rules/agents a layered bundle adds, must be converted
+        from aamad.claude_code import get_claude_planned_paths, install_claude_code
+        from aamad.runtime import DEFAULT_RUNTIME
+
+        with phase(on_event, "convert") as events, tempfile.TemporaryDirectory() as tmp:
+            if dry_run:
+                sources = _cursor_sources(get_bundle_resource("cursor")) + _cursor_sources(bundle)
+                if selection:
+                    sources = [n for n in sources if selection.converts(n, "claude-code")]
+                converted = get_claude_planned_paths(dest, sources)
+                _report(events, "planned", converted)
+            else:
+                stage = _stage_cursor_sources(Path(tmp), selection, bundle)
+                # Bundle files were just written (or overwrite was allowed), so replace them
+                converted = install_claude_code(
+                    stage,
+                    dest,
+                    overwrite=True,
+                    compact=compact,
+                    compact_stats=compact_stats,
+                    cache=cache,
+                    on_event=events,
+                    runtime=runtime or DEFAULT_RUNTIME,
+                )
+                generated.extend(converted)
+            paths.extend(p for p in converted if p not in paths)
+
+    excluded: list[str] = []
+    if selection:
+        excluded.extend(name for name in installer.preview() if not selection.selects(name))
+        if not dry_run:
+            from .selection import drop_unselected_references
+
+            with phase(on_event, "select") as events:
+                _report(events, "written", drop_unselected_references(dest, selection))
+    if runtime is not None:
+        from .runtime import apply_runtime, pruned_names
+
+        with phase(on_event, "runtime") as events:
+            pruned = pruned_names(runtime, ide)
+            paths = [p for p in paths if p.name not in pruned]
+            if not dry_run:
+                result = apply_runtime(dest, runtime, ide)
+                excluded.extend(result.removed)
+                _report(events, "written", result.written)
+
+    if split_templates:
+        from .template_sections import planned_sections
+        from .template_sections import split_templates as write_template_sections
+
+        with phase(on_event, "templates") as events:
+            if dry_run:
+                sections = planned_sections(
+                    dest, installer.bundle_path, values=values, selection=selection
+                )
+            else:
+                sections = write_template_sections(dest)
+            paths.extend(p for p in sections if p not in paths)
+            _report(events, "planned" if dry_run else "written", sections)
+
+    # Add AGENTS.md (generated, not from bundle)
+    with phase(on_event, "agents-md") as events:
+        agents_path = write_agents_md(
+            destination,
+            ide=ide,
+            overwrite=overwrite,
+            dry_run=dry_run,
+        )
+        if agents_path is not None:
+            paths.append(agents_path)
+            _report(events, "planned" if dry_run else "written", [agents_path])
+
+    if not dry_run:
+        from .verify import record_manifest
+
+        with phase(on_event, "manifest") as events:
+            manifest = record_manifest(
+                dest, installer.bundle_path, excluded=excluded, generated=generated
+            )
+            _report(events, "written", [manifest])
+    return paths
+
+
+def _report(events: Phase | None, action: str, paths: Iterable[Path]) -> None:
+    """Emit one file event per path (no-op without an event sink)."""
+    if events is None:
+        return
+    for path in paths:
+        events.file(action, path, 0 if action == "planned" else None)
+
+
 @dataclass
 class ArtifactInstaller:
     """Utility object that manages the bundled zip file."""
 
-    bundle_path: Path
+    bundle_path: BundleSource
 
     def iter_members(self) -> Iterator[zipfile.ZipInfo]:
-        with zipfile.ZipFile(self.bundle_path, "r") as zf:
+        with open_bundle(self.bundle_path) as zf:
             for member in zf.infolist():
                 yield member
 
@@ -157,26 +609,124 @@ class ArtifactInstaller:
         *,
         overwrite: bool = False,
         dry_run: bool = False,
+        values: Mapping[str, str] | None = None,
+        jobs: int | None = None,
+        on_event: EventSink | None = None,
+        limits: ExtractLimits | None = None,
+        selection: Selection | None = None,
     ) -> list[Path]:
+        """
+        Extract every bundle member into ``destination``.
+
+        When ``values`` is given, template members (see
+        ``aamad.templates.is_template_member``) are rendered with them instead
+        of being copied verbatim.
+
+        Existing files are checked and every target directory is created once
+        before anything is written. Members are then written by ``jobs``
+        threads (default: one per CPU for bundles of at least
+        PARALLEL_MIN_MEMBERS members, else one), each with its own zip handle;
+        zlib releases the GIL while decompressing. When overwriting, files
+        already identical to their member (same size and CRC-32) are skipped.
+
+        ``on_event`` receives a ``file`` event per member (see aamad.events).
+
+        Members are checked against ``limits`` (default:
+        ``aamad.limits.DEFAULT_LIMITS``) and for unsafe paths in the same pass,
+        so a rejected bundle raises ``LimitExceeded`` before anything is written.
+
+        With a ``selection`` (see aamad.selection), members it does not select
+        are dropped from the central-directory listing before extraction, so
+        they are never decompressed or written.
+        """
+        from .limits import DEFAULT_LIMITS, check_members
+
         destination = destination.expanduser().resolve()
+        with open_bundle(self.bundle_path) as zf:
+            members = zf.infolist()
+        check_members(members, DEFAULT_LIMITS if limits is None else limits)
+        if selection:
+            members = [m for m in members if selection.selects(m.filename)]
         if dry_run:
-            return self._planned_paths(destination)
-
-        with zipfile.ZipFile(self.bundle_path, "r") as zf:
-            for member in zf.infolist():
+            planned = [destination / m.filename for m in members]
+            if on_event is not None:
+                for path in planned:
+                    on_event({"event": "file", "action": "planned", "path": str(path), "bytes": 0})
+            return planned
+
+        files = [m for m in members if not m.is_dir()]
+        if not overwrite:
+            for member in files:
                 target = destination / member.filename
-                if member.is_dir():
-                    target.mkdir(parents=True, exist_ok=True)
-                    continue
-                if not overwrite and target.exists():
+                if target.exists():
                     raise FileExistsError(
                         f"{target} already exists. Use overwrite=True to replace it."
                     )
-                target.parent.mkdir(parents=True, exist_ok=True)
-                with zf.open(member, "r") as src, open(target, "wb") as dst:
-                    shutil.copyfileobj(src, dst)
-        return self._planned_paths(destination)
-
-    def _planned_paths(self, destination: Path) -> list[Path]:
-        members: Iterable[str] = [m.filename for m in self.iter_members()]
-        return [destination / name for name in members]
+        directories = {destination / m.filename for m in members if m.is_dir()}
+        directories.update((destination / m.filename).parent for m in files)
+        for directory in sorted(directories):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        if jobs is None:
+            jobs = (os.cpu_count() or 1) if len(files) >= PARALLEL_MIN_MEMBERS else 1
+        batches = _balanced_batches(files, max(1, min(jobs, len(files))))
+        if len(batches) <= 1:
+            for batch in batches:
+                self._extract_batch(batch, destination, values, overwrite, on_event)
+        else:
+            with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+                # list() re-raises the first worker error
+                list(
+                    pool.map(
+                        lambda b: self._extract_batch(b, destination, values, overwrite, on_event),
+                        batches,
+                    )
+                )
+        return [destination / m.filename for m in members]
+
+    def _extract_batch(
+        self,
+        members: list[zipfile.ZipInfo],
+        destination: Path,
+        values: Mapping[str, str] | None,
+        overwrite: bool = False,
+        on_event: EventSink | None = None,
+    ) -> None:
+        """Write ``members`` using a zip handle private to the calling thread."""
+        if values:
+            from .templates import is_template_member, render_template
+        if overwrite:
+            from .verify import file_crc32
+
+        with open_bundle(self.bundle_path) as zf:
+            for member in members:
+                start = time.perf_counter()
+                target = destination / member.filename
+                existed = overwrite and target.is_file()
+                action = "overwritten" if existed else "written"
+                read = member.compress_size
+                if values and is_template_member(member.filename):
+                    text = zf.read(member).decode("utf-8")
+                    target.write_text(render_template(text, values), encoding="utf-8")
+                elif (
+                    existed
+                    and target.stat().st_size == member.file_size
+                    and file_crc32(target) == member.CRC
+                ):
+                    action = "skipped"
+                    read = 0
+                else:
+                    with zf.open(member, "r") as src, open(target, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                if on_event is not None:
+                    on_event(
+                        {
+                            "event": "file",
+                            "action": action,
+                            "path": str(target),
+                            "bytes": target.stat().st_size,
+                            "compressed_bytes": read,
+                            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                        }
+                    )
+
@@ -0,0 +1,166 @@
+"""
+Layered bundles: a base bundle plus org-specific overlays.
+
+Each layer is a bundle zip or a directory laid out like one (``.cursor/``,
+``project-context/``, ...). Layers are resolved union-filesystem style: every
+path comes from the last layer that provides it. The merged result is written
+once as an ordinary bundle zip in the cache directory (``layers/<key>.zip``),
+keyed by a hash over all layers, so repeated installs of the same stack reuse
+it without re-scanning or re-merging, and every consumer of a bundle (install,
+``bundle-info``, ``verify``) works on it unchanged. Only the ``LAYERS_KEEP``
+most recently used merges are kept; every edit of a layer produces a new key.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import os
+import time
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Sequence, Union
+
+from .cache import atomic_write_bytes, cache_dir
+from .installer import BundleSource, open_bundle
+from .limits import DEFAULT_LIMITS, ExtractLimits, check_members
+
+# Bump when the merged layout changes so stale cache entries are ignored
+LAYERS_FORMAT = 1
+
+# Merged stacks kept in the cache (most recently used first)
+LAYERS_KEEP = 8
+
+# Directory names never taken from directory layers
+_SKIP_DIRS = {".git", "__pycache__", ".aamad"}
+
+_CHUNK = 1 << 20
+
+Layer = Union[BundleSource, str]
+
+
+def _iter_dir_files(root: Path) -> list[tuple[str, Path]]:
+    """Return ``(bundle_name, path)`` for every file under a directory layer, sorted."""
+    files: list[tuple[str, Path]] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            files.append((path.relative_to(root).as_posix(), path))
+    return sorted(files)
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    """sha256 of a zip layer, memoised per (path, size, mtime) in this process."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def layer_digest(layer: Layer) -> str:
+    """
+    Content key of one layer.
+
+    Zip layers hash their bytes; directory layers hash every file's relative
+    path, size and mtime (cheaper than reading them, and any edit changes it).
+    """
+    if isinstance(layer, (str, os.PathLike)):
+        path = Path(layer)
+        if path.is_dir():
+            digest = hashlib.sha256(b"dir\0")
+            for name, file in _iter_dir_files(path):
+                st = file.stat()
+                digest.update(f"{name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+            return digest.hexdigest()
+        if not path.is_file():
+            raise FileNotFoundError(f"Bundle layer not found: {path}")
+        st = path.stat()
+        return _file_digest(str(path), st.st_size, st.st_mtime_ns)
+    return hashlib.sha256(layer.read_bytes()).hexdigest()
+
+
+def stack_key(layers: Sequence[Layer]) -> str:
+    """Cache key for an ordered stack of layers."""
+    digest = hashlib.sha256(f"aamad-layers-{LAYERS_FORMAT}\n".encode("utf-8"))
+    for layer in layers:
+        digest.update(layer_digest(layer).encode("ascii") + b"\n")
+    return digest.hexdigest()[:32]
+
+
+def _merge(layers: Sequence[BundleSource], limits: ExtractLimits = DEFAULT_LIMITS) -> bytes:
+    """Merge ``layers`` into one bundle zip, later layers winning."""
+    # name -> (layer index, source); only the winning source of a path is read
+    index: dict[str, tuple[int, object]] = {}
+    for i, layer in enumerate(layers):
+        if isinstance(layer, Path) and layer.is_dir():
+            for name, path in _iter_dir_files(layer):
+                index[name] = (i, path)
+        else:
+            with open_bundle(layer) as zf:
+                # Overlays are untrusted: reject bombs and unsafe paths before reading
+                check_members(zf.infolist(), limits)
+                for member in zf.infolist():
+                    if not member.is_dir():
+                        index[member.filename] = (i, member.filename)
+
+    buf = io.BytesIO()
+    handles: dict[int, zipfile.ZipFile] = {}
+    try:
+        with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as out:
+            for name in sorted(index):
+                i, source = index[name]
+                if isinstance(source, Path):
+                    out.write(source, name)
+                    continue
+                if i not in handles:
+                    handles[i] = open_bundle(layers[i])
+                out.writestr(handles[i].getinfo(name), handles[i].read(name))
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return buf.getvalue()
+
+
+def resolve_layers(layers: Sequence[Layer], *, limits: ExtractLimits = DEFAULT_LIMITS) -> Path:
+    """
+    Return a bundle zip that merges ``layers`` (base first, overlays after).
+
+    The merged bundle is cached under ``<cache>/layers/<key>.zip``; a stack
+    whose layers are unchanged resolves to the cached file directly.
+
+    Raises:
+        FileNotFoundError: if a layer path does not exist.
+        LimitExceeded: if a zip layer violates ``limits`` (see aamad.limits).
+    """
+    layers = [
+        Path(layer).expanduser().resolve() if isinstance(layer, (str, os.PathLike)) else layer
+        for layer in layers
+    ]
+    target = cache_dir("layers") / f"{stack_key(layers)}.zip"
+    if target.is_file():
+        with contextlib.suppress(OSError):
+            # Record the use in the access time (kept explicitly; mounts may be noatime)
+            os.utime(target, ns=(time.time_ns(), target.stat().st_mtime_ns))
+    else:
+        atomic_write_bytes(target, _merge(layers, limits))
+        prune_layers()
+    return target
+
+
+def prune_layers(keep: int = LAYERS_KEEP) -> list[Path]:
+    """Delete all but the ``keep`` most recently used merged stacks. Returns the removed files."""
+    entries = []
+    for path in cache_dir("layers").glob("*.zip"):
+        with contextlib.suppress(FileNotFoundError):
+            entries.append((path.stat().st_atime_ns, path))
+    entries.sort(reverse=True)
+    removed = [path for _, path in entries[max(keep, 0) :]]
+    for path in removed:
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+    return removed
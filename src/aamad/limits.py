@@ -0,0 +1,149 @@
+"""
+Resource limits for bundle extraction.
+
+Custom bundles and overlays are untrusted input: a zip bomb, a huge member, a
+flood of tiny members or a ``../`` path in ``member.filename`` would otherwise
+cost memory, disk and time, or write outside the destination. ``check_members``
+checks every member's central-directory entry against ``ExtractLimits`` in the
+single pass the installer already makes before writing anything. Nothing is
+decompressed, and one ``LimitExceeded`` error reports every violation.
+
+Declared sizes are binding: ``zipfile`` never yields more than a member's
+declared ``file_size``, and it verifies the CRC, so a member cannot inflate
+beyond what was checked.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import zipfile
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Iterable, Optional
+
+MiB = 1 << 20
+
+# Members smaller than this are exempt from the ratio check: small text
+# compresses well without being a bomb
+RATIO_MIN_BYTES = 1 * MiB
+
+# ``--limit`` keys -> ExtractLimits fields
+LIMIT_KEYS = {
+    "total-bytes": "max_total_bytes",
+    "member-bytes": "max_member_bytes",
+    "ratio": "max_ratio",
+    "members": "max_members",
+    "depth": "max_depth",
+}
+
+# Violations listed in full before the report is truncated
+_REPORT_LINES = 20
+
+
+@dataclass(frozen=True)
+class ExtractLimits:
+    """Limits checked before extraction; None disables a limit."""
+
+    max_total_bytes: Optional[int] = 512 * MiB
+    max_member_bytes: Optional[int] = 64 * MiB
+    max_ratio: Optional[float] = 100.0
+    max_members: Optional[int] = 10_000
+    max_depth: Optional[int] = 16
+
+
+DEFAULT_LIMITS = ExtractLimits()
+NO_LIMITS = ExtractLimits(None, None, None, None, None)
+
+
+class LimitExceeded(ValueError):
+    """A bundle violates the extraction limits; ``violations`` lists every problem."""
+
+    def __init__(self, violations: list[str]) -> None:
+        self.violations = violations
+        lines = violations[:_REPORT_LINES]
+        if len(violations) > _REPORT_LINES:
+            lines.append(f"... and {len(violations) - _REPORT_LINES} more")
+        super().__init__(
+            "Bundle rejected before extraction:\n" + "\n".join(f"  - {line}" for line in lines)
+        )
+
+
+def parse_limits(items: Iterable[str], base: ExtractLimits = DEFAULT_LIMITS) -> ExtractLimits:
+    """
+    Apply ``KEY=VALUE`` overrides (``members=50000``, ``ratio=none``) to ``base``.
+
+    Raises:
+        ValueError: on an unknown key or a malformed value.
+    """
+    changes: dict[str, Optional[float]] = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        field = LIMIT_KEYS.get(key.strip())
+        if not sep or field is None:
+            raise ValueError(
+                f"Invalid --limit {item!r}: expected KEY=VALUE with KEY one of {', '.join(LIMIT_KEYS)}"
+            )
+        value = value.strip().lower()
+        if value in ("none", "off"):
+            changes[field] = None
+            continue
+        try:
+            changes[field] = float(value) if field == "max_ratio" else int(value)
+        except ValueError:
+            raise ValueError(f"Invalid --limit {item!r}: {value!r} is not a number") from None
+    return dataclasses.replace(base, **changes)
+
+
+def unsafe_path_reason(name: str) -> Optional[str]:
+    """Why ``name`` cannot be extracted safely, or None."""
+    if "\\" in name or "\0" in name:
+        return "contains a backslash or NUL"
+    path = PurePosixPath(name)
+    if path.is_absolute() or (path.parts and path.parts[0].endswith(":")):
+        return "is absolute"
+    if ".." in path.parts:
+        return "escapes the destination"
+    return None
+
+
+def check_members(members: Iterable[zipfile.ZipInfo], limits: ExtractLimits = DEFAULT_LIMITS) -> None:
+    """
+    Check members against ``limits`` and path safety.
+
+    Raises:
+        LimitExceeded: listing every violation, if there is any.
+    """
+    violations: list[str] = []
+    count = 0
+    total = 0
+    for member in members:
+        name = member.filename
+        reason = unsafe_path_reason(name)
+        if reason is not None:
+            violations.append(f"{name!r} {reason}")
+        if member.is_dir():
+            continue
+        count += 1
+        total += member.file_size
+        depth = len(PurePosixPath(name).parts)
+        if limits.max_depth is not None and depth > limits.max_depth:
+            violations.append(f"{name}: path depth {depth} exceeds {limits.max_depth}")
+        if limits.max_member_bytes is not None and member.file_size > limits.max_member_bytes:
+            violations.append(
+                f"{name}: {member.file_size:,} bytes exceeds the member limit of "
+                f"{limits.max_member_bytes:,}"
+            )
+        if limits.max_ratio is not None and member.file_size >= RATIO_MIN_BYTES:
+            ratio = member.file_size / max(member.compress_size, 1)
+            if ratio > limits.max_ratio:
+                violations.append(
+                    f"{name}: compression ratio {ratio:,.0f}:1 exceeds {limits.max_ratio:g}:1"
+                )
+    if limits.max_members is not None and count > limits.max_members:
+        violations.append(f"{count:,} members exceed the limit of {limits.max_members:,}")
+    if limits.max_total_bytes is not None and total > limits.max_total_bytes:
+        violations.append(
+            f"{total:,} uncompressed bytes exceed the limit of {limits.max_total_bytes:,}"
+        )
+    if violations:
+        raise LimitExceeded(violations)
@@ -0,0 +1,142 @@
+"""
+Cross-process advisory locking for installs into one destination.
+
+``run_exclusive`` serialises installs through an advisory lock on
+``<dest>/.aamad/install.lock``. A request that had to wait and finds that an
+identical request (same key) completed successfully while it was waiting
+joins it: it returns that install's paths instead of redoing the work (which,
+without ``--overwrite``, would otherwise fail on the files just written).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import IO, Any, Callable
+
+from .cache import atomic_write_bytes
+
+LOCK_PATH = Path(".aamad") / "install.lock"
+STATE_PATH = Path(".aamad") / "install-state.json"
+
+_POLL_INTERVAL = 0.05
+
+try:
+    import fcntl
+
+    def _try_lock(fh: IO[str]) -> bool:
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(fh: IO[str]) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+except ImportError:  # pragma: no cover - Windows
+    import msvcrt
+
+    def _try_lock(fh: IO[str]) -> bool:
+        try:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fh: IO[str]) -> None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class LockTimeout(TimeoutError):
+    """Raised when the destination lock is not acquired within the timeout."""
+
+
+def request_key(**options: Any) -> str:
+    """Stable key for an install request; identical options give identical keys."""
+    payload = json.dumps(options, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_state(dest: Path) -> dict[str, Any]:
+    try:
+        return json.loads((dest / STATE_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(dest: Path, state: dict[str, Any]) -> None:
+    atomic_write_bytes(dest / STATE_PATH, json.dumps(state, indent=1).encode("utf-8"))
+
+
+def run_exclusive(
+    destination: Path | str,
+    key: str,
+    fn: Callable[[], list[Path]],
+    *,
+    timeout: float | None = None,
+    on_wait: Callable[[], None] | None = None,
+) -> tuple[list[Path], bool]:
+    """
+    Run ``fn`` while holding the destination's install lock.
+
+    Args:
+        destination: Install root.
+        key: Identity of the request; identical requests share a key.
+        fn: The install; returns the paths it wrote.
+        timeout: Seconds to wait for the lock (default: wait indefinitely).
+        on_wait: Called once if the lock is busy, before waiting.
+
+    Returns:
+        ``(paths, joined)`` — ``joined`` is True when an identical request
+        finished while this one waited and its paths were reused.
+
+    Raises:
+        LockTimeout: if the lock is not acquired within ``timeout``.
+    """
+    dest = Path(destination).expanduser().resolve()
+    lock_path = dest / LOCK_PATH
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+", encoding="utf-8") as fh:
+        waited_since: float | None = None
+        if not _try_lock(fh):
+            waited_since = time.time()
+            if on_wait is not None:
+                on_wait()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not _try_lock(fh):
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise LockTimeout(f"Timed out waiting for {lock_path}")
+                time.sleep(_POLL_INTERVAL)
+        try:
+            if waited_since is not None:
+                last = _read_state(dest)
+                if (
+                    last.get("key") == key
+                    and last.get("ok")
+                    and last.get("finished", 0) >= waited_since
+                ):
+                    return [Path(p) for p in last.get("paths", [])], True
+            _write_state(dest, {"key": key, "pid": os.getpid(), "started": time.time()})
+            try:
+                paths = fn()
+            except BaseException:
+                _write_state(dest, {"key": key, "ok": False, "finished": time.time()})
+                raise
+            _write_state(
+                dest,
+                {
+                    "key": key,
+                    "ok": True,
+                    "finished": time.time(),
+                    "paths": [str(p) for p in paths],
+                },
+            )
+            return paths, False
+        finally:
+            _unlock(fh)
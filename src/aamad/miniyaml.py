@@ -0,0 +1,261 @@
+"""
+Minimal YAML support for environments without PyYAML.
+
+The single-file ``aamad.pyz`` ships without third-party dependencies, so the
+converters fall back to this parser/emitter for frontmatter. It covers the
+subset AAMAD artifacts use: block mappings and sequences, flow sequences,
+quoted and plain scalars, and comments. ``load_yaml``/``dump_yaml`` use PyYAML
+whenever it is installed.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import re
+from functools import lru_cache
+from typing import Any
+
+# "key:" or "key: value" (like PyYAML, any plain text before ": " is a key)
+_KEY_RE = re.compile(r"^(\"[^\"]*\"|'[^']*'|[^\s\"'\[\]{},#][^#]*?):(?:\s+|$)")
+_INT_RE = re.compile(r"^[-+]?\d+$")
+_FLOAT_RE = re.compile(r"^[-+]?(\d+\.\d*|\.\d+)([eE][-+]?\d+)?$")
+_PLAIN_SAFE_RE = re.compile(r"^[^\s\-?:,\[\]{}#&*!|>'\"%@`][^\n]*$")
+
+
+@lru_cache(maxsize=512)
+def _load_cached(text: str) -> Any:
+    try:
+        import yaml
+    except ImportError:
+        return safe_load(text)
+    return yaml.safe_load(text)
+
+
+def load_yaml(text: str) -> Any:
+    """
+    Parse YAML with PyYAML when available, else with ``safe_load``.
+
+    Parsed documents are cached by text (callers get a copy), so the same
+    frontmatter is only parsed once per process.
+    """
+    return copy.deepcopy(_load_cached(text))
+
+
+def dump_yaml(data: Any) -> str:
+    """Emit block-style YAML with PyYAML when available, else with ``safe_dump``."""
+    try:
+        import yaml
+    except ImportError:
+        return safe_dump(data)
+    return yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+
+# --- loading -----------------------------------------------------------------
+
+
+def _strip_comment(line: str) -> str:
+    """Remove a trailing ``# comment`` that is not inside quotes."""
+    quote = ""
+    for i, char in enumerate(line):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "\"'" and (i == 0 or line[i - 1] in " \t[{,:-"):
+            quote = char
+        elif char == "#" and (i == 0 or line[i - 1] in " \t"):
+            return line[:i].rstrip()
+    return line.rstrip()
+
+
+def _split_flow(body: str) -> list[str]:
+    parts: list[str] = []
+    current: list[str] = []
+    quote = ""
+    depth = 0
+    for char in body:
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = ""
+            continue
+        if char in "\"'":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _scalar(value: str) -> Any:
+    value = value.strip()
+    if not value or value in ("~", "null", "Null", "NULL"):
+        return None
+    if value.startswith('"') and value.endswith('"') and len(value) >= 2:
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value[1:-1]
+    if value.startswith("'") and value.endswith("'") and len(value) >= 2:
+        return value[1:-1].replace("''", "'")
+    if value.startswith("[") and value.endswith("]"):
+        return [_scalar(p) for p in _split_flow(value[1:-1])]
+    if value.startswith("{") and value.endswith("}"):
+        result = {}
+        for part in _split_flow(value[1:-1]):
+            key, _, val = part.partition(":")
+            result[_scalar(key)] = _scalar(val)
+        return result
+    if value in ("true", "True", "TRUE"):
+        return True
+    if value in ("false", "False", "FALSE"):
+        return False
+    if _INT_RE.match(value):
+        return int(value)
+    if _FLOAT_RE.match(value):
+        return float(value)
+    return value
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.lines: list[tuple[int, str]] = []
+        for raw in text.splitlines():
+            line = _strip_comment(raw.expandtabs(2))
+            if line.strip() and line.strip() not in ("---", "..."):
+                self.lines.append((len(line) - len(line.lstrip()), line.strip()))
+        self.pos = 0
+
+    def parse(self) -> Any:
+        if not self.lines:
+            return None
+        if len(self.lines) == 1 and not _KEY_RE.match(self.lines[0][1]) and not self._is_item(0):
+            return _scalar(self.lines[0][1])
+        return self._block(self.lines[0][0])
+
+    def _is_item(self, pos: int) -> bool:
+        content = self.lines[pos][1]
+        return content == "-" or content.startswith("- ")
+
+    def _block(self, indent: int) -> Any:
+        if self._is_item(self.pos):
+            return self._sequence(indent)
+        return self._mapping(indent)
+
+    def _nested(self, indent: int, allow_same_indent_seq: bool = False) -> Any:
+        """Parse the block nested under the current line, if any."""
+        if self.pos >= len(self.lines):
+            return None
+        next_indent = self.lines[self.pos][0]
+        if next_indent > indent or (
+            allow_same_indent_seq and next_indent == indent and self._is_item(self.pos)
+        ):
+            return self._block(next_indent)
+        return None
+
+    def _mapping(self, indent: int) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        while self.pos < len(self.lines):
+            line_indent, content = self.lines[self.pos]
+            if line_indent != indent or self._is_item(self.pos):
+                break
+            match = _KEY_RE.match(content)
+            if not match:
+                break
+            key = _scalar(match.group(1))
+            rest = content[match.end() :]
+            self.pos += 1
+            if rest.strip():
+                result[key] = _scalar(rest)
+            else:
+                result[key] = self._nested(indent, allow_same_indent_seq=True)
+        return result
+
+    def _sequence(self, indent: int) -> list[Any]:
+        result: list[Any] = []
+        while self.pos < len(self.lines):
+            line_indent, content = self.lines[self.pos]
+            if line_indent != indent or not self._is_item(self.pos):
+                break
+            item = content[1:].strip()
+            if not item:
+                self.pos += 1
+                result.append(self._nested(indent))
+            elif _KEY_RE.match(item):
+                # "- key: value" starts a mapping aligned with the item text
+                item_indent = indent + (len(content) - len(item))
+                self.lines[self.pos] = (item_indent, item)
+                result.append(self._mapping(item_indent))
+            else:
+                self.pos += 1
+                result.append(_scalar(item))
+        return result
+
+
+def safe_load(text: str) -> Any:
+    """Parse the YAML subset used by AAMAD frontmatter."""
+    return _Parser(text).parse()
+
+
+# --- dumping -----------------------------------------------------------------
+
+
+def _dump_scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value)
+    if (
+        _PLAIN_SAFE_RE.match(text)
+        and ": " not in text
+        and " #" not in text
+        and not text.endswith(":")
+        and not isinstance(_scalar(text), (bool, int, float, type(None)))
+    ):
+        return text
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _dump(value: Any, indent: int) -> list[str]:
+    pad = " " * indent
+    lines: list[str] = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)) and item:
+                lines.append(f"{pad}{_dump_scalar(key)}:")
+                lines.extend(_dump(item, indent + 2 if isinstance(item, dict) else indent))
+            else:
+                empty = "{}" if isinstance(item, dict) else "[]" if isinstance(item, list) else None
+                lines.append(f"{pad}{_dump_scalar(key)}: {empty or _dump_scalar(item)}")
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict) and item:
+                nested = _dump(item, indent + 2)
+                lines.append(f"{pad}- {nested[0].lstrip()}")
+                lines.extend(nested[1:])
+            elif isinstance(item, list) and item:
+                lines.append(f"{pad}-")
+                lines.extend(_dump(item, indent + 2))
+            else:
+                lines.append(f"{pad}- {_dump_scalar(item)}")
+    else:
+        lines.append(pad + _dump_scalar(value))
+    return lines
+
+
+def safe_dump(data: Any) -> str:
+    """Emit block-style YAML for mappings, sequences and scalars."""
+    return "\n".join(_dump(data, 0)) + "\n"
@@ -0,0 +1,136 @@
+"""
+Structured install reports.
+
+``install_artifacts`` (see aamad.installer) returns an ``InstallReport`` built
+from the install's progress events (see aamad.events). It covers per-file
+actions, bytes read from the bundle and written, files decompressed,
+conversion-cache hits and per-phase durations, so fleet tooling can aggregate
+install cost without scraping CLI output. ``extract_artifacts`` keeps
+returning the flat list of paths (``InstallReport.paths``).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .events import Event, EventSink
+
+# File actions that put bytes on disk
+WRITE_ACTIONS = ("written", "overwritten", "converted")
+
+
+@dataclass
+class FileAction:
+    """What happened to one file."""
+
+    path: str
+    action: str
+    phase: str
+    bytes: int = 0
+    compressed_bytes: int = 0
+    duration_ms: float = 0.0
+
+
+@dataclass
+class PhaseTiming:
+    """Files, bytes and wall time of one install phase."""
+
+    name: str
+    files: int
+    bytes: int
+    duration_ms: float
+
+
+@dataclass
+class InstallReport:
+    """Outcome of ``install_artifacts``."""
+
+    paths: list[Path] = field(default_factory=list)
+    files: list[FileAction] = field(default_factory=list)
+    phases: list[PhaseTiming] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    joined: bool = False  # an identical concurrent install did the work (see aamad.locking)
+    duration_ms: float = 0.0
+
+    @property
+    def actions(self) -> dict[str, int]:
+        """Number of files per action."""
+        return dict(Counter(f.action for f in self.files))
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(f.bytes for f in self.files if f.action in WRITE_ACTIONS)
+
+    @property
+    def bytes_read(self) -> int:
+        """Compressed bytes read from the bundle."""
+        return sum(f.compressed_bytes for f in self.files)
+
+    @property
+    def files_decompressed(self) -> int:
+        return sum(1 for f in self.files if f.compressed_bytes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "files": len(self.paths),
+            "actions": self.actions,
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read,
+            "files_decompressed": self.files_decompressed,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "joined": self.joined,
+            "duration_ms": self.duration_ms,
+            "phases": [asdict(p) for p in self.phases],
+            "details": [asdict(f) for f in self.files],
+        }
+
+
+class ReportBuilder:
+    """Event sink that accumulates an InstallReport and forwards every event."""
+
+    def __init__(self, forward: Optional[EventSink] = None) -> None:
+        self.report = InstallReport()
+        self._forward = forward
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def __call__(self, event: Event) -> None:
+        kind = event.get("event")
+        with self._lock:
+            if kind == "file":
+                self.report.files.append(
+                    FileAction(
+                        path=event["path"],
+                        action=event["action"],
+                        phase=event.get("phase", ""),
+                        bytes=event.get("bytes") or 0,
+                        compressed_bytes=event.get("compressed_bytes") or 0,
+                        duration_ms=event.get("duration_ms") or 0.0,
+                    )
+                )
+            elif kind == "phase_end":
+                self.report.phases.append(
+                    PhaseTiming(event["phase"], event["files"], event["bytes"], event["duration_ms"])
+                )
+            elif kind == "cache":
+                if event.get("action") == "hit":
+                    self.report.cache_hits += 1
+                else:
+                    self.report.cache_misses += 1
+            elif kind == "lock" and event.get("action") == "joined":
+                self.report.joined = True
+        if self._forward is not None:
+            self._forward(event)
+
+    def finish(self, paths: list[Path]) -> InstallReport:
+        """Complete the report with the installed ``paths`` and total duration."""
+        self.report.paths = list(paths)
+        self.report.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        return self.report
@@ -0,0 +1,101 @@
+"""
+Single-pass rewriting of Cursor path references for converted outputs.
+
+Rules, agents and prompts refer to each other by their Cursor locations
+(``.cursor/rules/x.mdc``, ``.cursor/agents/y.md``, ...). Each target IDE
+defines a table mapping those locations to its own layout; ``PathRewriter``
+compiles one regex for every ``.cursor/<dir>/...`` reference and resolves each
+match with dictionary lookups, so the cost stays linear in the text size no
+matter how many mappings a table defines.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+# One reference: ".cursor/<dir>" optionally followed by "/<rest>"
+_REFERENCE_RE = re.compile(r"\.cursor/([\w-]+)(/[^\s)\]\"'`,;|]*)?")
+
+# Sentence punctuation that may trail a reference without being part of it
+_TRAILING = ".:"
+
+
+@dataclass(frozen=True)
+class DirMapping:
+    """Map ``.cursor/<dir>/<name><source_suffix>`` to ``<target>/<name><target_suffix>``."""
+
+    target: str
+    source_suffix: str = ""
+    target_suffix: str = ""
+
+
+@dataclass
+class PathRewriter:
+    """
+    Table-driven rewriter for ``.cursor/`` references.
+
+    Args:
+        dirs: Cursor sub-directory (``rules``, ``agents``, ...) -> DirMapping.
+        files: Exact overrides keyed by ``<dir>/<name>``; a value of None keeps
+            the reference unchanged (e.g. files a target does not emit).
+    """
+
+    dirs: dict[str, DirMapping] = field(default_factory=dict)
+    files: dict[str, Optional[str]] = field(default_factory=dict)
+
+    def _replace(self, match: re.Match[str]) -> str:
+        original = match.group(0)
+        directory = match.group(1)
+        rest = match.group(2) or ""
+        trailing = ""
+        while rest and rest[-1] in _TRAILING:
+            trailing = rest[-1] + trailing
+            rest = rest[:-1]
+
+        key = f"{directory}{rest}"
+        if key in self.files:
+            target = self.files[key]
+            return original if target is None else target + trailing
+
+        mapping = self.dirs.get(directory)
+        if mapping is None:
+            return original
+        if mapping.source_suffix and rest.endswith(mapping.source_suffix):
+            rest = rest[: -len(mapping.source_suffix)] + mapping.target_suffix
+        return mapping.target + rest + trailing
+
+    def rewrite(self, text: str) -> str:
+        """Rewrite every mapped ``.cursor/`` reference in ``text`` in one pass."""
+        if ".cursor/" not in text:
+            return text
+        return _REFERENCE_RE.sub(self._replace, text)
+
+
+# Claude Code layout (.cursor/templates/ ships unchanged in the Claude bundle)
+CLAUDE_CODE_REWRITER = PathRewriter(
+    dirs={
+        "rules": DirMapping(".claude/rules", ".mdc", ".md"),
+        "agents": DirMapping(".claude/agents"),
+        "prompts": DirMapping(".claude/commands"),
+    },
+    files={
+        "prompts/prompt-phase-1": ".claude/commands/phase-1-define.md",
+        # Not converted for Claude Code; only shipped in the Cursor bundle
+        "agents/dev-crew.md": None,
+    },
+)
+
+# VS Code / Copilot layout (.cursor/ is extracted alongside .github/)
+VSCODE_REWRITER = PathRewriter(
+    dirs={
+        "rules": DirMapping(".github/instructions", ".mdc", ".instructions.md"),
+        "agents": DirMapping(".github/agents", ".md", ".agent.md"),
+        "prompts": DirMapping(".github/prompts"),
+    },
+    files={
+        "prompts/prompt-phase-1": ".github/prompts/phase-1-define.prompt.md",
+        "agents/dev-crew.md": None,
+    },
+)
@@ -0,0 +1,256 @@
+"""
+Local runner for the agent workflow (``aamad run``).
+
+Steps of the workflow graph (see ``aamad.workflow``) are scheduled as soon as
+their dependencies finish, so independent agents such as ``frontend-eng`` and
+``backend-eng`` run concurrently. Each step is executed by a pluggable
+``StepRunner``. ``CommandRunner`` runs a shell command template for any CLI
+agent; tests pass a local stub.
+
+Steps are memoised with the recorded workflow state: a step whose status is
+``ok`` and none of whose dependencies ran is skipped. Successful steps are
+recorded so the next run skips them. The report includes the critical path:
+the chain of dependent steps with the longest total duration, which bounds
+the wall time of any schedule.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shlex
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from .events import EventSink
+from .workflow import STATE_OK, Step, Workflow, load_workflow, record_steps, workflow_status
+
+# A step runner executes one agent step in the project root and returns its exit code
+StepRunner = Callable[[Step, Path], int]
+
+COMMAND_ENV = "AAMAD_AGENT_COMMAND"
+
+# Placeholders substituted in CommandRunner templates; other braces are left to the shell
+_PLACEHOLDER = re.compile(r"\{(agent|inputs|outputs)\}")
+
+# Step outcomes
+ACTION_RAN = "ran"
+ACTION_SKIPPED = "skipped"
+ACTION_FAILED = "failed"
+ACTION_BLOCKED = "blocked"  # a dependency failed
+
+
+@dataclass
+class CommandRunner:
+    """
+    Run each step as a shell command.
+
+    ``command`` is a template: ``{agent}`` is the agent id, ``{inputs}`` and
+    ``{outputs}`` the step's paths, all shell-quoted and space-separated. Only
+    these three placeholders are substituted, so ``${HOME}`` or
+    ``awk '{print $1}'`` pass through unchanged. The same values are exported
+    as ``AAMAD_AGENT``, ``AAMAD_INPUTS`` and ``AAMAD_OUTPUTS``
+    (newline-separated).
+    """
+
+    command: str
+
+    def __call__(self, step: Step, root: Path) -> int:
+        values = {
+            "agent": shlex.quote(step.id),
+            "inputs": " ".join(shlex.quote(p) for p in step.inputs),
+            "outputs": " ".join(shlex.quote(p) for p in step.outputs),
+        }
+        line = _PLACEHOLDER.sub(lambda m: values[m.group(1)], self.command)
+        env = {
+            **os.environ,
+            "AAMAD_AGENT": step.id,
+            "AAMAD_INPUTS": "\n".join(step.inputs),
+            "AAMAD_OUTPUTS": "\n".join(step.outputs),
+        }
+        return subprocess.run(line, shell=True, cwd=root, env=env).returncode
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step."""
+
+    id: str
+    action: str
+    duration: float = 0.0
+    returncode: Optional[int] = None
+
+
+@dataclass
+class RunReport:
+    """Outcome of ``run_workflow``."""
+
+    results: dict[str, StepResult] = field(default_factory=dict)
+    wall_time: float = 0.0
+    critical_path: list[str] = field(default_factory=list)
+    critical_time: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.action in (ACTION_RAN, ACTION_SKIPPED) for r in self.results.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "wall_time": round(self.wall_time, 3),
+            "critical_path": self.critical_path,
+            "critical_time": round(self.critical_time, 3),
+            "steps": [
+                {
+                    "id": r.id,
+                    "action": r.action,
+                    "duration": round(r.duration, 3),
+                    "returncode": r.returncode,
+                }
+                for r in self.results.values()
+            ],
+        }
+
+    def summary(self) -> str:
+        lines = [f"{r.action:<8} {r.id:<18} {r.duration:6.2f}s" for r in self.results.values()]
+        path = " → ".join(self.critical_path) or "(none)"
+        lines.append(f"Wall time {self.wall_time:.2f}s; critical path {self.critical_time:.2f}s: {path}")
+        return "\n".join(lines)
+
+
+def _select(workflow: Workflow, targets: Iterable[str] | None) -> list[str]:
+    """Targets plus everything upstream of them, in topological order."""
+    if targets is None:
+        return list(workflow.order)
+    wanted: set[str] = set()
+    pending = list(targets)
+    while pending:
+        sid = pending.pop()
+        if sid not in wanted:
+            wanted.add(sid)
+            pending.extend(workflow.steps[sid].after)
+    return [sid for sid in workflow.order if sid in wanted]
+
+
+def critical_path(workflow: Workflow, durations: dict[str, float]) -> tuple[list[str], float]:
+    """Longest chain of dependent steps by total duration."""
+    finish: dict[str, float] = {}
+    via: dict[str, str | None] = {}
+    for sid in workflow.order:
+        if sid not in durations:
+            continue
+        deps = [d for d in workflow.steps[sid].after if d in finish]
+        best = max(deps, key=lambda d: finish[d], default=None)
+        finish[sid] = durations[sid] + (finish[best] if best is not None else 0.0)
+        via[sid] = best
+    if not finish:
+        return [], 0.0
+    node: str | None = max(finish, key=lambda s: finish[s])
+    total = finish[node]
+    path: list[str] = []
+    while node is not None:
+        path.append(node)
+        node = via[node]
+    return path[::-1], total
+
+
+def run_workflow(
+    root: Path | str,
+    runner: StepRunner,
+    *,
+    targets: Iterable[str] | None = None,
+    jobs: int | None = None,
+    force: bool = False,
+    workflow: Workflow | None = None,
+    on_event: EventSink | None = None,
+) -> RunReport:
+    """
+    Run the workflow steps that are out of date, in dependency order.
+
+    Args:
+        root: Project root.
+        runner: Executes one step; a non-zero exit code or an exception fails
+            it and blocks its dependents.
+        targets: Steps to bring up to date (with their upstream steps);
+            default all.
+        jobs: Maximum steps running at once (default: all ready steps).
+        force: Run every selected step even if it is up to date.
+        workflow: Graph to run (default: ``load_workflow(root)``).
+        on_event: Receives ``{"event": "step", "step": ..., "action": ...}``
+            when a step starts and when it ends, and an ``error`` event when
+            the runner raises.
+
+    Returns:
+        RunReport with per-step results, wall time and the critical path.
+
+    Raises:
+        KeyError: if a target is not a workflow step.
+    """
+    root = Path(root).expanduser().resolve()
+    workflow = workflow or load_workflow(root)
+    selected = _select(workflow, targets)
+    status = {s.id: s.state for s in workflow_status(root, workflow)}
+    report = RunReport()
+    emit = on_event or (lambda event: None)
+
+    def execute(step: Step) -> tuple[int, float]:
+        start = time.perf_counter()
+        code = runner(step, root)
+        return code, time.perf_counter() - start
+
+    started = time.perf_counter()
+    remaining = list(selected)
+    running: dict[Future[tuple[int, float]], str] = {}
+    ran: set[str] = set()
+    with ThreadPoolExecutor(max_workers=jobs or max(len(selected), 1)) as pool:
+        while remaining or running:
+            for sid in list(remaining):
+                step = workflow.steps[sid]
+                deps = [d for d in step.after if d in selected]
+                if any(d not in report.results for d in deps):
+                    continue
+                remaining.remove(sid)
+                if any(report.results[d].action in (ACTION_FAILED, ACTION_BLOCKED) for d in deps):
+                    report.results[sid] = StepResult(sid, ACTION_BLOCKED)
+                    emit({"event": "step", "step": sid, "action": ACTION_BLOCKED})
+                elif not force and status.get(sid) == STATE_OK and not ran.intersection(deps):
+                    report.results[sid] = StepResult(sid, ACTION_SKIPPED)
+                    emit({"event": "step", "step": sid, "action": ACTION_SKIPPED})
+                else:
+                    emit({"event": "step", "step": sid, "action": "start"})
+                    running[pool.submit(execute, step)] = sid
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                sid = running.pop(future)
+                try:
+                    code, duration = future.result()
+                except Exception as exc:
+                    # A broken runner fails its step; the other steps keep going
+                    code, duration = None, 0.0
+                    emit({"event": "error", "step": sid, "error": type(exc).__name__, "message": str(exc)})
+                action = ACTION_RAN if code == 0 else ACTION_FAILED
+                report.results[sid] = StepResult(sid, action, duration, code)
+                if code == 0:
+                    ran.add(sid)
+                    record_steps(root, [sid], workflow)
+                emit(
+                    {
+                        "event": "step",
+                        "step": sid,
+                        "action": action,
+                        "duration_ms": round(duration * 1000, 3),
+                        "returncode": code,
+                    }
+                )
+    report.wall_time = time.perf_counter() - started
+    # Keep topological order in the report regardless of completion order
+    report.results = {sid: report.results[sid] for sid in selected}
+    durations = {sid: r.duration for sid, r in report.results.items() if r.action != ACTION_SKIPPED}
+    report.critical_path, report.critical_time = critical_path(workflow, durations)
+    return report
@@ -0,0 +1,164 @@
+"""
+Runtime selection for installed artifacts.
+
+Every bundle ships one adapter rule per runtime (``adapter-crewai``,
+``adapter-claude-agent-sdk``, ``adapter-cursor-sdk``) and all of them are
+loaded into every request, although a project targets a single runtime.
+``apply_runtime`` prunes the other adapters from the IDE layouts one install
+wrote and rewrites the references to them. It also records the selection in
+``adapter-registry`` and in the IDE settings (``AAMAD_TARGET_RUNTIME``).
+Layouts of other IDEs installed into the same destination are left alone.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import atomic_write_bytes
+
+RUNTIME_ENV = "AAMAD_TARGET_RUNTIME"
+RUNTIMES = ("crewai", "claude-agent-sdk", "cursor-sdk")
+DEFAULT_RUNTIME = "crewai"
+
+_CURSOR_LAYOUT = (Path(".cursor") / "rules", "adapter-{}.mdc")
+_CLAUDE_LAYOUT = (Path(".claude") / "rules", "adapter-{}.md")
+_VSCODE_LAYOUT = (Path(".github") / "instructions", "adapter-{}.instructions.md")
+
+# (rules directory, adapter file name pattern) per IDE layout
+ADAPTER_LAYOUTS = (_CURSOR_LAYOUT, _CLAUDE_LAYOUT, _VSCODE_LAYOUT)
+
+# Layouts each IDE install writes (vscode extracts the Cursor bundle, then converts it)
+IDE_LAYOUTS = {
+    "cursor": (_CURSOR_LAYOUT,),
+    "claude-code": (_CLAUDE_LAYOUT,),
+    "claude_code": (_CLAUDE_LAYOUT,),
+    "vscode": (_CURSOR_LAYOUT, _VSCODE_LAYOUT),
+}
+
+REGISTRY_NAME = "adapter-registry"
+
+# Memory files whose rule lists link every adapter, per IDE
+_INDEX_FILES = {
+    "claude-code": (Path(".claude") / "CLAUDE.md",),
+    "claude_code": (Path(".claude") / "CLAUDE.md",),
+    "vscode": (Path(".github") / "copilot-instructions.md",),
+}
+
+_SELECTED_HEADING = "## Selected Runtime"
+
+# VS Code applies these to agent terminals, so commands see the runtime
+VSCODE_ENV_KEYS = (
+    "terminal.integrated.env.linux",
+    "terminal.integrated.env.osx",
+    "terminal.integrated.env.windows",
+)
+
+
+@dataclass
+class RuntimeResult:
+    """Files changed by ``apply_runtime`` (``removed`` are destination-relative)."""
+
+    written: list[Path] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def _selected_section(runtime: str, adapter_path: str) -> str:
+    return (
+        f"\n{_SELECTED_HEADING}\n"
+        f"- This project targets `{runtime}` (`{RUNTIME_ENV}={runtime}`); only "
+        f"`{adapter_path}` is installed.\n"
+    )
+
+
+def _set_registry(path: Path, runtime: str, adapter_path: str) -> None:
+    text = path.read_text(encoding="utf-8")
+    if _SELECTED_HEADING in text:
+        text = text[: text.index(_SELECTED_HEADING)]
+    text = text.rstrip("\n") + "\n" + _selected_section(runtime, adapter_path)
+    path.write_text(text, encoding="utf-8")
+
+
+def _drop_references(path: Path, names: list[str]) -> bool:
+    """Remove list items linking to ``names``; True if the file changed."""
+    pattern = re.compile(
+        r"^[ \t]*[-*][^\n]*\b(?:" + "|".join(re.escape(n) for n in names) + r")\b[^\n]*\n",
+        re.MULTILINE,
+    )
+    text = path.read_text(encoding="utf-8")
+    updated = pattern.sub("", text)
+    if updated == text:
+        return False
+    path.write_text(updated, encoding="utf-8")
+    return True
+
+
+def _set_settings_env(dest: Path, runtime: str, ide: str) -> list[Path]:
+    written: list[Path] = []
+    claude = dest / ".claude" / "settings.json"
+    if ide in ("claude-code", "claude_code") and claude.is_file():
+        data = json.loads(claude.read_text(encoding="utf-8"))
+        data.setdefault("env", {})[RUNTIME_ENV] = runtime
+        written.append(atomic_write_bytes(claude, json.dumps(data, indent=2).encode("utf-8")))
+    vscode = dest / ".vscode" / "settings.json"
+    if ide == "vscode" and vscode.is_file():
+        data = json.loads(vscode.read_text(encoding="utf-8"))
+        for key in VSCODE_ENV_KEYS:
+            data.setdefault(key, {})[RUNTIME_ENV] = runtime
+        written.append(atomic_write_bytes(vscode, json.dumps(data, indent=2).encode("utf-8")))
+    return written
+
+
+def pruned_names(runtime: str, ide: str | None = None) -> set[str]:
+    """File names of the adapter rules ``runtime`` does not use, in ``ide``'s layouts (default all)."""
+    layouts = ADAPTER_LAYOUTS if ide is None else IDE_LAYOUTS.get(ide, ())
+    return {
+        pattern.format(name)
+        for _, pattern in layouts
+        for name in RUNTIMES
+        if name != runtime
+    }
+
+
+def apply_runtime(destination: Path | str, runtime: str, ide: str = "cursor") -> RuntimeResult:
+    """
+    Keep only ``runtime``'s adapter rule in the layouts an ``ide`` install writes.
+
+    Args:
+        destination: Install root.
+        runtime: One of ``RUNTIMES``.
+        ide: IDE that was installed; other IDE layouts under ``destination``
+            are not touched.
+
+    Returns:
+        RuntimeResult with the rewritten files and the removed adapters.
+
+    Raises:
+        ValueError: if ``runtime`` is unknown.
+    """
+    if runtime not in RUNTIMES:
+        raise ValueError(f"Unknown runtime: {runtime} (expected one of {', '.join(RUNTIMES)})")
+    dest = Path(destination).expanduser().resolve()
+    others = [f"adapter-{name}" for name in RUNTIMES if name != runtime]
+    result = RuntimeResult()
+    for rules_dir, pattern in IDE_LAYOUTS.get(ide, ()):
+        directory = dest / rules_dir
+        if not directory.is_dir():
+            continue
+        for name in RUNTIMES:
+            path = directory / pattern.format(name)
+            if name != runtime and path.exists():
+                result.removed.append(path.relative_to(dest).as_posix())
+                path.unlink()
+        registry = directory / pattern.replace("adapter-{}", REGISTRY_NAME)
+        if registry.is_file():
+            _set_registry(registry, runtime, (rules_dir / pattern.format(runtime)).as_posix())
+            result.written.append(registry)
+    for rel in _INDEX_FILES.get(ide, ()):
+        path = dest / rel
+        if path.is_file() and _drop_references(path, others):
+            result.written.append(path)
+    result.written.extend(_set_settings_env(dest, runtime, ide))
+    return result
@@ -0,0 +1,192 @@
+"""
+Selective installs (``aamad init --only/--exclude``).
+
+A selector is a component name (``agents``, ``rules``, ``templates``,
+``prompts``, ``project-context``, ``docs``, ``settings``), an agent id
+(``frontend-eng``) or a glob over bundle paths (``.cursor/rules/adapter-*``).
+Components and agent ids expand to globs that cover every IDE layout, so
+``--exclude frontend-eng`` drops the Cursor, Claude Code and VS Code files of
+that agent alike.
+
+The installer applies a ``Selection`` to the bundle's central directory, so
+unselected members are never decompressed or written. It also applies it to
+the ``.cursor/`` sources fed to the claude-code/vscode converters. A source is
+converted only if both the source and its converted output are selected.
+``AGENTS.md`` and the IDE settings written by the converters are always
+installed. ``drop_unselected_references`` removes the lines of the IDE index
+files (``.claude/CLAUDE.md``) that link to files left out, as
+``aamad.runtime`` does for pruned adapters.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .globs import glob_match
+
+# Component -> globs over bundle and converted paths
+COMPONENTS = {
+    "agents": (".cursor/agents/**", ".claude/agents/**", ".github/agents/**"),
+    "rules": (".cursor/rules/**", ".claude/rules/**", ".github/instructions/**"),
+    "templates": (".cursor/templates/**",),
+    "prompts": (".cursor/prompts/**", ".claude/commands/**", ".github/prompts/**"),
+    "project-context": ("project-context/**",),
+    "docs": ("README.md", "CHECKLIST.md"),
+    "settings": (".claude/settings.json", ".vscode/settings.json"),
+}
+
+# Agent ids selectable by name (dev-crew is the Cursor crew index)
+AGENT_SELECTORS = (
+    "product-mgr",
+    "system-arch",
+    "project-mgr",
+    "frontend-eng",
+    "backend-eng",
+    "integration-eng",
+    "qa-eng",
+    "dev-crew",
+)
+
+# (source prefix, source suffix, output prefix, output suffix) per conversion target
+_CONVERSIONS = {
+    "vscode": (
+        (".cursor/rules/", ".mdc", ".github/instructions/", ".instructions.md"),
+        (".cursor/agents/", ".md", ".github/agents/", ".agent.md"),
+        (".cursor/prompts/prompt-", "", ".github/prompts/", "-define.prompt.md"),
+    ),
+    "claude-code": (
+        (".cursor/rules/", ".mdc", ".claude/rules/", ".md"),
+        (".cursor/agents/", ".md", ".claude/agents/", ".md"),
+        (".cursor/prompts/prompt-", "", ".claude/commands/", "-define.md"),
+    ),
+}
+
+_GLOB_CHARS = re.compile(r"[*?\[{/.]")
+
+# Index files whose lines link installed rules and agents
+INDEX_FILES = (Path(".claude") / "CLAUDE.md", Path(".github") / "copilot-instructions.md")
+
+# A linked path inside an IDE layout
+_LINK = re.compile(r"\.(?:claude|cursor|github)/[\w./-]*\w")
+
+
+def _agent_globs(agent_id: str) -> tuple[str, ...]:
+    return (
+        f".cursor/agents/{agent_id}.md",
+        f".claude/agents/{agent_id}.md",
+        f".github/agents/{agent_id}.agent.md",
+    )
+
+
+def expand_selector(selector: str) -> tuple[str, ...]:
+    """
+    Globs for one selector.
+
+    Raises:
+        ValueError: if ``selector`` is a bare word that is neither a
+            component nor an agent id (globs contain ``*?[{/.``).
+    """
+    selector = selector.strip()
+    if selector in COMPONENTS:
+        return COMPONENTS[selector]
+    if selector in AGENT_SELECTORS:
+        return _agent_globs(selector)
+    if selector and _GLOB_CHARS.search(selector):
+        return (selector,)
+    raise ValueError(
+        f"Unknown selector {selector!r}: expected a component "
+        f"({', '.join(COMPONENTS)}), an agent id ({', '.join(AGENT_SELECTORS)}) or a glob"
+    )
+
+
+def converted_name(source: str, target: str) -> Optional[str]:
+    """Output path the ``target`` converter writes for a ``.cursor/`` source, or None."""
+    for src_prefix, src_suffix, out_prefix, out_suffix in _CONVERSIONS.get(target, ()):
+        if source.startswith(src_prefix) and source.endswith(src_suffix):
+            stem = source[len(src_prefix) : len(source) - len(src_suffix)]
+            if stem and "/" not in stem:
+                return f"{out_prefix}{stem}{out_suffix}"
+    return None
+
+
+def source_name(output: str, target: str) -> Optional[str]:
+    """``.cursor/`` source a ``target`` output was converted from, or None."""
+    for src_prefix, src_suffix, out_prefix, out_suffix in _CONVERSIONS.get(target, ()):
+        if output.startswith(out_prefix) and output.endswith(out_suffix):
+            stem = output[len(out_prefix) : len(output) - len(out_suffix)]
+            if stem and "/" not in stem:
+                return f"{src_prefix}{stem}{src_suffix}"
+    return None
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Globs a path must match (``only``, if any) and must not match (``exclude``)."""
+
+    only: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.only or self.exclude)
+
+    def selects(self, path: str) -> bool:
+        """True if the bundle-relative ``path`` is selected."""
+        if self.only and not any(glob_match(p, path) for p in self.only):
+            return False
+        return not any(glob_match(p, path) for p in self.exclude)
+
+    def converts(self, source: str, target: str) -> bool:
+        """True if the ``target`` converter should read ``source``."""
+        output = converted_name(source, target)
+        return self.selects(source) and (output is None or self.selects(output))
+
+    def converted_agents(self, target: str) -> set[str]:
+        """Agent ids whose ``target`` conversion this selection keeps (handoff targets)."""
+        return {a for a in AGENT_SELECTORS if self.converts(f".cursor/agents/{a}.md", target)}
+
+    def keeps_output(self, output: str, target: str) -> bool:
+        """True if a converted ``output`` is produced under this selection."""
+        source = source_name(output, target)
+        return source is None or self.converts(source, target)
+
+
+def parse_selection(
+    only: Iterable[str] | None = None, exclude: Iterable[str] | None = None
+) -> Selection:
+    """
+    Build a Selection from ``--only``/``--exclude`` selectors.
+
+    Raises:
+        ValueError: on an unknown selector.
+    """
+    return Selection(
+        only=tuple(g for s in only or () for g in expand_selector(s)),
+        exclude=tuple(g for s in exclude or () for g in expand_selector(s)),
+    )
+
+
+def drop_unselected_references(destination: Path, selection: Selection) -> list[Path]:
+    """
+    Remove lines of the index files under ``destination`` that link to unselected paths.
+
+    Returns:
+        The index files that changed.
+    """
+    changed: list[Path] = []
+    for rel in INDEX_FILES:
+        path = destination / rel
+        if not path.is_file():
+            continue
+        text = path.read_text(encoding="utf-8")
+        lines = text.splitlines(keepends=True)
+        kept = [
+            line for line in lines
+            if all(selection.selects(link) for link in _LINK.findall(line))
+        ]
+        if len(kept) != len(lines):
+            path.write_text("".join(kept), encoding="utf-8")
+            changed.append(path)
+    return changed
@@ -0,0 +1,315 @@
+"""
+Local ``aamad serve`` daemon that keeps bundles hot in memory.
+
+The daemon listens on a unix domain socket. On start it imports the
+converters, re-packs every bundle uncompressed into memory and parses all
+bundled frontmatter once. Each request is handled in a forked child, so
+``init``/``bundle-info`` run in parallel against that warm state with their
+own working directory and output streams, and complete in milliseconds.
+
+Protocol: the client sends one JSON line (``{"op": "run", "argv": [...],
+"cwd": ..., "env": {...}}``, ``{"op": "ping"}`` or ``{"op": "shutdown"}``) and
+reads one JSON line back (``{"code": ..., "stdout": ..., "stderr": ...}``).
+Both sides send the protocol version and the aamad version. A daemon started
+by another aamad version refuses to run requests, and the client then runs
+them in-process. The client's ``AAMAD_*`` and ``XDG_CACHE_HOME`` variables
+apply to the forwarded command.
+
+The socket is created with a 0177 umask, so only its owner can connect. It
+lives in ``$XDG_RUNTIME_DIR``, else in a per-user 0700 directory under the
+temp dir. The client only talks to a socket owned by the current user with
+no group/other permissions and, on Linux, served by a process of the same
+user (``SO_PEERCRED``); otherwise it runs the command in-process.
+
+``forward`` is the thin client used by the CLI; it returns None whenever no
+daemon answers, and the CLI then runs the command in-process.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Sequence
+
+# Commands the CLI forwards to a running daemon
+FORWARDED_COMMANDS = ("init", "bundle-info")
+
+SOCKET_ENV = "AAMAD_SOCKET"
+# Set to disable forwarding (also set inside the daemon itself)
+NO_DAEMON_ENV = "AAMAD_NO_DAEMON"
+
+PROTOCOL_VERSION = 2
+_CONNECT_TIMEOUT = 0.5
+
+# Client environment applied to forwarded commands
+_ENV_PREFIX = "AAMAD_"
+_FORWARDED_ENV = ("XDG_CACHE_HOME",)
+
+
+@lru_cache(maxsize=1)
+def _aamad_version() -> str:
+    """Version of this aamad; fixed at daemon start-up (see ``serve``)."""
+    from . import __version__
+
+    return __version__
+
+
+def _client_env() -> dict[str, str]:
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if (key.startswith(_ENV_PREFIX) or key in _FORWARDED_ENV) and key != NO_DAEMON_ENV
+    }
+
+
+def _fallback_dir() -> Path:
+    """Per-user socket directory in the (shared, world-writable) temp dir."""
+    return Path(tempfile.gettempdir()) / f"aamad-{os.getuid()}"
+
+
+def default_socket_path() -> Path:
+    """
+    Socket path from ``$AAMAD_SOCKET``, else a per-user path in the runtime dir.
+
+    Without ``$XDG_RUNTIME_DIR`` the socket goes in ``<tmp>/aamad-<uid>/``,
+    which ``serve`` creates with mode 0700.
+    """
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(os.environ["XDG_RUNTIME_DIR"]) / f"aamad-{os.getuid()}.sock"
+    return _fallback_dir() / "aamad.sock"
+
+
+def _is_private(st: os.stat_result) -> bool:
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _trusted_socket(path: Path) -> bool:
+    """True if ``path`` is a socket owned by this user with no group/other access."""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and _is_private(st)
+
+
+def _same_user_peer(sock: socket.socket) -> bool:
+    """True unless the kernel reports the peer as another user (Linux ``SO_PEERCRED``)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def _send(sock: socket.socket, payload: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+
+
+def _recv(sock: socket.socket) -> dict[str, Any]:
+    with sock.makefile("rb") as fh:
+        line = fh.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    return json.loads(line)
+
+
+def request(
+    payload: dict[str, Any],
+    *,
+    socket_path: Path | str | None = None,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """
+    Send one request to the daemon and return its response.
+
+    Raises:
+        OSError: if no daemon is listening on the socket.
+        PermissionError: if the daemon runs as another user.
+    """
+    path = str(socket_path or default_socket_path())
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_CONNECT_TIMEOUT)
+        sock.connect(path)
+        if not _same_user_peer(sock):
+            raise PermissionError(f"{path} is served by another user")
+        sock.settimeout(timeout)
+        _send(sock, {"version": PROTOCOL_VERSION, "aamad": _aamad_version(), **payload})
+        return _recv(sock)
+
+
+def forward(argv: Sequence[str], *, socket_path: Path | str | None = None) -> int | None:
+    """
+    Run a CLI command in the daemon, replaying its output locally.
+
+    Returns:
+        The command's exit status, or None when no daemon is available (or
+        forwarding is disabled), in which case the caller runs it in-process.
+    """
+    if os.environ.get(NO_DAEMON_ENV):
+        return None
+    path = Path(socket_path or default_socket_path())
+    if not _trusted_socket(path):
+        # Missing, or possibly planted by another user: never send it argv/env
+        return None
+    try:
+        response = request(
+            {"op": "run", "argv": list(argv), "cwd": os.getcwd(), "env": _client_env()},
+            socket_path=path,
+        )
+    except (OSError, ValueError):
+        return None
+    if (
+        response.get("version") != PROTOCOL_VERSION
+        or response.get("aamad") != _aamad_version()
+        or "code" not in response
+    ):
+        # A daemon from another aamad version (or protocol) would run stale code
+        return None
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response["code"])
+
+
+def warm_up() -> int:
+    """
+    Load everything a request needs into memory; returns the frontmatter count.
+
+    Bundles are preloaded (see ``aamad.installer.preload_bundles``) and every
+    bundled frontmatter block is parsed once so the YAML cache is hot.
+    """
+    from . import claude_code, cli, compact, snapshots, templates, verify  # noqa: F401
+    from .installer import open_bundle, preload_bundles
+    from .vscode_copilot import _parse_frontmatter
+
+    parsed = 0
+    for bundle in preload_bundles().values():
+        with open_bundle(bundle) as zf:
+            for member in zf.infolist():
+                if member.filename.endswith((".md", ".mdc")):
+                    fm, _ = _parse_frontmatter(zf.read(member).decode("utf-8"))
+                    parsed += bool(fm)
+    return parsed
+
+
+def _apply_env(env: dict[str, str]) -> None:
+    """Replace this (forked) process's forwarded variables with the client's."""
+    for key in list(os.environ):
+        if (key.startswith(_ENV_PREFIX) or key in _FORWARDED_ENV) and key != NO_DAEMON_ENV:
+            del os.environ[key]
+    os.environ.update(
+        {k: v for k, v in env.items() if k.startswith(_ENV_PREFIX) or k in _FORWARDED_ENV}
+    )
+    os.environ[NO_DAEMON_ENV] = "1"
+
+
+def _run_command(
+    argv: Sequence[str], cwd: str | None, env: dict[str, str] | None = None
+) -> dict[str, Any]:
+    """Run ``aamad <argv>`` in this (forked) process and capture its output."""
+    from .cli import main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    if env is not None:
+        _apply_env(env)
+    if cwd:
+        os.chdir(cwd)
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            code = main(list(argv))
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+            if not isinstance(exc.code, (int, type(None))):
+                print(exc.code, file=sys.stderr)
+        except Exception as exc:  # report, do not kill the daemon child silently
+            print(f"aamad: {type(exc).__name__}: {exc}", file=sys.stderr)
+            code = 1
+    return {"code": code or 0, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            payload = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            payload = {}
+        op = payload.get("op")
+        if op == "run" and payload.get("aamad") != _aamad_version():
+            response: dict[str, Any] = {
+                "code": 2,
+                "stdout": "",
+                "stderr": f"aamad serve: daemon runs aamad {_aamad_version()}, client {payload.get('aamad')}\n",
+            }
+        elif op == "ping":
+            response = {"code": 0, "pid": os.getppid()}
+        elif op == "shutdown":
+            response = {"code": 0}
+            # Tell the parent to stop serving once this child has replied
+            os.kill(os.getppid(), signal.SIGTERM)
+        elif op == "run" and payload.get("argv") and payload["argv"][0] in FORWARDED_COMMANDS:
+            response = _run_command(payload["argv"], payload.get("cwd"), payload.get("env"))
+        else:
+            response = {"code": 2, "stdout": "", "stderr": f"aamad serve: unsupported request {op!r}\n"}
+        header = {"version": PROTOCOL_VERSION, "aamad": _aamad_version()}
+        self.wfile.write(json.dumps({**header, **response}).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    block_on_close = False
+
+
+def serve(socket_path: Path | str | None = None) -> None:
+    """
+    Run the daemon in the foreground until it receives ``shutdown`` or SIGTERM.
+
+    Raises:
+        FileExistsError: if another daemon is already listening on the socket.
+        PermissionError: if the per-user socket directory under the temp dir
+            belongs to another user or is accessible to others.
+    """
+    path = Path(socket_path or default_socket_path())
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if path.parent == _fallback_dir() and not _is_private(path.parent.lstat()):
+        raise PermissionError(f"{path.parent} must be a directory private to this user (mode 0700)")
+    if path.exists():
+        try:
+            request({"op": "ping"}, socket_path=path, timeout=_CONNECT_TIMEOUT)
+        except (OSError, ValueError):
+            path.unlink()  # stale socket from a daemon that died
+        else:
+            raise FileExistsError(f"An aamad daemon is already listening on {path}")
+
+    os.environ[NO_DAEMON_ENV] = "1"
+    _aamad_version()  # an upgrade while running must not change what the daemon reports
+    warm_up()
+    # Create the socket owner-only from the start rather than chmod after bind
+    umask = os.umask(0o177)
+    try:
+        server = _Server(str(path), _Handler)
+    finally:
+        os.umask(umask)
+
+    def _stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
@@ -0,0 +1,179 @@
+"""
+Pre-overwrite snapshots and rollback for AAMAD installs.
+
+Before an overwriting install replaces files, the files about to be replaced
+are streamed into one compressed archive under ``.aamad/snapshots/``. The
+archive also records which planned files did not exist yet, so ``rollback``
+can restore the previous state in a single pass over the archive.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import shutil
+import tarfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+SNAPSHOT_DIR = Path(".aamad") / "snapshots"
+SNAPSHOT_SUFFIX = ".tar.gz"
+DEFAULT_KEEP = 10
+
+_MANIFEST = "manifest.json"
+_FILES_PREFIX = "files/"
+
+
+@dataclass
+class SnapshotInfo:
+    """A stored snapshot archive."""
+
+    id: str
+    path: Path
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+
+def _snapshot_dir(dest: Path) -> Path:
+    return dest / SNAPSHOT_DIR
+
+
+def _relative(dest: Path, path: Path) -> str | None:
+    try:
+        return path.resolve().relative_to(dest).as_posix()
+    except ValueError:
+        return None
+
+
+def list_snapshots(destination: Path | str) -> list[SnapshotInfo]:
+    """Return the snapshots stored under ``destination``, oldest first."""
+    dest = Path(destination).expanduser().resolve()
+    snap_dir = _snapshot_dir(dest)
+    if not snap_dir.is_dir():
+        return []
+    snapshots = [
+        SnapshotInfo(id=p.name[: -len(SNAPSHOT_SUFFIX)], path=p)
+        for p in snap_dir.glob(f"*{SNAPSHOT_SUFFIX}")
+    ]
+    return sorted(snapshots, key=lambda s: s.id)
+
+
+def prune_snapshots(destination: Path | str, keep: int = DEFAULT_KEEP) -> list[Path]:
+    """Delete all but the newest ``keep`` snapshots. Returns the removed archives."""
+    snapshots = list_snapshots(destination)
+    excess = snapshots[: max(len(snapshots) - max(keep, 0), 0)]
+    for snap in excess:
+        snap.path.unlink()
+    return [s.path for s in excess]
+
+
+def create_snapshot(
+    destination: Path | str,
+    paths: Iterable[Path],
+    *,
+    keep: int = DEFAULT_KEEP,
+) -> SnapshotInfo | None:
+    """
+    Snapshot the files an install is about to overwrite.
+
+    Existing files among ``paths`` are streamed into one gzip-compressed tar
+    archive; planned paths that do not exist yet are recorded so rollback can
+    remove them. The archive is written to a temporary name and renamed into
+    place once complete.
+
+    Args:
+        destination: Install root.
+        paths: Paths the install will write.
+        keep: Retention limit; older snapshots beyond it are pruned.
+
+    Returns:
+        The new SnapshotInfo, or None when no existing file would be replaced.
+    """
+    dest = Path(destination).expanduser().resolve()
+    existing: list[str] = []
+    created: list[str] = []
+    for path in paths:
+        rel = _relative(dest, Path(path))
+        if rel is None or rel in existing or rel in created:
+            continue
+        if Path(path).is_file():
+            existing.append(rel)
+        elif not Path(path).exists():
+            created.append(rel)
+    if not existing:
+        return None
+
+    snap_dir = _snapshot_dir(dest)
+    snap_dir.mkdir(parents=True, exist_ok=True)
+    snapshot_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    final = snap_dir / f"{snapshot_id}{SNAPSHOT_SUFFIX}"
+    tmp = snap_dir / f".{snapshot_id}.tmp"
+
+    manifest = json.dumps({"id": snapshot_id, "replaced": existing, "created": created}).encode("utf-8")
+    with tarfile.open(tmp, "w:gz") as tar:
+        info = tarfile.TarInfo(_MANIFEST)
+        info.size = len(manifest)
+        tar.addfile(info, io.BytesIO(manifest))
+        for rel in existing:
+            tar.add(dest / rel, arcname=_FILES_PREFIX + rel, recursive=False)
+    os.replace(tmp, final)
+
+    prune_snapshots(dest, keep)
+    return SnapshotInfo(id=snapshot_id, path=final)
+
+
+def rollback(destination: Path | str, snapshot_id: str | None = None) -> list[Path]:
+    """
+    Restore a snapshot (the newest one by default).
+
+    Replaced files are written back from the archive and files the install
+    created are removed, in a single sequential pass over the archive.
+
+    Returns:
+        Paths restored or removed.
+
+    Raises:
+        FileNotFoundError: if no (matching) snapshot exists.
+    """
+    dest = Path(destination).expanduser().resolve()
+    snapshots = list_snapshots(dest)
+    if snapshot_id is not None:
+        snapshots = [s for s in snapshots if s.id == snapshot_id]
+    if not snapshots:
+        target = f"Snapshot {snapshot_id}" if snapshot_id else "No snapshot"
+        raise FileNotFoundError(f"{target} found under {_snapshot_dir(dest)}")
+    snapshot = snapshots[-1]
+
+    touched: list[Path] = []
+    with tarfile.open(snapshot.path, "r:gz") as tar:
+        manifest: dict = {}
+        for member in tar:
+            if member.name == _MANIFEST:
+                manifest = json.load(tar.extractfile(member))
+                continue
+            if not member.isfile() or not member.name.startswith(_FILES_PREFIX):
+                continue
+            target = (dest / member.name[len(_FILES_PREFIX) :]).resolve()
+            if _relative(dest, target) is None:
+                raise ValueError(f"Refusing to restore outside {dest}: {member.name}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tar.extractfile(member) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            touched.append(target)
+
+    for rel in manifest.get("created", []):
+        target = (dest / rel).resolve()
+        if _relative(dest, target) is not None and target.is_file():
+            target.unlink()
+            touched.append(target)
+            # Drop directories the install created and left empty
+            parent = target.parent
+            while parent != dest and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+    return touched
@@ -0,0 +1,76 @@
+"""
+Cursor sources read by the claude-code and vscode converters.
+
+Both converters convert every rule (``.cursor/rules/*.mdc``) and agent
+(``.cursor/agents/*.md``, except the ``dev-crew`` crew index) they find, so
+rules and agents added by an overlay are converted like the stock ones. The
+stock names keep their dependency order (``RULE_ORDER``/``AGENT_IDS``) and
+any others follow sorted, identically for every IDE.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Sequence
+
+# Rule order (dependency order); other rules follow sorted
+RULE_ORDER = [
+    "aamad-core",
+    "development-workflow",
+    "epics-index",
+    "adapter-registry",
+    "adapter-crewai",
+    "adapter-claude-agent-sdk",
+    "adapter-cursor-sdk",
+]
+
+# Agent order; other agents follow sorted
+AGENT_IDS = [
+    "product-mgr",
+    "system-arch",
+    "project-mgr",
+    "frontend-eng",
+    "backend-eng",
+    "integration-eng",
+    "qa-eng",
+]
+
+# Agent file that indexes the crew rather than defining a persona
+CREW_INDEX = "dev-crew"
+
+RULES_PREFIX = ".cursor/rules/"
+AGENTS_PREFIX = ".cursor/agents/"
+
+
+def ordered_stems(names: Iterable[str], order: Sequence[str]) -> list[str]:
+    """Stems in ``order`` first, then any others (e.g. added by an overlay) sorted."""
+    names = set(names)
+    return [n for n in order if n in names] + sorted(names - set(order))
+
+
+def stems_in(names: Iterable[str], prefix: str, suffix: str) -> set[str]:
+    """Stems of the ``<prefix><stem><suffix>`` entries of ``names`` (never the crew index)."""
+    stems = {
+        n[len(prefix) : len(n) - len(suffix)]
+        for n in names
+        if n.startswith(prefix) and n.endswith(suffix)
+    }
+    return {s for s in stems if s and "/" not in s and s != CREW_INDEX}
+
+
+def source_stems(directory: Path, suffix: str, order: Sequence[str]) -> list[str]:
+    """Ordered stems of the ``*<suffix>`` files in ``directory``."""
+    if not directory.is_dir():
+        return []
+    names = (p.name for p in directory.iterdir() if p.is_file())
+    return ordered_stems(stems_in(names, "", suffix), order)
+
+
+def rule_stems(names: Iterable[str]) -> list[str]:
+    """Ordered rule stems among bundle-relative ``names``."""
+    return ordered_stems(stems_in(names, RULES_PREFIX, ".mdc"), RULE_ORDER)
+
+
+def agent_stems(names: Iterable[str]) -> list[str]:
+    """Ordered agent ids among bundle-relative ``names``."""
+    return ordered_stems(stems_in(names, AGENTS_PREFIX, ".md"), AGENT_IDS)
@@ -0,0 +1,178 @@
+"""
+Section-addressable templates.
+
+The SAD and PRD templates are loaded whole even when an agent fills a single
+section. ``split_templates`` writes every ``.cursor/templates/<name>.md`` as a
+directory of per-section files named by heading anchor
+(``<name>/<anchor>.md``) plus a small ``<name>/index.md`` listing them. It
+points the installed agents and commands at that index, and section
+references (``<name>.md#<anchor>``) at the section file itself. An agent step
+then loads the index once and only the section it is working on. The whole
+template stays in place for tools that want it.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Mapping
+
+from .context_index import split_sections
+
+if TYPE_CHECKING:
+    from .installer import BundleSource
+    from .selection import Selection
+
+TEMPLATES_DIR = Path(".cursor") / "templates"
+
+# Installed agent/command files whose template references are re-pointed
+REFERENCE_DIRS = (
+    Path(".cursor") / "agents",
+    Path(".claude") / "agents",
+    Path(".claude") / "commands",
+    Path(".github") / "agents",
+    Path(".github") / "prompts",
+)
+
+INDEX_NAME = "index.md"
+
+# Sections are split at headings down to this level (``###`` numbered sections)
+SECTION_LEVEL = 3
+
+PREAMBLE_ANCHOR = "preamble"
+
+
+def split_template(text: str, name: str) -> dict[str, str]:
+    """
+    Split one template into ``{file name: content}``, including ``index.md``.
+
+    Args:
+        text: Template markdown.
+        name: Template stem (``sad-template``), used in the index heading.
+    """
+    return _split(text, name)[0]
+
+
+def _split(text: str, name: str) -> tuple[dict[str, str], dict[str, str]]:
+    """``split_template`` files plus ``{anchor: file name}`` for every section."""
+    files: dict[str, str] = {}
+    anchors: dict[str, str] = {}
+    rows: list[str] = []
+    for section, body in split_sections(text, name, max_level=SECTION_LEVEL):
+        anchor = section.anchor or PREAMBLE_ANCHOR
+        filename = f"{anchor}.md"
+        if filename == INDEX_NAME:
+            filename = f"{anchor}-section.md"
+        files[filename] = body.rstrip() + "\n"
+        anchors.setdefault(anchor, filename)
+        title = section.heading.replace("\\", "").replace("|", "\\|") or "(preamble)"
+        lines = section.end_line - section.start_line + 1
+        rows.append(f"| {title} | [{filename}]({filename}) | {lines} |")
+    files[INDEX_NAME] = "\n".join(
+        [
+            f"# {name} sections",
+            "",
+            f"Load only the section you are filling. Full template: `../{name}.md`.",
+            "",
+            "| Section | File | Lines |",
+            "| --- | --- | --- |",
+            *rows,
+            "",
+        ]
+    )
+    return files, anchors
+
+
+def _reference_re(names: list[str]) -> re.Pattern[str]:
+    alternatives = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+    return re.compile(rf"(\.cursor/templates/)({alternatives})\.md(?:#([\w-]+))?(?![\w#/-])")
+
+
+def planned_sections(
+    destination: Path | str,
+    bundle: BundleSource,
+    *,
+    values: Mapping[str, str] | None = None,
+    selection: Selection | None = None,
+) -> list[Path]:
+    """
+    Section files ``split_templates`` would write after installing ``bundle``.
+
+    Existing files in the section directories are included too, since the
+    split replaces or removes them; the install snapshot covers them all.
+    """
+    from .installer import open_bundle
+    from .templates import render_template
+
+    dest = Path(destination).expanduser().resolve()
+    prefix = TEMPLATES_DIR.as_posix() + "/"
+    sources = {p.stem: p.read_text(encoding="utf-8") for p in (dest / TEMPLATES_DIR).glob("*.md")}
+    with open_bundle(bundle) as zf:
+        for member in zf.infolist():
+            rel = member.filename[len(prefix) :]
+            if not member.filename.startswith(prefix) or "/" in rel or not rel.endswith(".md"):
+                continue
+            if selection and not selection.selects(member.filename):
+                continue
+            text = zf.read(member).decode("utf-8")
+            sources[rel[:-3]] = render_template(text, values) if values else text
+    paths: set[Path] = set()
+    for name, text in sources.items():
+        out_dir = dest / TEMPLATES_DIR / name
+        paths.update(out_dir / f for f in split_template(text, name))
+        paths.update(out_dir.glob("*.md"))
+    return sorted(paths)
+
+
+def split_templates(destination: Path | str, *, dry_run: bool = False) -> list[Path]:
+    """
+    Split the installed templates under ``destination`` into section files.
+
+    Section directories are generated output: they are rewritten on every
+    call and stale section files are removed. References such as
+    ``.cursor/templates/sad-template.md`` in installed agents and commands
+    are re-pointed at ``.cursor/templates/sad-template/index.md``, and
+    ``sad-template.md#<anchor>`` at that section's file (the index if no
+    section has the anchor).
+
+    Args:
+        destination: Install root containing ``.cursor/templates/``.
+        dry_run: Only return the paths that would be written.
+
+    Returns:
+        Written (or would-be) section and index files, then rewritten agents.
+    """
+    dest = Path(destination).expanduser().resolve()
+    templates = sorted((dest / TEMPLATES_DIR).glob("*.md"))
+    paths: list[Path] = []
+    sections: dict[str, dict[str, str]] = {}
+    for template in templates:
+        out_dir = template.with_suffix("")
+        files, sections[template.stem] = _split(template.read_text(encoding="utf-8"), template.stem)
+        if dry_run:
+            paths.extend(out_dir / f for f in files)
+            continue
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for stale in out_dir.glob("*.md"):
+            if stale.name not in files:
+                stale.unlink()
+        for filename, content in files.items():
+            path = out_dir / filename
+            path.write_text(content, encoding="utf-8")
+            paths.append(path)
+    if not templates or dry_run:
+        return paths
+
+    def repoint(match: re.Match[str]) -> str:
+        prefix, name, anchor = match.groups()
+        return f"{prefix}{name}/{sections[name].get(anchor or '', INDEX_NAME)}"
+
+    reference = _reference_re(list(sections))
+    for directory in REFERENCE_DIRS:
+        for path in sorted((dest / directory).glob("*.md")):
+            text = path.read_text(encoding="utf-8")
+            updated = reference.sub(repoint, text)
+            if updated != text:
+                path.write_text(updated, encoding="utf-8")
+                paths.append(path)
+    return paths
@@ -0,0 +1,124 @@
+"""
+Parametric rendering for bundled templates and project-context skeletons.
+
+Templates are compiled once into a tuple of literal and placeholder segments
+and cached in-process, so bootstrapping many destinations only pays a join per
+file. Two placeholder forms are recognised:
+
+- ``{{ key }}`` — explicit placeholders.
+- ``\\[Some Placeholder\\]`` — the escaped-bracket placeholders used by the
+  AAMAD templates, addressed by their slug (``some_placeholder``).
+
+Placeholders without a value are left untouched for agents to fill in later.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Mapping, Tuple, Union
+
+# Bundle members that are rendered when values are supplied
+TEMPLATE_PREFIXES = (".cursor/templates/", "project-context/")
+TEMPLATE_SUFFIXES = (".md", ".txt", ".yaml", ".yml")
+
+_PLACEHOLDER_RE = re.compile(
+    r"\{\{\s*(?P<key>[A-Za-z_][\w.-]*)\s*\}\}"
+    r"|\\\[(?P<label>(?:[^\]\\\n]|\\[^\]])+?)\\\]"
+)
+
+# A compiled template: literal strings interleaved with (key, raw) placeholders
+Segment = Union[str, Tuple[str, str]]
+
+
+def placeholder_key(label: str) -> str:
+    """Slug for an escaped-bracket placeholder (``Feature 1`` -> ``feature_1``)."""
+    label = label.replace("\\", "")
+    return re.sub(r"[^0-9a-z]+", "_", label.lower()).strip("_")
+
+
+@lru_cache(maxsize=256)
+def compile_template(text: str) -> Tuple[Segment, ...]:
+    """
+    Compile template text into literal and ``(key, raw)`` placeholder segments.
+
+    Results are cached by text, so identical templates are only compiled once
+    per process regardless of how many destinations they are rendered into.
+    """
+    segments: list[Segment] = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(text):
+        if match.start() > pos:
+            segments.append(text[pos : match.start()])
+        key = match.group("key") or placeholder_key(match.group("label"))
+        segments.append((key, match.group(0)))
+        pos = match.end()
+    if pos < len(text):
+        segments.append(text[pos:])
+    return tuple(segments)
+
+
+def render_template(text: str, values: Mapping[str, str]) -> str:
+    """Render ``text`` with ``values``; unknown placeholders are kept verbatim."""
+    parts = []
+    for segment in compile_template(text):
+        if isinstance(segment, str):
+            parts.append(segment)
+        else:
+            key, raw = segment
+            parts.append(str(values[key]) if key in values else raw)
+    return "".join(parts)
+
+
+def placeholder_keys(text: str) -> list[str]:
+    """Return the placeholder keys used in ``text``, in first-use order."""
+    keys: list[str] = []
+    for segment in compile_template(text):
+        if not isinstance(segment, str) and segment[0] not in keys:
+            keys.append(segment[0])
+    return keys
+
+
+def is_template_member(name: str) -> bool:
+    """True for bundle members that are rendered when template values are given."""
+    return name.startswith(TEMPLATE_PREFIXES) and name.endswith(TEMPLATE_SUFFIXES)
+
+
+def parse_set_args(items: Iterable[str]) -> dict[str, str]:
+    """Parse ``key=value`` pairs (from ``--set``) into a dict."""
+    values: dict[str, str] = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            raise ValueError(f"Expected key=value, got {item!r}")
+        values[key] = value
+    return values
+
+
+def load_values(path: Path | str) -> dict[str, str]:
+    """
+    Load template values from a YAML or JSON mapping file.
+
+    Raises:
+        ValueError: if the file cannot be parsed or does not contain a mapping.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    is_json = path.suffix.lower() == ".json"
+    try:
+        if is_json:
+            data = json.loads(text)
+        else:
+            from .miniyaml import load_yaml
+
+            data = load_yaml(text)
+    except Exception as exc:  # yaml.YAMLError, or whatever the miniyaml fallback raises
+        raise ValueError(f"{path}: invalid {'JSON' if is_json else 'YAML'}: {exc}") from exc
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a mapping of template values")
+    return {str(k): "" if v is None else str(v) for k, v in data.items()}
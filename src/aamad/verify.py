@@ -0,0 +1,255 @@
+"""
+Integrity verification of installed AAMAD artifacts.
+
+Installed files are compared against the CRC-32 values stored in the bundle's
+zip central directory, so no member is decompressed. ``extract_artifacts``
+records a manifest (``.aamad/manifest.json``) with the size, mtime, CRC and
+SHA-256 of every file it wrote, including the files the vscode/claude-code
+converters generated; files whose size and mtime still match that manifest are
+skipped (unless ``full``), and the rest are hashed in parallel.
+
+What a clean result guarantees: a file with a recorded SHA-256 is byte-for-byte
+what the installer wrote, so deliberate edits are detected as well as
+corruption. A file checked only against the bundle CRC-32 (no manifest entry)
+is free of accidental corruption, but CRC-32 is not collision resistant and a
+deliberate edit can be crafted to match it. The size/mtime shortcut trusts
+timestamps, which anyone with write access can reset, so a compliance gate
+should run with ``full=True`` (``aamad verify --full``). The manifest itself
+lives in the install tree: it proves nothing against someone who can also
+rewrite it, so keep a copy outside the tree when that matters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from .installer import BundleSource
+
+MANIFEST_PATH = Path(".aamad") / "manifest.json"
+MANIFEST_VERSION = 1
+
+_CHUNK = 1 << 20
+
+
+@dataclass
+class VerifyResult:
+    """Outcome of ``verify_installation``."""
+
+    checked: int = 0
+    hashed: int = 0
+    missing: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.modified
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "checked": self.checked,
+            "hashed": self.hashed,
+            "missing": self.missing,
+            "modified": self.modified,
+        }
+
+    def report(self) -> str:
+        lines = [f"missing:  {p}" for p in self.missing]
+        lines += [f"modified: {p}" for p in self.modified]
+        status = "OK" if self.ok else f"DRIFT ({len(self.missing) + len(self.modified)} files)"
+        lines.append(f"{status}: {self.checked} files checked, {self.hashed} hashed")
+        return "\n".join(lines)
+
+
+def file_crc32(path: Path) -> int:
+    """CRC-32 of a file, computed in chunks (zlib releases the GIL)."""
+    return file_digests(path)[0]
+
+
+def file_digests(path: Path) -> tuple[int, str]:
+    """CRC-32 and hex SHA-256 of a file, computed in one chunked read."""
+    crc = 0
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while True:
+            chunk = fh.read(_CHUNK)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            sha.update(chunk)
+    return crc & 0xFFFFFFFF, sha.hexdigest()
+
+
+def _hash_many(paths: Iterable[Path], workers: int | None) -> list[tuple[int, str]]:
+    paths = list(paths)
+    if len(paths) <= 1 or workers == 1:
+        return [file_digests(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(file_digests, paths))
+
+
+def _entry(st: os.stat_result, digests: tuple[int, str], **extra: Any) -> dict[str, Any]:
+    crc, sha256 = digests
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "crc": crc, "sha256": sha256, **extra}
+
+
+def load_manifest(destination: Path | str) -> dict[str, dict[str, Any]]:
+    """
+    Return the recorded ``{path: {size, mtime_ns, crc, sha256, bundle_crc}}`` entries.
+
+    Members deliberately not installed are recorded as ``{excluded, bundle_crc}``;
+    files generated from the bundle carry ``generated`` instead of ``bundle_crc``.
+    Entries written by older versions may lack ``sha256``.
+    """
+    path = Path(destination) / MANIFEST_PATH
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _write_manifest(dest: Path, files: dict[str, dict[str, Any]]) -> Path:
+    path = dest / MANIFEST_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    payload = {"version": MANIFEST_VERSION, "files": dict(sorted(files.items()))}
+    tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def _bundle_crcs(bundle_path: BundleSource) -> dict[str, int]:
+    from .installer import open_bundle
+
+    with open_bundle(bundle_path) as zf:
+        return {m.filename: m.CRC for m in zf.infolist() if not m.is_dir()}
+
+
+def record_manifest(
+    destination: Path | str,
+    bundle_path: BundleSource,
+    *,
+    workers: int | None = None,
+    excluded: Iterable[str] = (),
+    generated: Iterable[Path | str] = (),
+) -> Path:
+    """
+    Record size, mtime, CRC and SHA-256 of the installed files under ``destination``.
+
+    The on-disk digests are stored next to the bundle CRC, so files the
+    installer transformed (rendered templates, compacted rules) verify against
+    what was installed rather than the raw bundle member. Bundle members in
+    ``excluded`` were deliberately not installed (e.g. adapters pruned by
+    ``--runtime``) and are not reported as missing. ``generated`` lists files
+    written from the bundle rather than extracted (converted ``.github/`` and
+    ``.claude/`` outputs); they are verified against their recorded SHA-256.
+    """
+    dest = Path(destination).expanduser().resolve()
+    expected = _bundle_crcs(bundle_path)
+    files = load_manifest(dest)
+    for name in excluded:
+        if name in expected:
+            files[name] = {"excluded": True, "bundle_crc": expected[name]}
+        elif files.get(name, {}).get("generated"):
+            del files[name]  # a generated file removed on purpose (e.g. a pruned adapter)
+    present = [(name, dest / name) for name in expected if (dest / name).is_file()]
+    for path in generated:
+        path = dest / path
+        name = path.relative_to(dest).as_posix()
+        if name not in expected and path.is_file():
+            present.append((name, path))
+    digests = _hash_many((p for _, p in present), workers)
+    for (name, path), digest in zip(present, digests):
+        extra = {"bundle_crc": expected[name]} if name in expected else {"generated": True}
+        files[name] = _entry(path.stat(), digest, **extra)
+    return _write_manifest(dest, files)
+
+
+def verify_installation(
+    destination: Path | str,
+    bundle_path: BundleSource,
+    *,
+    workers: int | None = None,
+    update_manifest: bool = True,
+    full: bool = False,
+) -> VerifyResult:
+    """
+    Compare the installed files under ``destination`` with ``bundle_path``.
+
+    Bundle files are compared with the manifest's SHA-256 when one was
+    recorded for the same bundle member, else with the bundle CRC-32.
+    Generated files recorded in the manifest are compared with their SHA-256.
+
+    Args:
+        destination: Install root.
+        bundle_path: Bundle the installation came from.
+        workers: Hashing threads (default: ThreadPoolExecutor's default).
+        update_manifest: Record size/mtime of files that verified by hash so
+            the next run can skip them.
+        full: Hash every file instead of trusting an unchanged size and mtime.
+
+    Returns:
+        VerifyResult listing missing and modified files.
+    """
+    dest = Path(destination).expanduser().resolve()
+    expected = _bundle_crcs(bundle_path)
+    manifest = load_manifest(dest)
+    result = VerifyResult()
+
+    # (name, path, expected CRC or SHA-256, stat, manifest extras)
+    to_hash: list[tuple[str, Path, int | str, os.stat_result, dict[str, Any]]] = []
+    generated = [n for n, e in manifest.items() if e.get("generated") and n not in expected]
+    for name in [*expected, *generated]:
+        result.checked += 1
+        path = dest / name
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            if not manifest.get(name, {}).get("excluded"):
+                result.missing.append(name)
+            continue
+        entry = manifest.get(name) or {}
+        if name in expected:
+            extra: dict[str, Any] = {"bundle_crc": expected[name]}
+            recorded = entry.get("bundle_crc") == expected[name]
+        else:
+            extra = {"generated": True}
+            recorded = True
+        want: int | str = expected.get(name, "")
+        if recorded and ("sha256" in entry or "crc" in entry):
+            want = entry.get("sha256", entry.get("crc"))
+            if (
+                not full
+                and entry.get("size") == st.st_size
+                and entry.get("mtime_ns") == st.st_mtime_ns
+            ):
+                continue
+        to_hash.append((name, path, want, st, extra))
+
+    digests = _hash_many((p for _, p, _, _, _ in to_hash), workers)
+    result.hashed = len(to_hash)
+    changed = False
+    for (name, _, want, st, extra), digest in zip(to_hash, digests):
+        crc, sha256 = digest
+        if want != (sha256 if isinstance(want, str) else crc):
+            result.modified.append(name)
+            continue
+        manifest[name] = _entry(st, digest, **extra)
+        changed = True
+
+    if update_manifest and changed:
+        _write_manifest(dest, manifest)
+    result.missing.sort()
+    result.modified.sort()
+    return result
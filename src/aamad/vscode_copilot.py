@@ -10,30 +10,17 @@ from __future__ import annotations
 
 import json
 import re
+import time
 from pathlib import Path
-from typing import Any
-
-# Rule order (same as Claude Code; dependency order)
-RULE_ORDER = [
-    "aamad-core",
-    "development-workflow",
-    "epics-index",
-    "adapter-registry",
-    "adapter-crewai",
-    "adapter-claude-agent-sdk",
-    "adapter-cursor-sdk",
-]
-
-# Agent files to convert (exclude dev-crew.md)
-AGENT_IDS = [
-    "product-mgr",
-    "system-arch",
-    "project-mgr",
-    "frontend-eng",
-    "backend-eng",
-    "integration-eng",
-    "qa-eng",
-]
+from typing import Any, Collection, Iterable
+
+from .cache import atomic_write_bytes
+from .compact import CompactStats, compact_bodies
+from .events import EventSink, file_event
+from .globs import expand_braces, split_globs
+from .miniyaml import dump_yaml, load_yaml
+from .rewrite import VSCODE_REWRITER
+from .sources import AGENT_IDS, RULE_ORDER, agent_stems, rule_stems, source_stems
 
 # Default Copilot tools (guide §4.2 Step 2)
 DEFAULT_TOOLS = ["editFiles", "terminalLastCommand", "search", "codebase", "fetch"]
@@ -84,15 +71,19 @@ HANDOFFS: dict[str, list[dict[str, Any]]] = {
 }
 
 
+def _converted(on_event: EventSink | None, path: Path, start: float) -> None:
+    """Report one written output as a ``converted`` file event (see aamad.events)."""
+    if on_event is not None:
+        on_event(file_event("converted", path, duration=time.perf_counter() - start))
+
+
 def _parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
     """Split YAML frontmatter and body. Returns (frontmatter_dict, body)."""
     match = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)$", content, re.DOTALL)
     if not match:
         return {}, content.strip()
     try:
-        import yaml
-
-        fm = yaml.safe_load(match.group(1)) or {}
+        fm = load_yaml(match.group(1)) or {}
     except Exception:
         fm = {}
     body = match.group(2).strip()
@@ -100,17 +91,27 @@ def _parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
 
 
 def _rule_apply_to(fm: dict[str, Any]) -> str:
-    """Map Cursor alwaysApply/globs to VS Code applyTo."""
+    """
+    Map Cursor alwaysApply/globs to VS Code applyTo.
+
+    Every glob is kept: list entries and comma-joined strings become one
+    comma-separated applyTo value. Brace groups are expanded because their
+    commas would collide with Copilot's separator. Negated (``!``) globs are
+    dropped since applyTo has no exclusion syntax; that only widens where the
+    instructions load.
+    """
     if fm.get("alwaysApply") is True:
         return "**"
-    globs = fm.get("globs")
-    if not globs:
+    patterns: list[str] = []
+    for pattern in split_globs(fm.get("globs")):
+        if pattern.startswith("!"):
+            continue
+        for expanded in expand_braces(pattern):
+            if expanded not in patterns:
+                patterns.append(expanded)
+    if not patterns or "**" in patterns:
         return "**"
-    if isinstance(globs, list) and len(globs) > 0:
-        first = globs[0]
-        if first:
-            return str(first).strip()
-    return "**"
+    return ",".join(patterns)
 
 
 def _rule_display_name(stem: str) -> str:
@@ -123,42 +124,57 @@ def _rule_display_name(stem: str) -> str:
     return title
 
 
-def convert_rules(cursor_rules_dir: Path, out_dir: Path) -> list[Path]:
+def convert_rules(
+    cursor_rules_dir: Path,
+    out_dir: Path,
+    *,
+    compact: bool = False,
+    compact_stats: CompactStats | None = None,
+    on_event: EventSink | None = None,
+) -> list[Path]:
     """
     Convert .cursor/rules/*.mdc to .github/instructions/*.instructions.md.
 
     Each output file has VS Code frontmatter: applyTo, name, description;
     body is the markdown body from the .mdc (no Cursor frontmatter).
+    With compact=True, paragraphs repeated across rules are emitted once and
+    decorative markdown is stripped.
     """
     instructions_dir = out_dir / ".github" / "instructions"
     instructions_dir.mkdir(parents=True, exist_ok=True)
     created: list[Path] = []
 
-    for name in RULE_ORDER:
+    parsed: dict[str, tuple[dict[str, Any], str]] = {}
+    for name in source_stems(cursor_rules_dir, ".mdc", RULE_ORDER):
         mdc_path = cursor_rules_dir / f"{name}.mdc"
-        if not mdc_path.exists():
-            continue
-        text = mdc_path.read_text(encoding="utf-8")
-        fm, body = _parse_frontmatter(text)
+        parsed[name] = _parse_frontmatter(mdc_path.read_text(encoding="utf-8"))
+
+    bodies = {name: VSCODE_REWRITER.rewrite(body) for name, (_, body) in parsed.items()}
+    if compact:
+        scoped = [name for name, (fm, _) in parsed.items() if _rule_apply_to(fm) != "**"]
+        bodies = compact_bodies(bodies, compact_stats, scoped=scoped)
+
+    for name, (fm, _) in parsed.items():
+        start = time.perf_counter()
+        body = bodies[name]
         apply_to = _rule_apply_to(fm)
         description = fm.get("description") or ""
         display_name = _rule_display_name(name)
 
         try:
-            import yaml
-
             rule_fm = {
                 "applyTo": apply_to,
                 "name": display_name,
                 "description": description,
             }
-            fm_text = yaml.dump(rule_fm, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            fm_text = dump_yaml(rule_fm)
         except Exception:
             fm_text = f'applyTo: "{apply_to}"\nname: "{display_name}"\ndescription: "{description}"\n'
         content = "---\n" + fm_text.strip() + "\n---\n\n" + body
         out_path = instructions_dir / f"{name}.instructions.md"
         out_path.write_text(content, encoding="utf-8")
         created.append(out_path)
+        _converted(on_event, out_path, start)
 
     return created
 
@@ -202,27 +218,37 @@ def _agent_tools(agent_id: str) -> list[str]:
     return tools
 
 
-def convert_agents(cursor_agents_dir: Path, out_dir: Path) -> list[Path]:
+def convert_agents(
+    cursor_agents_dir: Path,
+    out_dir: Path,
+    *,
+    handoff_agents: Collection[str] | None = None,
+    on_event: EventSink | None = None,
+) -> list[Path]:
     """
     Convert .cursor/agents/*.md to .github/agents/*.agent.md with VS Code frontmatter.
 
-    Skips dev-crew.md. Adds name, description, tools, and optional handoffs.
+    Skips dev-crew.md. Adds name, description, tools, and optional handoffs;
+    with ``handoff_agents``, only handoffs to those agents are kept.
     """
     agents_dir = out_dir / ".github" / "agents"
     agents_dir.mkdir(parents=True, exist_ok=True)
     created: list[Path] = []
 
-    for agent_id in AGENT_IDS:
+    for agent_id in source_stems(cursor_agents_dir, ".md", AGENT_IDS):
+        start = time.perf_counter()
         md_path = cursor_agents_dir / f"{agent_id}.md"
-        if not md_path.exists():
-            continue
         text = md_path.read_text(encoding="utf-8")
         fm, body = _parse_frontmatter(text)
 
         display_name = _get_agent_name(fm) or agent_id.replace("-", " ").title()
         description = _get_description(fm)
         tools = _agent_tools(agent_id)
-        handoffs_list = HANDOFFS.get(agent_id, [])
+        handoffs_list = [
+            h
+            for h in HANDOFFS.get(agent_id, [])
+            if handoff_agents is None or h["agent"] in handoff_agents
+        ]
 
         # Build YAML frontmatter (VS Code expects name, description, tools, handoffs)
         frontmatter: dict[str, Any] = {
@@ -234,20 +260,21 @@ def convert_agents(cursor_agents_dir: Path, out_dir: Path) -> list[Path]:
             frontmatter["handoffs"] = handoffs_list
 
         try:
-            import yaml
-
-            fm_text = yaml.dump(frontmatter, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            fm_text = dump_yaml(frontmatter)
         except Exception:
             fm_text = f"name: {display_name}\ndescription: {description}\ntools: {tools}\n"
-        content = "---\n" + fm_text.strip() + "\n---\n\n" + body
+        content = "---\n" + fm_text.strip() + "\n---\n\n" + VSCODE_REWRITER.rewrite(body)
         out_path = agents_dir / f"{agent_id}.agent.md"
         out_path.write_text(content, encoding="utf-8")
         created.append(out_path)
+        _converted(on_event, out_path, start)
 
     return created
 
 
-def convert_prompts(cursor_prompts_dir: Path, out_dir: Path) -> list[Path]:
+def convert_prompts(
+    cursor_prompts_dir: Path, out_dir: Path, *, on_event: EventSink | None = None
+) -> list[Path]:
     """
     Convert Phase 1 prompt to .github/prompts/phase-1-define.prompt.md.
 
@@ -260,7 +287,8 @@ def convert_prompts(cursor_prompts_dir: Path, out_dir: Path) -> list[Path]:
     if not prompt_path.exists():
         return []
 
-    body = prompt_path.read_text(encoding="utf-8")
+    start = time.perf_counter()
+    body = VSCODE_REWRITER.rewrite(prompt_path.read_text(encoding="utf-8"))
     frontmatter_lines = [
         "---",
         'description: "AAMAD Phase 1: Generate Market Research and Product Requirements Document"',
@@ -271,6 +299,7 @@ def convert_prompts(cursor_prompts_dir: Path, out_dir: Path) -> list[Path]:
     content = "\n".join(frontmatter_lines) + body
     out_path = prompts_dir / "phase-1-define.prompt.md"
     out_path.write_text(content, encoding="utf-8")
+    _converted(on_event, out_path, start)
     return [out_path]
 
 
@@ -290,7 +319,9 @@ def write_settings(out_dir: Path, *, merge: bool = True) -> Path:
     Write .vscode/settings.json with Copilot chat and AAMAD paths.
 
     If merge is True and .vscode/settings.json exists, merge only AAMAD-related
-    keys so user settings are preserved.
+    keys so user settings are preserved. The file is replaced atomically;
+    concurrent installs into one destination are serialised by
+    ``extract_artifacts`` (see aamad.locking).
     """
     vscode_dir = out_dir / ".vscode"
     vscode_dir.mkdir(parents=True, exist_ok=True)
@@ -306,17 +337,31 @@ def write_settings(out_dir: Path, *, merge: bool = True) -> Path:
     else:
         data = dict(VSCODE_AAMAD_SETTINGS)
 
-    settings_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    # Atomic replace: concurrent readers never see a half-written settings file
+    atomic_write_bytes(settings_path, json.dumps(data, indent=2).encode("utf-8"))
     return settings_path
 
 
-def get_vscode_planned_paths(dest: Path) -> list[Path]:
-    """Return the list of paths that install_vscode_copilot would create (for dry-run)."""
+def get_vscode_planned_paths(dest: Path, sources: Iterable[str] | None = None) -> list[Path]:
+    """
+    Return the list of paths that install_vscode_copilot would create (for dry-run).
+
+    Args:
+        dest: Output directory
+        sources: Bundle-relative names of the ``.cursor/`` sources to convert
+            (default: the stock rules and agents)
+    """
     dest = dest.resolve()
+    rules: Iterable[str] = RULE_ORDER
+    agents: Iterable[str] = AGENT_IDS
+    if sources is not None:
+        sources = list(sources)
+        rules = rule_stems(sources)
+        agents = agent_stems(sources)
     paths = []
-    for name in RULE_ORDER:
+    for name in rules:
         paths.append(dest / ".github" / "instructions" / f"{name}.instructions.md")
-    for agent_id in AGENT_IDS:
+    for agent_id in agents:
         paths.append(dest / ".github" / "agents" / f"{agent_id}.agent.md")
     paths.append(dest / ".github" / "prompts" / "phase-1-define.prompt.md")
     paths.append(dest / ".vscode" / "settings.json")
@@ -329,6 +374,11 @@ def install_vscode_copilot(
     *,
     overwrite: bool = False,
     merge_settings: bool = True,
+    compact: bool = False,
+    compact_stats: CompactStats | None = None,
+    cache: bool = False,
+    on_event: EventSink | None = None,
+    handoff_agents: Collection[str] | None = None,
 ) -> list[Path]:
     """
     Run full VS Code / Copilot conversion: rules, agents, prompts, settings.
@@ -338,6 +388,13 @@ def install_vscode_copilot(
         dest: Output directory (usually same as cursor_root)
         overwrite: If False, raise FileExistsError when target dirs already have content
         merge_settings: If True, merge into existing .vscode/settings.json
+        compact: Emit deduplicated, minified instruction bodies (see aamad.compact)
+        compact_stats: Optional accumulator for the compact size reduction
+        cache: Reuse converted outputs for unchanged sources (see aamad.conversion_cache)
+        on_event: Receives conversion-cache events and a ``converted`` file
+            event per output as it is written (see aamad.events)
+        handoff_agents: Agents handoffs may target (default: any); see
+            ``convert_agents``
 
     Returns:
         List of all created file paths.
@@ -358,13 +415,44 @@ def install_vscode_copilot(
                 f"{github_dir} already exists and contains files. Use overwrite=True to replace."
             )
 
+    def convert(stats: CompactStats | None) -> list[Path]:
+        paths = convert_rules(
+            cursor_rules, dest, compact=compact, compact_stats=stats, on_event=on_event
+        )
+        if cursor_agents.exists():
+            paths.extend(
+                convert_agents(
+                    cursor_agents, dest, handoff_agents=handoff_agents, on_event=on_event
+                )
+            )
+        if cursor_prompts.exists():
+            paths.extend(convert_prompts(cursor_prompts, dest, on_event=on_event))
+        return paths
+
     created: list[Path] = []
-    created.extend(convert_rules(cursor_rules, dest))
-    if cursor_agents.exists():
-        created.extend(convert_agents(cursor_agents, dest))
-    if cursor_prompts.exists():
-        created.extend(convert_prompts(cursor_prompts, dest))
+    if cache:
+        from .conversion_cache import convert_cached
+
+        options: dict[str, Any] = {"compact": compact}
+        if handoff_agents is not None:
+            options["handoff_agents"] = sorted(handoff_agents)
+
+        created.extend(
+            convert_cached(
+                cursor_root,
+                dest,
+                target="vscode",
+                options=options,
+                convert=convert,
+                compact_stats=compact_stats,
+                on_event=on_event,
+            )
+        )
+    else:
+        created.extend(convert(compact_stats))
+    start = time.perf_counter()
     settings_path = write_settings(dest, merge=merge_settings)
     created.append(settings_path)
+    _converted(on_event, settings_path, start)
 
     return created
@@ -0,0 +1,316 @@
+"""
+The Define → Build → Deliver workflow as a dependency graph of agents.
+
+Each agent is a step. Its ``inputs``/``outputs`` come from the agent
+frontmatter (``.cursor/agents/*.md`` in the project, else the embedded Cursor
+bundle). Steps are linked when one step's outputs are another's inputs, and
+along the ``HANDOFFS`` of ``aamad.vscode_copilot``: a handoff target also
+depends on everything its source produces.
+
+``workflow_status`` reports stale steps make-style. It compares the content
+hashes of each step's inputs with those recorded in
+``.aamad/workflow-state.json`` when the step last ran (``record_steps``), and
+falls back to mtimes for steps never recorded. Staleness propagates
+downstream. File hashes are cached by size and mtime, so a status run only
+reads the files that changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from .cache import atomic_write_bytes
+
+STATE_PATH = Path(".aamad") / "workflow-state.json"
+STATE_VERSION = 1
+
+AGENTS_DIR = Path(".cursor") / "agents"
+
+# Step states, in report order
+STATE_OK = "ok"
+STATE_STALE = "stale"
+STATE_MISSING = "missing"
+
+_GLOB_CHARS = set("*?[")
+_PLACEHOLDER_RE = re.compile(r"<[^<>/]+>")
+
+
+@dataclass
+class Step:
+    """One agent in the workflow."""
+
+    id: str
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Workflow:
+    """Steps keyed by agent id; ``order`` is a topological order."""
+
+    steps: dict[str, Step]
+    order: list[str]
+
+    def downstream(self, step_id: str) -> list[str]:
+        """Steps that (transitively) depend on ``step_id``, in topological order."""
+        reached = {step_id}
+        for sid in self.order:
+            if any(dep in reached for dep in self.steps[sid].after):
+                reached.add(sid)
+        return [sid for sid in self.order if sid in reached and sid != step_id]
+
+
+def _path_list(value: Any) -> list[str]:
+    """
+    Project paths in a frontmatter list.
+
+    Prose and bare names ("handoff checklist", "context-summary.md") are
+    dropped; ``<placeholder>`` segments become ``*`` globs.
+    """
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    paths = []
+    for item in value:
+        if isinstance(item, str) and "/" in item and " " not in item.strip():
+            paths.append(_PLACEHOLDER_RE.sub("*", item.strip()))
+    return paths
+
+
+def _agent_sources(root: Path) -> list[tuple[str, str]]:
+    """``(agent id, markdown)`` for the project's Cursor agents, else the bundled ones."""
+    directory = root / AGENTS_DIR
+    if directory.is_dir() and any(directory.glob("*.md")):
+        return [(p.stem, p.read_text(encoding="utf-8")) for p in sorted(directory.glob("*.md"))]
+    from .installer import get_bundle_resource, open_bundle
+
+    prefix = AGENTS_DIR.as_posix() + "/"
+    with open_bundle(get_bundle_resource("cursor")) as zf:
+        return sorted(
+            (Path(name).stem, zf.read(name).decode("utf-8"))
+            for name in zf.namelist()
+            if name.startswith(prefix) and name.endswith(".md")
+        )
+
+
+def build_workflow(
+    agents: Iterable[tuple[str, dict[str, Any]]],
+    handoffs: dict[str, list[dict[str, Any]]] | None = None,
+) -> Workflow:
+    """
+    Build the step graph from agent frontmatter.
+
+    Args:
+        agents: ``(agent id, frontmatter)`` pairs. Inputs/outputs are read from
+            the top level or from the ``agent:`` block.
+        handoffs: Agent id -> handoff dicts with an ``agent`` target
+            (default: ``aamad.vscode_copilot.HANDOFFS``).
+
+    Raises:
+        ValueError: if the dependencies form a cycle.
+    """
+    if handoffs is None:
+        from .vscode_copilot import HANDOFFS as handoffs
+
+    steps: dict[str, Step] = {}
+    for agent_id, fm in agents:
+        nested = fm.get("agent") if isinstance(fm.get("agent"), dict) else {}
+        inputs = _path_list(fm.get("inputs", nested.get("inputs")))
+        outputs = _path_list(fm.get("outputs", nested.get("outputs")))
+        if inputs or outputs:
+            steps[agent_id] = Step(agent_id, inputs, outputs)
+
+    producers = {out: s.id for s in steps.values() for out in s.outputs}
+    for step in steps.values():
+        after = {producers[i] for i in step.inputs if producers.get(i, step.id) != step.id}
+        step.after = sorted(after)
+    for source, targets in handoffs.items():
+        for handoff in targets:
+            target = steps.get(handoff.get("agent", ""))
+            if source in steps and target is not None and source not in target.after:
+                target.after = sorted([*target.after, source])
+                target.inputs += [o for o in steps[source].outputs if o not in target.inputs]
+
+    order: list[str] = []
+    visiting: set[str] = set()
+
+    def visit(sid: str) -> None:
+        if sid in order:
+            return
+        if sid in visiting:
+            raise ValueError(f"Workflow dependency cycle through {sid}")
+        visiting.add(sid)
+        for dep in steps[sid].after:
+            visit(dep)
+        visiting.discard(sid)
+        order.append(sid)
+
+    for sid in sorted(steps):
+        visit(sid)
+    return Workflow(steps=steps, order=order)
+
+
+def load_workflow(root: Path | str) -> Workflow:
+    """Workflow of the project at ``root`` (agent frontmatter plus handoffs)."""
+    from .claude_code import _parse_frontmatter
+
+    root = Path(root).expanduser().resolve()
+    return build_workflow(
+        (agent_id, _parse_frontmatter(text)[0]) for agent_id, text in _agent_sources(root)
+    )
+
+
+class _Hasher:
+    """Content hashes of project files, cached by (size, mtime) across runs."""
+
+    def __init__(self, root: Path, cache: dict[str, list[Any]]) -> None:
+        self.root = root
+        self.cache = cache
+        self.hashed = 0
+
+    def expand(self, pattern: str) -> list[str]:
+        if _GLOB_CHARS & set(pattern):
+            matches = (p for p in self.root.glob(pattern) if p.is_file())
+            return sorted(p.relative_to(self.root).as_posix() for p in matches)
+        return [pattern]
+
+    def digest(self, rel: str) -> str | None:
+        path = self.root / rel
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        cached = self.cache.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.cache[rel] = [st.st_size, st.st_mtime_ns, digest]
+        self.hashed += 1
+        return digest
+
+    def snapshot(self, patterns: list[str]) -> dict[str, str | None]:
+        return {rel: self.digest(rel) for pattern in patterns for rel in self.expand(pattern)}
+
+
+@dataclass
+class StepStatus:
+    """Status of one step and why."""
+
+    id: str
+    state: str
+    reasons: list[str] = field(default_factory=list)
+
+
+def _load_state(root: Path) -> dict[str, Any]:
+    try:
+        data = json.loads((root / STATE_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": STATE_VERSION, "files": {}, "steps": {}}
+    if data.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "files": {}, "steps": {}}
+    return data
+
+
+def _save_state(root: Path, state: dict[str, Any]) -> None:
+    atomic_write_bytes(root / STATE_PATH, json.dumps(state, indent=1, sort_keys=True).encode("utf-8"))
+
+
+def _step_status(step: Step, hasher: _Hasher, record: dict[str, Any] | None) -> StepStatus:
+    status = StepStatus(step.id, STATE_OK)
+    # Glob outputs (``sfs/*.md``) are optional; concrete ones must exist
+    concrete = [o for o in step.outputs if not _GLOB_CHARS & set(o)]
+    missing = [o for o in concrete if not (hasher.root / o).exists()]
+    if missing:
+        status.state = STATE_MISSING
+        status.reasons += [f"missing output: {o}" for o in missing]
+        return status
+    inputs = hasher.snapshot(step.inputs)
+    if record is not None:
+        before = record.get("inputs", {})
+        changed = sorted(rel for rel in set(inputs) | set(before) if inputs.get(rel) != before.get(rel))
+        if changed:
+            status.state = STATE_STALE
+            status.reasons += [f"changed input: {rel}" for rel in changed]
+        return status
+    # Never recorded: make-style mtime comparison
+    oldest_output = min((hasher.root / o).stat().st_mtime_ns for o in concrete) if concrete else None
+    newer = [
+        rel
+        for rel, digest in inputs.items()
+        if digest is not None
+        and oldest_output is not None
+        and (hasher.root / rel).stat().st_mtime_ns > oldest_output
+    ]
+    if newer:
+        status.state = STATE_STALE
+        status.reasons += [f"newer input: {rel}" for rel in sorted(newer)]
+    return status
+
+
+def workflow_status(root: Path | str, workflow: Workflow | None = None) -> list[StepStatus]:
+    """
+    Report each step as ``ok``, ``stale`` or ``missing``, in topological order.
+
+    A step is ``missing`` when one of its outputs does not exist. It is
+    ``stale`` when its inputs changed since it was recorded (or, if never
+    recorded, when an input is newer than its outputs), or when an upstream
+    step is not ``ok``.
+    """
+    root = Path(root).expanduser().resolve()
+    workflow = workflow or load_workflow(root)
+    state = _load_state(root)
+    hasher = _Hasher(root, state["files"])
+    results: dict[str, StepStatus] = {}
+    for sid in workflow.order:
+        step = workflow.steps[sid]
+        status = _step_status(step, hasher, state["steps"].get(sid))
+        upstream = [dep for dep in step.after if results[dep].state != STATE_OK]
+        if upstream and status.state == STATE_OK:
+            status.state = STATE_STALE
+        status.reasons += [f"upstream: {dep}" for dep in upstream]
+        results[sid] = status
+    if hasher.hashed:
+        _save_state(root, state)
+    return [results[sid] for sid in workflow.order]
+
+
+def record_steps(
+    root: Path | str,
+    step_ids: Iterable[str],
+    workflow: Workflow | None = None,
+) -> None:
+    """
+    Record the current input and output hashes of ``step_ids`` as up to date.
+
+    Raises:
+        KeyError: if the workflow has no such step.
+    """
+    root = Path(root).expanduser().resolve()
+    workflow = workflow or load_workflow(root)
+    steps = [workflow.steps[sid] for sid in step_ids]
+    state = _load_state(root)
+    hasher = _Hasher(root, state["files"])
+    for step in steps:
+        state["steps"][step.id] = {
+            "inputs": hasher.snapshot(step.inputs),
+            "outputs": hasher.snapshot(step.outputs),
+        }
+    _save_state(root, state)
+
+
+def format_status(statuses: list[StepStatus]) -> str:
+    """Render step statuses as plain text, one step per line plus reasons."""
+    if not statuses:
+        return "No workflow steps found."
+    lines = []
+    for s in statuses:
+        lines.append(f"{s.state:<8} {s.id}")
+        lines.extend(f"{'':<9}{reason}" for reason in s.reasons)
+    return "\n".join(lines)
@@ -0,0 +1,11 @@
+"""Shared test fixtures."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep the conversion cache out of the real ``~/.cache/aamad``."""
+    monkeypatch.setenv("AAMAD_CACHE_DIR", str(tmp_path / "aamad-cache"))
@@ -330,3 +330,57 @@ def test_extract_artifacts_includes_agents_md(tmpdir):
     assert agents_md.exists()
     assert agents_md in paths or any(str(p).endswith("AGENTS.md") for p in paths)
     assert ".cursor/agents/" in agents_md.read_text()
+
+
+def test_convert_rules_compact_dedupes_and_reports(tmpdir):
+    """compact=True drops paragraphs repeated across rules and records the savings."""
+    from aamad.compact import CompactStats
+
+    rules_dir = tmpdir / "rules"
+    rules_dir.mkdir()
+    shared = "- Record resolved model and token controls in Audit."
+    (rules_dir / "aamad-core.mdc").write_text(
+        f"---\ndescription: Core\nalwaysApply: true\n---\n\n## Purpose\n{shared}\n"
+    )
+    (rules_dir / "adapter-crewai.mdc").write_text(
+        f"---\ndescription: CrewAI\nalwaysApply: true\n---\n\n## Setup\n- **Install** CrewAI.\n{shared}\n"
+    )
+
+    stats = CompactStats()
+    convert_rules(rules_dir, tmpdir, style="single", compact=True, compact_stats=stats)
+    text = (tmpdir / ".claude" / "CLAUDE.md").read_text()
+    assert text.count(shared) == 1
+    assert "**" not in text
+    assert stats.duplicates_removed == 1
+    assert stats.bytes_after < stats.bytes_before
+
+
+def test_convert_rules_path_scoped_frontmatter(tmpdir):
+    """Rules with globs get Claude Code `paths` frontmatter; alwaysApply rules stay global."""
+    rules_dir = tmpdir / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "aamad-core.mdc").write_text(
+        "---\ndescription: Core\nalwaysApply: true\n---\n\n## Purpose\nCore.\n"
+    )
+    (rules_dir / "adapter-crewai.mdc").write_text(
+        "---\ndescription: CrewAI\nglobs: backend/**/*.py, config/*.yaml\nalwaysApply: false\n---\n\n"
+        "## Setup\nCrewAI.\n"
+    )
+
+    convert_rules(rules_dir, tmpdir, style="split")
+    core = (tmpdir / ".claude" / "rules" / "aamad-core.md").read_text()
+    scoped = (tmpdir / ".claude" / "rules" / "adapter-crewai.md").read_text()
+    assert not core.startswith("---")
+    assert scoped.startswith('---\npaths:\n  - "backend/**/*.py"\n  - "config/*.yaml"\n---\n')
+    assert "## Setup" in scoped
+
+    claude_md = (tmpdir / ".claude" / "CLAUDE.md").read_text()
+    global_section, scoped_section = claude_md.split("## Path-Scoped Rule Files")
+    assert "aamad-core" in global_section and "adapter-crewai" not in global_section
+    assert "adapter-crewai" in scoped_section and "backend/**/*.py" in scoped_section
+
+    from aamad.context_stats import collect_context_stats
+
+    stats = collect_context_stats(tmpdir, ide="claude-code", file="backend/app/crew.py")
+    scopes = {e.name: e.scope for e in stats.entries if e.kind == "rule"}
+    assert scopes == {"aamad-core": "always", "adapter-crewai": "matched"}
@@ -0,0 +1,72 @@
+"""Unit tests for CLI commands without a dedicated module."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.cli import main
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_bundle_info_json_streams_filtered_members_and_totals(monkeypatch, capsys):
+    """bundle-info --json emits one line per matching member, then totals."""
+    monkeypatch.setenv("AAMAD_NO_DAEMON", "1")
+    assert main(["bundle-info", "--json", "--include", "*.mdc", "--exclude", "adapter-*"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    members, totals = lines[:-1], lines[-1]
+    assert members and all(m["name"].endswith(".mdc") for m in members)
+    assert not any("/adapter-" in m["name"] for m in members)
+    assert {"size", "compressed_size", "crc", "ratio"} <= set(members[0])
+    assert totals["type"] == "totals"
+    assert totals["files"] == len(members)
+    assert totals["size"] == sum(m["size"] for m in members)
+
+
+def test_init_jsonl_streams_phase_and_file_events(tmpdir, monkeypatch, capsys):
+    """init --format jsonl emits paired phase events, per-file events and a final summary."""
+    monkeypatch.setenv("AAMAD_NO_DAEMON", "1")
+    monkeypatch.setenv("AAMAD_CACHE_DIR", str(tmpdir / "cache"))
+    dest = tmpdir / "proj"
+    assert main(["init", "--ide", "vscode", "--dest", str(dest), "--format", "jsonl"]) == 0
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert events[0]["event"] == "start" and events[-1]["event"] == "done"
+    starts = [e["phase"] for e in events if e["event"] == "phase_start"]
+    ends = [e["phase"] for e in events if e["event"] == "phase_end"]
+    assert starts == ends == ["extract", "convert", "agents-md", "manifest"]
+    files = [e for e in events if e["event"] == "file"]
+    assert {e["action"] for e in files} == {"written", "converted"}
+    assert all(e["bytes"] > 0 or e["path"].endswith(".gitkeep") for e in files)
+
+    # Identical files are skipped on overwrite; conflicts become an error event
+    assert main(["init", "--dest", str(dest), "--format", "jsonl", "--overwrite", "--no-snapshot"]) == 0
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {e["action"] for e in events if e.get("phase") == "extract" and e["event"] == "file"} == {"skipped"}
+    assert main(["init", "--dest", str(dest), "--format", "jsonl"]) == 1
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])["event"] == "error"
+
+
+@pytest.mark.parametrize("command", ["bundle-info", "verify"])
+def test_rejected_overlay_is_reported_without_traceback(tmpdir, monkeypatch, capsys, command):
+    """An overlay failing the extraction limits exits 1 with the violations on stderr."""
+    import zipfile
+
+    monkeypatch.setenv("AAMAD_NO_DAEMON", "1")
+    overlay = tmpdir / "evil.zip"
+    with zipfile.ZipFile(overlay, "w") as zf:
+        zf.writestr("../evil.md", "x")
+    argv = [command, "--overlay", str(overlay)]
+    if command == "verify":
+        argv += ["--dest", str(tmpdir)]
+    with pytest.raises(SystemExit) as info:
+        main(argv)
+    assert info.value.code == 1
+    assert "escapes the destination" in capsys.readouterr().err
@@ -0,0 +1,55 @@
+"""Unit tests for compact rule emission."""
+
+from __future__ import annotations
+
+from aamad.compact import CompactStats, compact_bodies
+
+
+def test_compact_bodies_removes_cross_rule_duplicates():
+    """Paragraphs and list items already emitted by an earlier rule are dropped."""
+    bodies = {
+        "core": "## Purpose\n- Record resolved values in Audit.\n- Core only.\n\nShared paragraph.",
+        "adapter": (
+            "## Setup\n- record resolved   values in Audit.\n\n"
+            "## Notes\nShared  paragraph.\n\n## Mapping\n- Adapter only."
+        ),
+    }
+    stats = CompactStats()
+    out = compact_bodies(bodies, stats)
+
+    assert out["core"] == "## Purpose\n- Record resolved values in Audit.\n- Core only.\n\nShared paragraph."
+    # Sections emptied by deduplication lose their heading too
+    assert out["adapter"] == "## Mapping\n- Adapter only."
+    assert stats.duplicates_removed == 2
+    assert stats.bytes_after < stats.bytes_before
+    assert "duplicate paragraphs removed" in stats.summary()
+
+
+def test_compact_bodies_strips_decoration_and_keeps_code():
+    """Horizontal rules, bold markers and whitespace runs go; code blocks are untouched."""
+    body = "# Title\n\n---\n\n- **Bold**   item\n    - nested\n\n```yaml\nkey:  value\n```\n<!-- note -->"
+    out = compact_bodies({"rule": body})["rule"]
+    assert out == "# Title\n- Bold item\n    - nested\n\n```yaml\nkey:  value\n```"
+
+
+def test_compact_bodies_scoped_rules_do_not_suppress_global_ones():
+    """A path-scoped rule's paragraphs never remove content from a later global rule."""
+    bodies = {"scoped": "Shared.\n\nScoped only.", "global": "Shared.\n\nGlobal only."}
+    out = compact_bodies(bodies, scoped=["scoped"])
+    assert out["global"] == "Shared.\n\nGlobal only."
+
+    out = compact_bodies({"global": "Shared.", "scoped": "Shared.\n\nScoped only."}, scoped=["scoped"])
+    assert out["scoped"] == "Scoped only."
+
+
+def test_compact_bodies_keeps_inline_code_globs_and_dunders():
+    """Inline code, ``**`` globs and ``__name__`` identifiers are not treated as emphasis."""
+    body = (
+        "Applies to `src/**/*.py` and `tests/**/*.py`, also src/**/*.ts.\n\n"
+        "- Keep __init__.py and `a  b` as written; **drop** this __bold__."
+    )
+    out = compact_bodies({"rule": body})["rule"]
+    assert out == (
+        "Applies to `src/**/*.py` and `tests/**/*.py`, also src/**/*.ts.\n\n"
+        "- Keep __init__.py and `a  b` as written; drop this bold."
+    )
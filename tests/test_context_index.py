@@ -0,0 +1,89 @@
+"""Unit tests for the project-context section index."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.context_index import INDEX_PATH, build_index, query_index, split_sections
+
+PRD = """# Product Requirements
+
+Intro text.
+
+## Authentication
+
+Users sign in with SSO via OAuth.
+
+```
+# not a heading
+```
+
+## Billing
+
+Invoices are generated monthly.
+
+## Billing
+
+Refunds within 30 days.
+"""
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def _write_prd(root: Path, text: str = PRD) -> Path:
+    path = root / "project-context" / "1.define" / "prd.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_split_sections_ignores_fenced_headings_and_dedupes_anchors():
+    """Sections split at headings outside code fences; repeated anchors get a suffix."""
+    sections = [s for s, _ in split_sections(PRD, "prd.md")]
+    assert [s.heading for s in sections] == [
+        "Product Requirements",
+        "Authentication",
+        "Billing",
+        "Billing",
+    ]
+    assert [s.anchor for s in sections][2:] == ["billing", "billing-1"]
+    assert sections[1].start_line == 5 and sections[1].end_line == 12
+
+
+def test_query_returns_only_matching_section(tmpdir):
+    """A query prints the matching slice, not the whole document."""
+    _write_prd(tmpdir)
+    build_index(tmpdir)
+    matches = query_index(tmpdir, "oauth sso")
+    assert matches[0].section.anchor == "authentication"
+    assert matches[0].text.startswith("## Authentication")
+    assert "Invoices" not in matches[0].text
+    assert query_index(tmpdir, "kubernetes") == []
+
+
+def test_index_updates_incrementally(tmpdir):
+    """Unchanged files are not re-indexed; edited and removed files are."""
+    path = _write_prd(tmpdir)
+    assert build_index(tmpdir).reindexed == ["project-context/1.define/prd.md"]
+    before = (tmpdir / INDEX_PATH).stat().st_mtime_ns
+    assert build_index(tmpdir).reindexed == []
+    assert (tmpdir / INDEX_PATH).stat().st_mtime_ns == before
+
+    path.write_text("# Deployment\n\nShip with Terraform.\n", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    update = build_index(tmpdir)
+    assert update.reindexed == ["project-context/1.define/prd.md"]
+    assert query_index(tmpdir, "terraform")[0].section.heading == "Deployment"
+    assert query_index(tmpdir, "oauth") == []
+
+    path.unlink()
+    assert build_index(tmpdir).removed == ["project-context/1.define/prd.md"]
@@ -0,0 +1,121 @@
+"""Unit tests for context-weight statistics."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.cli import main
+from aamad.context_stats import collect_context_stats, estimate_tokens
+from aamad.globs import glob_match, match_any, split_globs
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+@pytest.fixture
+def cursor_project(tmpdir):
+    """Create a Cursor layout with one global, one scoped and one manual rule."""
+    rules_dir = tmpdir / ".cursor" / "rules"
+    rules_dir.mkdir(parents=True)
+    (rules_dir / "aamad-core.mdc").write_text(
+        """---
+description: Core
+alwaysApply: true
+---
+
+## Purpose
+Core rules for every request.
+"""
+    )
+    (rules_dir / "python.mdc").write_text(
+        """---
+description: Python only
+globs: src/**/*.py, tests/**/*.py
+alwaysApply: false
+---
+
+## Python
+Use type hints.
+"""
+    )
+    (rules_dir / "manual.mdc").write_text(
+        """---
+description: Manual
+---
+
+Only when asked.
+"""
+    )
+    agents_dir = tmpdir / ".cursor" / "agents"
+    agents_dir.mkdir(parents=True)
+    (agents_dir / "backend-eng.md").write_text("# Backend\n\nBuild the backend.\n")
+    return tmpdir
+
+
+def test_estimate_tokens_counts_words_and_punctuation():
+    """The estimator counts word chunks of four characters plus punctuation."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("word") == 1
+    assert estimate_tokens("words, words.") == 6
+    assert estimate_tokens("a" * 9) == 3
+
+
+def test_split_globs_and_match():
+    """Glob lists and comma-joined strings normalise to the same patterns."""
+    assert split_globs("src/**/*.py, *.{ts,tsx}") == ["src/**/*.py", "*.{ts,tsx}"]
+    assert split_globs(["a", "b,c"]) == ["a", "b", "c"]
+    assert split_globs(None) == []
+    assert glob_match("src/**/*.py", "src/pkg/mod.py")
+    assert glob_match("src/**/*.py", "src/mod.py")
+    assert glob_match("*.tsx", "web/app/page.tsx")
+    assert not glob_match("docs/*.md", "docs/a/b.md")
+    assert match_any(["src/**", "!src/vendor/**"], "src/app.py")
+    assert not match_any(["src/**", "!src/vendor/**"], "src/vendor/lib.py")
+
+
+def test_cursor_scopes(cursor_project):
+    """alwaysApply rules are always loaded; glob rules only for matching files."""
+    stats = collect_context_stats(cursor_project, ide="cursor")
+    scopes = {e.name: e.scope for e in stats.entries}
+    assert scopes == {
+        "aamad-core": "always",
+        "python": "scoped",
+        "manual": "on-demand",
+        "backend-eng": "on-demand",
+    }
+    baseline = stats.request_tokens
+
+    matched = collect_context_stats(cursor_project, ide="cursor", file="src/app/main.py")
+    assert {e.name: e.scope for e in matched.entries}["python"] == "matched"
+    assert matched.request_tokens > baseline
+    assert matched.request_bytes > stats.request_bytes
+
+
+def test_vscode_apply_to_scopes(tmpdir):
+    """applyTo '**' is global; narrower applyTo values are path-scoped."""
+    inst = tmpdir / ".github" / "instructions"
+    inst.mkdir(parents=True)
+    (inst / "core.instructions.md").write_text('---\napplyTo: "**"\n---\n\nCore.\n')
+    (inst / "web.instructions.md").write_text('---\napplyTo: "web/**/*.ts,web/**/*.tsx"\n---\n\nWeb.\n')
+
+    stats = collect_context_stats(tmpdir, ide="vscode", file="web/app/page.tsx")
+    scopes = {e.name: e.scope for e in stats.entries}
+    assert scopes == {"core": "always", "web": "matched"}
+
+
+def test_context_stats_cli_json_and_budget(cursor_project, capsys):
+    """CLI emits JSON and fails when the token budget is exceeded."""
+    assert main(["context-stats", "--dest", str(cursor_project), "--json"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["ide"] == "cursor"
+    assert data["request_tokens"] > 0
+    assert {e["name"] for e in data["entries"]} >= {"aamad-core", "python"}
+
+    assert main(["context-stats", "--dest", str(cursor_project), "--max-tokens", "1"]) == 1
@@ -0,0 +1,99 @@
+"""Unit tests for the persistent conversion-output cache."""
+
+from __future__ import annotations
+
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import aamad.vscode_copilot as vscode_copilot
+from aamad.compact import CompactStats
+from aamad.installer import extract_artifacts
+from aamad.vscode_copilot import install_vscode_copilot
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+@pytest.fixture
+def cursor_project(tmpdir, monkeypatch):
+    monkeypatch.setenv("AAMAD_CACHE_DIR", str(tmpdir / "cache"))
+    root = tmpdir / "src"
+    extract_artifacts(root, ide="cursor")
+    return root
+
+
+def _outputs(root: Path) -> dict[str, bytes]:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in (root / ".github").rglob("*")
+        if p.is_file()
+    }
+
+
+def test_unchanged_sources_are_a_cache_read(tmpdir, cursor_project, monkeypatch):
+    """A second conversion of the same sources is served without converting."""
+    first_stats = CompactStats()
+    install_vscode_copilot(cursor_project, tmpdir / "a", compact=True, compact_stats=first_stats, cache=True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("converter ran on a cache hit")
+
+    monkeypatch.setattr(vscode_copilot, "convert_rules", fail)
+    second_stats = CompactStats()
+    paths = install_vscode_copilot(
+        cursor_project, tmpdir / "b", compact=True, compact_stats=second_stats, cache=True
+    )
+    assert _outputs(tmpdir / "a") == _outputs(tmpdir / "b")
+    assert second_stats == first_stats
+    assert (tmpdir / "b" / ".vscode" / "settings.json") in paths
+
+
+def test_changed_source_or_options_miss_the_cache(tmpdir, cursor_project):
+    """Editing a rule or changing options produces fresh output."""
+    install_vscode_copilot(cursor_project, tmpdir / "a", cache=True)
+    rule = cursor_project / ".cursor" / "rules" / "aamad-core.mdc"
+    rule.write_text(rule.read_text(encoding="utf-8") + "\n- Cached? No.\n", encoding="utf-8")
+    install_vscode_copilot(cursor_project, tmpdir / "b", cache=True)
+    core = tmpdir / "b" / ".github" / "instructions" / "aamad-core.instructions.md"
+    assert "Cached? No." in core.read_text(encoding="utf-8")
+    assert len(list((tmpdir / "cache" / "conversions").rglob("*.zip"))) == 2
+
+
+def test_poisoned_entry_is_a_miss(tmpdir, cursor_project):
+    """An entry with a member escaping the destination is ignored and replaced."""
+    from aamad.conversion_cache import _entry_path, conversion_key
+
+    key = conversion_key(cursor_project, "vscode", {"compact": False})
+    entry = _entry_path(key)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(entry, "w") as zf:
+        zf.writestr("../evil.md", "pwned")
+    events = []
+    install_vscode_copilot(cursor_project, tmpdir / "out" / "a", cache=True, on_event=events.append)
+    assert not (tmpdir / "out" / "evil.md").exists()
+    assert [e for e in events if e["event"] == "cache"] == [{"event": "cache", "action": "miss", "target": "vscode"}]
+    assert (tmpdir / "out" / "a" / ".github" / "instructions" / "aamad-core.instructions.md").is_file()
+
+
+@pytest.mark.parametrize("member", [".git/hooks/post-checkout", ".github/workflows/ci.yml", ".claude/rules/x.md"])
+def test_entry_outside_target_outputs_is_a_miss(tmpdir, cursor_project, member):
+    """A safe relative path that the vscode converter never writes invalidates the entry."""
+    from aamad.conversion_cache import _entry_path, conversion_key
+
+    key = conversion_key(cursor_project, "vscode", {"compact": False})
+    entry = _entry_path(key)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(entry, "w") as zf:
+        zf.writestr(".github/agents/qa-eng.agent.md", "cached")
+        zf.writestr(member, "pwned")
+    events = []
+    install_vscode_copilot(cursor_project, tmpdir / "out", cache=True, on_event=events.append)
+    assert not (tmpdir / "out" / member).exists()
+    assert [e["action"] for e in events if e["event"] == "cache"] == ["miss"]
+    assert (tmpdir / "out" / ".github" / "agents" / "qa-eng.agent.md").read_text(encoding="utf-8") != "cached"
@@ -0,0 +1,68 @@
+"""Unit tests for git fast-import export."""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.fast_import import _quote_path, export_install, write_stream
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def _git(*args: str, cwd: Path, stdin: bytes | None = None) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, input=stdin, capture_output=True, check=True
+    )
+    return result.stdout.decode("utf-8")
+
+
+def test_stream_commits_every_layout():
+    """The stream holds one commit with all IDE layouts, AGENTS.md and the manifest only."""
+    out = io.BytesIO()
+    count = export_install(out, timestamp=0, author="A <a@example.com>")
+    stream = out.getvalue()
+    assert stream.startswith(b"feature done\ncommit refs/heads/main\nauthor A <a@example.com> 0 +0000\n")
+    assert stream.endswith(b"\ndone\n")
+    paths = [line.split(b" ", 3)[3].decode() for line in stream.splitlines() if line.startswith(b"M 100")]
+    assert len(paths) == count
+    assert {"AGENTS.md", ".aamad/manifest.json", ".cursor/agents/qa-eng.md", ".claude/CLAUDE.md"} <= set(paths)
+    assert not [p for p in paths if p.startswith(".aamad/") and p != ".aamad/manifest.json"]
+
+
+def test_write_stream_quotes_paths_and_parents(tmpdir):
+    """Special characters in paths are C-quoted, and a branch built on itself uses ^0."""
+    (tmpdir / 'a"b.md').write_text("x", encoding="utf-8")
+    out = io.BytesIO()
+    write_stream(out, tmpdir, ['a"b.md'], branch="seed", parent="seed", timestamp=1)
+    assert b"from seed^0\n" in out.getvalue()
+    assert b'M 100644 inline "a\\"b.md"\ndata 1\nx\n' in out.getvalue()
+    assert _quote_path("plain dir/file.md") == "plain dir/file.md"
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_git_fast_import_builds_branch(tmpdir):
+    """git fast-import creates the commit in a bare repo, and --from stacks a second one."""
+    repo = tmpdir / "repo.git"
+    _git("init", "--bare", "-q", str(repo), cwd=tmpdir)
+    first = io.BytesIO()
+    export_install(first, ["cursor"])
+    _git("fast-import", "--quiet", cwd=repo, stdin=first.getvalue())
+    second = io.BytesIO()
+    export_install(second, ["claude-code"], parent="main", message="Add Claude Code")
+    _git("fast-import", "--quiet", cwd=repo, stdin=second.getvalue())
+    assert _git("log", "--format=%s", "main", cwd=repo).splitlines() == [
+        "Add Claude Code",
+        "Add AAMAD framework artifacts",
+    ]
+    files = _git("ls-tree", "-r", "--name-only", "main", cwd=repo).splitlines()
+    assert ".cursor/agents/qa-eng.md" in files and ".claude/CLAUDE.md" in files
@@ -0,0 +1,47 @@
+"""Unit tests for bundle extraction."""
+
+from __future__ import annotations
+
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from aamad.installer import ArtifactInstaller
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+@pytest.fixture
+def big_bundle(tmpdir):
+    path = tmpdir / "big.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i in range(300):
+            zf.writestr(f"dir{i % 7}/sub{i % 3}/file{i}.md", f"member {i}\n" * (i + 1))
+    return path
+
+
+def test_parallel_extraction_matches_serial(tmpdir, big_bundle):
+    """Extraction with several workers writes the same files as a single worker."""
+    installer = ArtifactInstaller(big_bundle)
+    serial = installer.extract(tmpdir / "serial", jobs=1)
+    parallel = installer.extract(tmpdir / "parallel", jobs=4)
+    assert len(serial) == len(parallel) == 300
+    for a, b in zip(serial, parallel):
+        assert a.read_bytes() == b.read_bytes()
+
+
+def test_existing_files_fail_before_any_write(tmpdir, big_bundle):
+    """Without overwrite, a conflicting file aborts extraction before anything is written."""
+    dest = tmpdir / "out"
+    conflict = dest / "dir5" / "sub2" / "file299.md"
+    conflict.parent.mkdir(parents=True)
+    conflict.write_text("mine", encoding="utf-8")
+    with pytest.raises(FileExistsError):
+        ArtifactInstaller(big_bundle).extract(dest, jobs=4)
+    assert [p for p in dest.rglob("*") if p.is_file()] == [conflict]
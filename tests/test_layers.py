@@ -0,0 +1,139 @@
+"""Unit tests for layered bundles."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from aamad.cli import main
+from aamad.installer import extract_artifacts, get_bundle_path
+from aamad.layers import prune_layers, resolve_layers
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+@pytest.fixture
+def cache(tmpdir, monkeypatch):
+    path = tmpdir / "cache"
+    monkeypatch.setenv("AAMAD_CACHE_DIR", str(path))
+    return path
+
+
+def _overlay_zip(path: Path, files: dict[str, str]) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in files.items():
+            zf.writestr(name, text)
+    return path
+
+
+def test_later_layers_win_and_add_files(tmpdir, cache):
+    """Overlay files replace base members of the same path and add new ones."""
+    org_zip = _overlay_zip(
+        tmpdir / "org.zip",
+        {".cursor/rules/aamad-core.mdc": "org core", ".cursor/rules/org.mdc": "org rule"},
+    )
+    team_dir = tmpdir / "team"
+    (team_dir / ".cursor" / "rules").mkdir(parents=True)
+    (team_dir / ".cursor" / "rules" / "org.mdc").write_text("team rule", encoding="utf-8")
+
+    merged = resolve_layers([get_bundle_path("cursor"), org_zip, team_dir])
+    with zipfile.ZipFile(merged) as zf:
+        assert zf.read(".cursor/rules/aamad-core.mdc") == b"org core"
+        assert zf.read(".cursor/rules/org.mdc") == b"team rule"
+        assert ".cursor/agents/product-mgr.md" in zf.namelist()
+
+
+def test_unchanged_stack_reuses_cached_merge(tmpdir, cache):
+    """The same stack resolves to the cached zip; editing a layer produces a new one."""
+    overlay = tmpdir / "overlay"
+    (overlay / ".cursor" / "rules").mkdir(parents=True)
+    rule = overlay / ".cursor" / "rules" / "org.mdc"
+    rule.write_text("v1", encoding="utf-8")
+
+    first = resolve_layers([get_bundle_path("cursor"), overlay])
+    mtime = first.stat().st_mtime_ns
+    assert resolve_layers([get_bundle_path("cursor"), overlay]) == first
+    assert first.stat().st_mtime_ns == mtime
+
+    rule.write_text("version 2", encoding="utf-8")
+    assert resolve_layers([get_bundle_path("cursor"), overlay]) != first
+
+
+def test_init_and_verify_with_overlay(tmpdir, cache, monkeypatch, capsys):
+    """init --overlay installs the merged stack and verify checks against it."""
+    monkeypatch.setenv("AAMAD_NO_DAEMON", "1")
+    overlay = _overlay_zip(tmpdir / "org.zip", {".cursor/rules/org.mdc": "org rule"})
+    dest = tmpdir / "proj"
+    assert main(["init", "--dest", str(dest), "--overlay", str(overlay)]) == 0
+    assert (dest / ".cursor" / "rules" / "org.mdc").read_text(encoding="utf-8") == "org rule"
+    assert main(["verify", "--dest", str(dest), "--overlay", str(overlay)]) == 0
+    capsys.readouterr()
+    with pytest.raises(SystemExit):
+        main(["bundle-info", "--overlay", str(tmpdir / "missing.zip")])
+
+
+def test_overlay_rules_and_agents_are_converted(tmpdir, cache):
+    """Rules and agents added by an overlay are converted for vscode and claude-code."""
+    overlay = _overlay_zip(
+        tmpdir / "org.zip",
+        {
+            ".cursor/rules/org-policy.mdc": "---\nalwaysApply: true\n---\n\n# Org policy\n",
+            ".cursor/agents/security-eng.md": "---\nagent:\n  name: Security Engineer\n---\n\n# Security\n",
+        },
+    )
+    vscode = tmpdir / "vscode"
+    bundle = resolve_layers([get_bundle_path("vscode"), overlay])
+    planned = extract_artifacts(vscode, ide="vscode", bundle=bundle, dry_run=True)
+    assert vscode.resolve() / ".github" / "instructions" / "org-policy.instructions.md" in planned
+    extract_artifacts(vscode, ide="vscode", bundle=bundle)
+    assert (vscode / ".github" / "instructions" / "org-policy.instructions.md").is_file()
+    assert (vscode / ".github" / "agents" / "security-eng.agent.md").is_file()
+    assert not (vscode / ".github" / "agents" / "dev-crew.agent.md").exists()
+
+    claude = tmpdir / "claude"
+    bundle = resolve_layers([get_bundle_path("claude-code"), overlay])
+    extract_artifacts(claude, ide="claude-code", bundle=bundle, compact=True)
+    assert (claude / ".claude" / "rules" / "org-policy.md").is_file()
+    assert (claude / ".claude" / "agents" / "security-eng.md").is_file()
+    assert "[org-policy](.claude/rules/org-policy.md)" in (claude / ".claude" / "CLAUDE.md").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_layer_cache_keeps_recently_used_stacks(tmpdir, cache):
+    """Only the most recently used merged stacks stay in the cache."""
+    overlay = tmpdir / "overlay"
+    (overlay / ".cursor" / "rules").mkdir(parents=True)
+    rule = overlay / ".cursor" / "rules" / "org.mdc"
+    merged = []
+    for i in range(3):
+        rule.write_text(f"version {i}", encoding="utf-8")
+        merged.append(resolve_layers([get_bundle_path("cursor"), overlay]))
+        os.utime(merged[-1], ns=(i * 10**9, merged[-1].stat().st_mtime_ns))
+    assert prune_layers(keep=2) == [merged[0]]
+    assert sorted(cache.joinpath("layers").glob("*.zip")) == sorted(merged[1:])
+
+
+def test_plain_claude_code_overlay_is_converted(tmpdir, cache, monkeypatch):
+    """Without --compact, overlay rules still reach .claude/ and are planned for rollback."""
+    monkeypatch.setenv("AAMAD_NO_DAEMON", "1")
+    overlay = tmpdir / "ov"
+    (overlay / ".cursor" / "rules").mkdir(parents=True)
+    (overlay / ".cursor" / "rules" / "org.mdc").write_text("# Org rule\n", encoding="utf-8")
+    dest = tmpdir / "proj"
+    assert main(["init", "--ide", "claude-code", "--dest", str(dest), "--overlay", str(overlay)]) == 0
+    assert (dest / ".claude" / "rules" / "org.md").is_file()
+    assert "[org](.claude/rules/org.md)" in (dest / ".claude" / "CLAUDE.md").read_text(encoding="utf-8")
+    assert main(["verify", "--ide", "claude-code", "--dest", str(dest), "--overlay", str(overlay)]) == 0
+
+    bundle = resolve_layers([get_bundle_path("claude-code"), overlay])
+    planned = extract_artifacts(dest, ide="claude-code", bundle=bundle, dry_run=True)
+    assert dest.resolve() / ".claude" / "rules" / "org.md" in planned
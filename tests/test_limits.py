@@ -0,0 +1,90 @@
+"""Unit tests for extraction resource limits."""
+
+from __future__ import annotations
+
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from aamad.installer import ArtifactInstaller, extract_artifacts
+from aamad.limits import NO_LIMITS, ExtractLimits, LimitExceeded, check_members, parse_limits
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def _zip(path: Path, members: dict[str, bytes]) -> Path:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path
+
+
+def _infos(path: Path) -> list[zipfile.ZipInfo]:
+    with zipfile.ZipFile(path) as zf:
+        return zf.infolist()
+
+
+def test_unsafe_paths_are_rejected_even_without_limits(tmpdir):
+    """Traversal and absolute paths fail regardless of the configured limits."""
+    bundle = _zip(tmpdir / "b.zip", {"ok.md": b"x", "../up.md": b"x", "/abs.md": b"x"})
+    with pytest.raises(LimitExceeded) as info:
+        check_members(_infos(bundle), NO_LIMITS)
+    assert len(info.value.violations) == 2
+
+
+def test_all_violations_are_reported(tmpdir):
+    """Ratio, member size, count, total and depth are checked in one pass."""
+    bundle = _zip(
+        tmpdir / "b.zip",
+        {"bomb.md": b"\0" * (2 << 20), "a/b/c/d.md": b"x", "e.md": b"y"},
+    )
+    limits = ExtractLimits(
+        max_total_bytes=1 << 20,
+        max_member_bytes=1 << 20,
+        max_ratio=10,
+        max_members=2,
+        max_depth=3,
+    )
+    with pytest.raises(LimitExceeded) as info:
+        check_members(_infos(bundle), limits)
+    text = str(info.value)
+    for fragment in ("compression ratio", "member limit", "3 members", "uncompressed bytes", "depth 4"):
+        assert fragment in text
+    check_members(_infos(bundle), NO_LIMITS)
+
+
+def test_extract_fails_before_any_write(tmpdir):
+    """A rejected bundle leaves the destination untouched."""
+    bundle = _zip(tmpdir / "b.zip", {"first.md": b"x", "deep/" * 20 + "x.md": b"x"})
+    dest = tmpdir / "dest"
+    dest.mkdir()
+    with pytest.raises(LimitExceeded):
+        ArtifactInstaller(bundle).extract(dest)
+    assert list(dest.iterdir()) == []
+    ArtifactInstaller(bundle).extract(dest, limits=parse_limits(["depth=none"]))
+    assert (dest / "first.md").is_file()
+
+
+def test_rejected_install_takes_no_lock(tmpdir):
+    """extract_artifacts rejects the bundle before creating the lock and state files."""
+    bundle = _zip(tmpdir / "b.zip", {"../evil.md": b"x"})
+    dest = tmpdir / "dest"
+    with pytest.raises(LimitExceeded):
+        extract_artifacts(dest, bundle=bundle)
+    assert not dest.exists()
+
+
+def test_parse_limits():
+    """KEY=VALUE overrides update single fields; bad keys raise ValueError."""
+    limits = parse_limits(["members=5", "ratio=none", "total-bytes=1024"])
+    assert limits.max_members == 5 and limits.max_ratio is None and limits.max_total_bytes == 1024
+    with pytest.raises(ValueError):
+        parse_limits(["size=1"])
+    with pytest.raises(ValueError):
+        parse_limits(["members=many"])
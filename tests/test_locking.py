@@ -0,0 +1,82 @@
+"""Unit tests for per-destination install locking."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from aamad.installer import extract_artifacts
+from aamad.locking import LockTimeout, run_exclusive
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def _slow(calls: list[str], name: str, paths: list[Path], delay: float = 0.3):
+    def fn() -> list[Path]:
+        calls.append(name)
+        time.sleep(delay)
+        return paths
+
+    return fn
+
+
+def _in_thread(results: dict, name: str, *args, **kwargs) -> threading.Thread:
+    thread = threading.Thread(target=lambda: results.__setitem__(name, run_exclusive(*args, **kwargs)))
+    thread.start()
+    return thread
+
+
+def test_identical_waiting_request_joins(tmpdir):
+    """A second identical request waits for the first and reuses its paths."""
+    calls: list[str] = []
+    results: dict = {}
+    first = _in_thread(results, "a", tmpdir, "same", _slow(calls, "a", [tmpdir / "x"]))
+    time.sleep(0.05)
+    second = _in_thread(results, "b", tmpdir, "same", _slow(calls, "b", []))
+    first.join()
+    second.join()
+    assert calls == ["a"]
+    assert results["a"] == ([tmpdir / "x"], False)
+    assert results["b"] == ([tmpdir / "x"], True)
+
+
+def test_different_request_waits_then_runs(tmpdir):
+    """A request with a different key is serialised, not joined."""
+    calls: list[str] = []
+    results: dict = {}
+    first = _in_thread(results, "a", tmpdir, "one", _slow(calls, "a", []))
+    time.sleep(0.05)
+    with pytest.raises(LockTimeout):
+        run_exclusive(tmpdir, "two", _slow(calls, "t", []), timeout=0.05)
+    second = _in_thread(results, "b", tmpdir, "two", _slow(calls, "b", [], delay=0))
+    first.join()
+    second.join()
+    assert calls == ["a", "b"]
+    assert results["b"][1] is False
+
+
+def test_concurrent_identical_inits_both_succeed(tmpdir):
+    """Parallel identical installs into one destination do not fail on existing files."""
+    errors: list[BaseException] = []
+
+    def install() -> None:
+        try:
+            extract_artifacts(tmpdir, ide="vscode")
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=install) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert (tmpdir / ".vscode" / "settings.json").exists()
@@ -0,0 +1,77 @@
+"""Unit tests for structured install reports."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad import InstallReport, install_artifacts
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_report_counts_fresh_install(tmpdir):
+    """A fresh install reports every written file, bytes read and written, and phase timings."""
+    events = []
+    report = install_artifacts(tmpdir / "p", snapshot=False, on_event=events.append)
+    assert isinstance(report, InstallReport)
+    assert report.paths and all(isinstance(p, Path) for p in report.paths)
+    extracted = [f for f in report.files if f.phase == "extract"]
+    assert report.actions["written"] == len(report.files)
+    assert report.files_decompressed == len(extracted) > 0
+    assert report.bytes_read > 0
+    assert report.bytes_written >= report.bytes_read
+    assert "extract" in [p.name for p in report.phases]
+    assert any(e["event"] == "file" for e in events)
+    data = report.to_dict()
+    assert data["files"] == len(report.paths)
+    assert len(data["details"]) == len(report.files)
+
+
+def test_report_distinguishes_overwritten_files(tmpdir):
+    """Re-installing skips unchanged files and reports replaced ones as overwritten."""
+    first = install_artifacts(tmpdir, snapshot=False)
+    edited = next(p for p in first.paths if p.suffix == ".mdc")
+    edited.write_text("local edit", encoding="utf-8")
+    report = install_artifacts(tmpdir, overwrite=True, snapshot=False)
+    extracted = {f.path: f.action for f in report.files if f.phase == "extract"}
+    assert extracted.pop(str(edited)) == "overwritten"
+    assert set(extracted.values()) == {"skipped"}
+    assert report.files_decompressed == 1
+
+
+def test_report_counts_cache_hits(tmpdir, monkeypatch):
+    """A second vscode install with the conversion cache reports hits instead of misses."""
+    monkeypatch.setenv("AAMAD_CACHE_DIR", str(tmpdir / "cache"))
+    first = install_artifacts(tmpdir / "a", ide="vscode", cache=True, snapshot=False)
+    second = install_artifacts(tmpdir / "b", ide="vscode", cache=True, snapshot=False)
+    assert first.cache_misses == 1 and first.cache_hits == 0
+    assert second.cache_hits == 1 and second.cache_misses == 0
+
+
+@pytest.mark.parametrize("ide,compact", [("vscode", False), ("claude-code", True)])
+def test_converted_files_stream_as_written(tmpdir, monkeypatch, ide, compact):
+    """Converters report each file as it is written, once, on cache misses and hits."""
+    monkeypatch.setenv("AAMAD_CACHE_DIR", str(tmpdir / "cache"))
+    settings = ".vscode/settings.json" if ide == "vscode" else ".claude/settings.json"
+    for dest in (tmpdir / "a", tmpdir / "b"):
+        events = []
+
+        def sink(event):
+            if event.get("action") == "converted":
+                if not events and ide == "vscode":
+                    # The first file is reported before the conversion has finished
+                    assert not (dest / settings).exists()
+                events.append(event)
+
+        report = install_artifacts(dest, ide=ide, compact=compact, cache=True, snapshot=False, on_event=sink)
+        paths = [e["path"] for e in events]
+        assert len(paths) == len(set(paths)) > 1
+        assert str(dest.resolve() / settings) in paths
+        assert report.actions["converted"] == len(paths)
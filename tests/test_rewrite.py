@@ -0,0 +1,38 @@
+"""Unit tests for the Cursor path-reference rewriter."""
+
+from __future__ import annotations
+
+from aamad.rewrite import CLAUDE_CODE_REWRITER, VSCODE_REWRITER, DirMapping, PathRewriter
+
+
+def test_claude_code_rewriter_maps_every_cursor_directory():
+    """Rules, agents and prompts are remapped; templates and unconverted files are kept."""
+    text = (
+        "See .cursor/rules/epics-index.mdc. Load `.cursor/rules/adapter-<name>.mdc`; "
+        "agents live in .cursor/agents/ (e.g. .cursor/agents/qa-eng.md), run "
+        ".cursor/prompts/prompt-phase-1 with .cursor/templates/prd-template.md "
+        "and .cursor/agents/dev-crew.md."
+    )
+    assert CLAUDE_CODE_REWRITER.rewrite(text) == (
+        "See .claude/rules/epics-index.md. Load `.claude/rules/adapter-<name>.md`; "
+        "agents live in .claude/agents/ (e.g. .claude/agents/qa-eng.md), run "
+        ".claude/commands/phase-1-define.md with .cursor/templates/prd-template.md "
+        "and .cursor/agents/dev-crew.md."
+    )
+
+
+def test_vscode_rewriter_uses_copilot_suffixes():
+    """VS Code outputs point at .instructions.md / .agent.md / .prompt.md files."""
+    text = ".cursor/rules/aamad-core.mdc, .cursor/agents/qa-eng.md, .cursor/prompts/prompt-phase-1"
+    assert VSCODE_REWRITER.rewrite(text) == (
+        ".github/instructions/aamad-core.instructions.md, "
+        ".github/agents/qa-eng.agent.md, "
+        ".github/prompts/phase-1-define.prompt.md"
+    )
+
+
+def test_custom_table_and_unmapped_directories():
+    """Only directories in the table are rewritten."""
+    rewriter = PathRewriter(dirs={"rules": DirMapping("docs/rules", ".mdc", ".txt")})
+    assert rewriter.rewrite("a .cursor/rules/x.mdc b .cursor/other/y") == "a docs/rules/x.txt b .cursor/other/y"
+    assert rewriter.rewrite("no references") == "no references"
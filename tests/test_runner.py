@@ -0,0 +1,114 @@
+"""Unit tests for the local workflow runner."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from aamad.runner import ACTION_BLOCKED, ACTION_FAILED, ACTION_RAN, ACTION_SKIPPED, run_workflow
+from aamad.workflow import Step, build_workflow
+
+AGENTS = [
+    ("pm", {"outputs": ["docs/prd.md"]}),
+    ("fe", {"inputs": ["docs/prd.md"], "outputs": ["build/fe.md"]}),
+    ("be", {"inputs": ["docs/prd.md"], "outputs": ["build/be.md"]}),
+    ("qa", {"inputs": ["build/fe.md", "build/be.md"], "outputs": ["build/qa.md"]}),
+]
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+class StubRunner:
+    """Writes each step's outputs after ``delay``; records concurrency."""
+
+    def __init__(self, delay: float = 0.05, fail: set[str] | None = None) -> None:
+        self.delay = delay
+        self.fail = fail or set()
+        self.calls: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, step: Step, root: Path) -> int:
+        with self._lock:
+            self.calls.append(step.id)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if step.id in self.fail:
+            return 1
+        for out in step.outputs:
+            path = root / out
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"{step.id} {time.time()}", encoding="utf-8")
+        return 0
+
+
+def test_independent_steps_run_concurrently(tmpdir):
+    """fe and be overlap; the critical path runs through one of them."""
+    stub = StubRunner()
+    report = run_workflow(tmpdir, stub, workflow=build_workflow(AGENTS, {}))
+    assert report.ok
+    assert stub.calls[0] == "pm" and stub.calls[-1] == "qa"
+    assert stub.max_active == 2
+    assert len(report.critical_path) == 3
+    assert report.critical_path[0] == "pm" and report.critical_path[-1] == "qa"
+
+
+def test_unchanged_steps_are_memoized(tmpdir):
+    """A second run skips everything; editing an input re-runs only its dependents."""
+    workflow = build_workflow(AGENTS, {})
+    run_workflow(tmpdir, StubRunner(delay=0), workflow=workflow)
+    stub = StubRunner(delay=0)
+    report = run_workflow(tmpdir, stub, workflow=workflow)
+    assert stub.calls == []
+    assert {r.action for r in report.results.values()} == {ACTION_SKIPPED}
+
+    (tmpdir / "build" / "be.md").write_text("edited", encoding="utf-8")
+    stub = StubRunner(delay=0)
+    run_workflow(tmpdir, stub, workflow=workflow)
+    assert stub.calls == ["qa"]
+
+
+def test_failure_blocks_dependents(tmpdir):
+    """A failing step blocks its dependents but not independent steps."""
+    report = run_workflow(tmpdir, StubRunner(delay=0, fail={"fe"}), workflow=build_workflow(AGENTS, {}))
+    actions = {sid: r.action for sid, r in report.results.items()}
+    assert actions == {"pm": ACTION_RAN, "fe": ACTION_FAILED, "be": ACTION_RAN, "qa": ACTION_BLOCKED}
+    assert not report.ok
+
+
+def test_command_template_keeps_shell_braces(tmpdir):
+    """Only {agent}/{inputs}/{outputs} are substituted, and the agent id is quoted."""
+    from aamad.runner import CommandRunner
+
+    step = Step("it's", ["docs/a b.md"], ["out/x.md"], [])
+    runner = CommandRunner("echo ${HOME:+set} {agent} {inputs} | awk '{print $1, $2}' > log.txt")
+    assert runner(step, tmpdir) == 0
+    assert (tmpdir / "log.txt").read_text(encoding="utf-8") == "set it's\n"
+
+
+def test_runner_exception_fails_only_that_step(tmpdir):
+    """A runner that raises fails its step and blocks dependents instead of crashing the run."""
+    stub = StubRunner(delay=0.01)
+
+    def runner(step: Step, root: Path) -> int:
+        if step.id == "fe":
+            raise RuntimeError("boom")
+        return stub(step, root)
+
+    events = []
+    report = run_workflow(tmpdir, runner, workflow=build_workflow(AGENTS, {}), on_event=events.append)
+    actions = {sid: r.action for sid, r in report.results.items()}
+    assert actions == {"pm": ACTION_RAN, "fe": ACTION_FAILED, "be": ACTION_RAN, "qa": ACTION_BLOCKED}
+    assert any(e["event"] == "error" and e["message"] == "boom" for e in events)
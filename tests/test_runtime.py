@@ -0,0 +1,66 @@
+"""Unit tests for runtime selection."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.installer import extract_artifacts, get_bundle_path
+from aamad.verify import verify_installation
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_runtime_prunes_adapters_and_sets_env(tmpdir):
+    """Only the chosen adapter is installed; CLAUDE.md and settings follow it."""
+    paths = extract_artifacts(tmpdir, ide="claude-code", runtime="claude-agent-sdk")
+    rules = tmpdir / ".claude" / "rules"
+    assert sorted(p.name for p in rules.glob("adapter-*")) == [
+        "adapter-claude-agent-sdk.md",
+        "adapter-registry.md",
+    ]
+    assert not any(p.name == "adapter-crewai.md" for p in paths)
+    claude_md = (tmpdir / ".claude" / "CLAUDE.md").read_text(encoding="utf-8")
+    assert "adapter-crewai" not in claude_md and "adapter-claude-agent-sdk" in claude_md
+    registry = (rules / "adapter-registry.md").read_text(encoding="utf-8")
+    assert "only `.claude/rules/adapter-claude-agent-sdk.md` is installed" in registry
+    settings = json.loads((tmpdir / ".claude" / "settings.json").read_text(encoding="utf-8"))
+    assert settings["env"]["AAMAD_TARGET_RUNTIME"] == "claude-agent-sdk"
+    # Pruned bundle members are not reported as missing
+    assert verify_installation(tmpdir, get_bundle_path("claude-code")).ok
+
+
+def test_runtime_rerun_keeps_one_selected_section(tmpdir):
+    """Re-installing with another runtime replaces the registry note instead of appending."""
+    extract_artifacts(tmpdir, ide="cursor", runtime="crewai")
+    extract_artifacts(tmpdir, ide="cursor", runtime="cursor-sdk", overwrite=True)
+    registry = (tmpdir / ".cursor" / "rules" / "adapter-registry.mdc").read_text(encoding="utf-8")
+    assert registry.count("## Selected Runtime") == 1
+    assert "`cursor-sdk`" in registry
+    assert not (tmpdir / ".cursor" / "rules" / "adapter-crewai.mdc").exists()
+
+
+def test_unknown_runtime_fails_before_writing(tmpdir):
+    """An unknown runtime raises ValueError without touching the destination."""
+    with pytest.raises(ValueError):
+        extract_artifacts(tmpdir, runtime="langgraph")
+    assert list(tmpdir.iterdir()) == []
+
+
+def test_runtime_leaves_other_ide_layouts_alone(tmpdir):
+    """A runtime install for one IDE does not prune or rewrite another IDE's layout."""
+    extract_artifacts(tmpdir, ide="cursor")
+    extract_artifacts(tmpdir, ide="claude-code", runtime="crewai", overwrite=True, snapshot=False)
+    cursor_rules = tmpdir / ".cursor" / "rules"
+    assert (cursor_rules / "adapter-cursor-sdk.mdc").is_file()
+    assert (cursor_rules / "adapter-claude-agent-sdk.mdc").is_file()
+    assert "## Selected Runtime" not in (cursor_rules / "adapter-registry.mdc").read_text(encoding="utf-8")
+    assert not (tmpdir / ".claude" / "rules" / "adapter-cursor-sdk.md").exists()
+    assert verify_installation(tmpdir, get_bundle_path("cursor")).ok
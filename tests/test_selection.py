@@ -0,0 +1,88 @@
+"""Unit tests for selective installs."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.installer import extract_artifacts, get_bundle_resource
+from aamad.report import ReportBuilder
+from aamad.selection import converted_name, parse_selection, source_name
+from aamad.verify import load_manifest, verify_installation
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def _installed(root: Path) -> set[str]:
+    return {
+        p.relative_to(root).as_posix()
+        for p in root.rglob("*")
+        if p.is_file() and not p.relative_to(root).as_posix().startswith(".aamad/")
+    }
+
+
+def test_selectors_expand_and_map_conversions():
+    """Components and agent ids cover every layout; unknown bare words are rejected."""
+    selection = parse_selection(exclude=["frontend-eng", "docs"])
+    assert not selection.selects(".claude/agents/frontend-eng.md")
+    assert not selection.selects(".github/agents/frontend-eng.agent.md")
+    assert not selection.selects("README.md")
+    assert selection.selects(".cursor/agents/backend-eng.md")
+    assert converted_name(".cursor/rules/aamad-core.mdc", "vscode") == ".github/instructions/aamad-core.instructions.md"
+    assert source_name(".claude/commands/phase-1-define.md", "claude-code") == ".cursor/prompts/prompt-phase-1"
+    with pytest.raises(ValueError, match="Unknown selector"):
+        parse_selection(only=["frontend"])
+
+
+def test_unselected_members_are_not_decompressed(tmpdir):
+    """Excluded members are never extracted and verify treats them as deliberately absent."""
+    builder = ReportBuilder()
+    paths = extract_artifacts(tmpdir, exclude=["templates", "docs", "frontend-eng"], on_event=builder)
+    report = builder.finish(paths)
+    installed = _installed(tmpdir)
+    assert ".cursor/agents/backend-eng.md" in installed
+    assert not [p for p in installed if "templates" in p or "frontend-eng" in p]
+    assert "README.md" not in installed and "CHECKLIST.md" not in installed
+    assert report.files_decompressed == len([f for f in report.files if f.phase == "extract"]) == 18
+    assert load_manifest(tmpdir)["README.md"]["excluded"] is True
+    assert verify_installation(tmpdir, get_bundle_resource("cursor")).ok
+
+
+@pytest.mark.parametrize("ide,compact", [("vscode", False), ("claude-code", True)])
+def test_converters_only_read_selected_sources(tmpdir, ide, compact):
+    """Converted layouts follow the selection, including sources already on disk."""
+    extract_artifacts(tmpdir, snapshot=False)  # a full Cursor install is present
+    extract_artifacts(
+        tmpdir, ide=ide, overwrite=True, snapshot=False, compact=compact, only=["agents"], exclude=["qa-eng"]
+    )
+    agents_dir = tmpdir / (".github/agents" if ide == "vscode" else ".claude/agents")
+    assert (agents_dir / ("backend-eng.agent.md" if ide == "vscode" else "backend-eng.md")).is_file()
+    assert not list(agents_dir.glob("qa-eng*"))
+    converted_rules = tmpdir / (".github/instructions" if ide == "vscode" else ".claude/rules")
+    assert not converted_rules.exists() or not list(converted_rules.iterdir())
+    if ide == "vscode":
+        planned = extract_artifacts(tmpdir / "dry", ide=ide, dry_run=True, only=["agents"], exclude=["qa-eng"])
+        rel = {p.relative_to((tmpdir / "dry").resolve()).as_posix() for p in planned}
+        assert ".github/agents/backend-eng.agent.md" in rel
+        assert not [p for p in rel if "qa-eng" in p or p.startswith(".github/instructions/")]
+
+
+def test_excluded_files_leave_no_dangling_references(tmpdir):
+    """Handoffs and CLAUDE.md links to unselected agents and rules are dropped."""
+    vscode = tmpdir / "vscode"
+    extract_artifacts(vscode, ide="vscode", exclude=["frontend-eng"])
+    project_mgr = (vscode / ".github" / "agents" / "project-mgr.agent.md").read_text(encoding="utf-8")
+    assert "frontend-eng" not in project_mgr and "backend-eng" in project_mgr
+
+    claude = tmpdir / "claude"
+    extract_artifacts(claude, ide="claude-code", exclude=["rules"])
+    claude_md = (claude / ".claude" / "CLAUDE.md").read_text(encoding="utf-8")
+    assert ".claude/rules/aamad-core.md" not in claude_md and "epics-index" not in claude_md
+    assert claude_md.startswith("# AAMAD Framework Rules")
+    assert verify_installation(claude, get_bundle_resource("claude-code")).ok
@@ -0,0 +1,115 @@
+"""Unit tests for the aamad serve daemon and its thin client."""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+import aamad.installer as installer
+import aamad.server as server
+from aamad.installer import get_bundle_path, open_bundle, preload_bundles
+from aamad.server import forward, request
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+@pytest.fixture(autouse=True)
+def no_preloaded_bundles(monkeypatch):
+    """Keep bundles preloaded by a test from leaking into later tests."""
+    monkeypatch.setattr(installer, "_PRELOADED", {})
+
+
+def test_forward_falls_back_when_no_daemon(tmpdir, monkeypatch):
+    """Without a listening daemon the client reports None so the CLI runs in-process."""
+    monkeypatch.delenv("AAMAD_NO_DAEMON", raising=False)
+    assert forward(["bundle-info"], socket_path=tmpdir / "missing.sock") is None
+    stale = tmpdir / "stale.sock"
+    stale.touch()
+    assert forward(["bundle-info"], socket_path=stale) is None
+
+
+def test_preloaded_bundles_keep_member_crcs():
+    """In-memory bundles are re-packed uncompressed with identical members and CRCs."""
+    preloaded = preload_bundles()
+    assert preloaded
+    with open_bundle(get_bundle_path("cursor")) as zf:
+        expected = {m.filename: m.CRC for m in zf.infolist()}
+    with open_bundle(preloaded["data/aamad_bundle.zip"]) as zf:
+        assert {m.filename: m.CRC for m in zf.infolist()} == expected
+        assert all(m.compress_type == 0 for m in zf.infolist())
+
+
+def test_daemon_serves_init_requests(tmpdir, monkeypatch, capsys):
+    """A running daemon executes forwarded init requests in the client's cwd."""
+    monkeypatch.delenv("AAMAD_NO_DAEMON", raising=False)
+    sock = tmpdir / "a.sock"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "aamad.cli", "serve", "--socket", str(sock)],
+        stdout=subprocess.DEVNULL,
+        env={**os.environ, "AAMAD_NO_DAEMON": ""},
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not sock.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        monkeypatch.chdir(tmpdir)
+        assert forward(["init", "--ide", "vscode", "--dest", "proj"], socket_path=sock) == 0
+        assert "Created:" in capsys.readouterr().out
+        assert (tmpdir / "proj" / ".github" / "agents" / "product-mgr.agent.md").exists()
+        # Errors come back as an exit status instead of killing the daemon
+        assert forward(["init", "--dest", "proj"], socket_path=sock) == 1
+        assert "already exists" in capsys.readouterr().err
+        assert request({"op": "ping"}, socket_path=sock)["code"] == 0
+        assert sock.stat().st_mode & 0o777 == 0o600
+
+        # The client's AAMAD_* environment applies to the forwarded command
+        monkeypatch.setenv("AAMAD_CACHE_DIR", str(tmpdir / "client-cache"))
+        assert forward(["init", "--ide", "vscode", "--dest", "proj2"], socket_path=sock) == 0
+        assert list((tmpdir / "client-cache" / "conversions").rglob("*.zip"))
+
+        # A daemon from another aamad version is not used
+        monkeypatch.setattr(server, "_aamad_version", lambda: "0.0.0-other")
+        assert forward(["init", "--dest", "proj3"], socket_path=sock) is None
+        assert not (tmpdir / "proj3").exists()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    assert not sock.exists()
+
+
+def test_forward_ignores_sockets_others_can_reach(tmpdir, monkeypatch):
+    """A socket that is not private to this user is never sent a request."""
+    monkeypatch.delenv("AAMAD_NO_DAEMON", raising=False)
+    path = tmpdir / "planted.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(path))
+        listener.listen(1)
+        path.chmod(0o666)
+        assert forward(["init", "--dest", "proj"], socket_path=path) is None
+        listener.settimeout(0.1)
+        with pytest.raises(socket.timeout):
+            listener.accept()
+
+
+def test_fallback_socket_dir_is_private(tmpdir, monkeypatch):
+    """Without XDG_RUNTIME_DIR the socket lives in a per-user 0700 temp directory."""
+    monkeypatch.delenv("AAMAD_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmpdir))
+    path = server.default_socket_path()
+    assert path == tmpdir / f"aamad-{os.getuid()}" / "aamad.sock"
+    path.parent.mkdir(mode=0o755)
+    path.parent.chmod(0o755)
+    with pytest.raises(PermissionError, match="0700"):
+        server.serve()
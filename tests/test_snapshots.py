@@ -0,0 +1,59 @@
+"""Unit tests for pre-overwrite snapshots and rollback."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.cli import main
+from aamad.installer import extract_artifacts
+from aamad.snapshots import create_snapshot, list_snapshots, rollback
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_overwrite_install_snapshots_and_rolls_back(tmpdir):
+    """An --overwrite install can be undone: replaced files return, new files go."""
+    extract_artifacts(tmpdir, ide="cursor")
+    readme = tmpdir / "README.md"
+    readme.write_text("local edits")
+
+    extract_artifacts(tmpdir, ide="vscode", overwrite=True)
+    assert readme.read_text() != "local edits"
+    assert (tmpdir / ".github" / "agents" / "qa-eng.agent.md").exists()
+    assert len(list_snapshots(tmpdir)) == 1
+
+    restored = rollback(tmpdir)
+    assert readme in restored
+    assert readme.read_text() == "local edits"
+    assert not (tmpdir / ".github").exists()
+    assert (tmpdir / ".cursor" / "rules" / "aamad-core.mdc").exists()
+
+
+def test_snapshot_retention_and_explicit_id(tmpdir):
+    """Older snapshots beyond the retention limit are pruned; --to picks one."""
+    target = tmpdir / "file.txt"
+    ids = []
+    for i in range(3):
+        target.write_text(f"v{i}")
+        ids.append(create_snapshot(tmpdir, [target], keep=2).id)
+    snapshots = list_snapshots(tmpdir)
+    assert [s.id for s in snapshots] == ids[1:]
+
+    target.write_text("latest")
+    rollback(tmpdir, ids[1])
+    assert target.read_text() == "v1"
+    with pytest.raises(FileNotFoundError):
+        rollback(tmpdir, ids[0])
+
+
+def test_snapshot_skipped_when_nothing_is_replaced(tmpdir):
+    """No archive is written when every planned path is new."""
+    assert create_snapshot(tmpdir, [tmpdir / "new.txt"]) is None
+    assert main(["rollback", "--dest", str(tmpdir)]) == 1
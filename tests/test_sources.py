@@ -0,0 +1,34 @@
+"""Unit tests for the converters' source ordering."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.sources import RULE_ORDER, agent_stems, rule_stems, source_stems
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_stock_names_keep_order_and_extras_follow_sorted():
+    """Known stems come in dependency order, overlay additions after them, sorted."""
+    names = [f".cursor/rules/{n}.mdc" for n in ("zeta", *reversed(RULE_ORDER), "org")]
+    assert rule_stems(names) == [*RULE_ORDER, "org", "zeta"]
+    agents = [".cursor/agents/dev-crew.md", ".cursor/agents/sec-eng.md", ".cursor/agents/qa-eng.md"]
+    assert agent_stems(agents) == ["qa-eng", "sec-eng"]
+    assert rule_stems([".cursor/rules/nested/x.mdc", ".cursor/rules/.mdc"]) == []
+
+
+def test_source_stems_reads_the_directory(tmpdir):
+    """Directory listings order the same way as bundle member names."""
+    for name in ("org.mdc", "aamad-core.mdc", "notes.txt"):
+        (tmpdir / name).write_text("x", encoding="utf-8")
+    (tmpdir / "sub.mdc").mkdir()
+    assert source_stems(tmpdir, ".mdc", RULE_ORDER) == ["aamad-core", "org"]
+    assert source_stems(tmpdir / "missing", ".mdc", RULE_ORDER) == []
@@ -0,0 +1,73 @@
+"""Unit tests for section-addressable templates."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.installer import extract_artifacts, get_bundle_path
+from aamad.snapshots import rollback
+from aamad.template_sections import split_template, split_templates
+from aamad.verify import verify_installation
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_split_template_writes_sections_and_index():
+    """Each heading up to ### becomes a file named by its anchor; #### stays inside."""
+    text = "# T\n\nIntro\n\n## Index\n\nx\n\n### 1\\. Goals\n\ng\n\n#### Detail\n\nd\n"
+    files = split_template(text, "demo-template")
+    assert list(files) == ["t.md", "index-section.md", "1-goals.md", "index.md"]
+    assert files["1-goals.md"] == "### 1\\. Goals\n\ng\n\n#### Detail\n\nd\n"
+    assert "| 1. Goals | [1-goals.md](1-goals.md) | 7 |" in files["index.md"]
+
+
+def test_install_splits_templates_and_repoints_agents(tmpdir):
+    """--split-templates writes section files, rewrites agent references and verifies clean."""
+    paths = extract_artifacts(tmpdir, ide="cursor", split_templates=True)
+    sad = tmpdir / ".cursor" / "templates" / "sad-template"
+    assert sad / "index.md" in paths
+    assert (sad / "4-backend-architecture-specification.md").is_file()
+    assert (tmpdir / ".cursor" / "templates" / "sad-template.md").is_file()
+    agent = (tmpdir / ".cursor" / "agents" / "system-arch.md").read_text(encoding="utf-8")
+    assert ".cursor/templates/sad-template/index.md" in agent
+    assert ".cursor/templates/sad-template.md" not in agent
+    assert verify_installation(tmpdir, get_bundle_path("cursor")).ok
+
+
+def test_section_references_point_at_section_files(tmpdir):
+    """References with an anchor go to that section's file; unknown anchors to the index."""
+    extract_artifacts(tmpdir, ide="cursor")
+    agent = tmpdir / ".cursor" / "agents" / "system-arch.md"
+    agent.write_text(
+        "Fill .cursor/templates/sad-template.md#4-backend-architecture-specification.\n"
+        "See .cursor/templates/sad-template.md#no-such-section.\n",
+        encoding="utf-8",
+    )
+    split_templates(tmpdir)
+    assert agent.read_text(encoding="utf-8") == (
+        "Fill .cursor/templates/sad-template/4-backend-architecture-specification.md.\n"
+        "See .cursor/templates/sad-template/index.md.\n"
+    )
+
+
+def test_rollback_removes_section_files(tmpdir):
+    """Section files are in the snapshot plan, so rollback removes them again."""
+    extract_artifacts(tmpdir, ide="cursor")
+    planned = extract_artifacts(tmpdir, ide="cursor", dry_run=True, split_templates=True)
+    sad = (tmpdir / ".cursor" / "templates" / "sad-template").resolve()
+    assert sad / "index.md" in planned
+
+    extract_artifacts(tmpdir, ide="cursor", overwrite=True, split_templates=True)
+    assert (sad / "index.md").is_file()
+    rollback(tmpdir)
+    assert not list(sad.glob("*.md"))
+    assert ".cursor/templates/sad-template.md" in (
+        tmpdir / ".cursor" / "agents" / "system-arch.md"
+    ).read_text(encoding="utf-8")
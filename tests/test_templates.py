@@ -0,0 +1,94 @@
+"""Unit tests for template rendering."""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import aamad.miniyaml as miniyaml
+from aamad.cli import main
+from aamad.installer import extract_artifacts
+from aamad.templates import (
+    compile_template,
+    load_values,
+    parse_set_args,
+    placeholder_keys,
+    render_template,
+)
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_render_template_both_placeholder_forms():
+    """{{ key }} and escaped-bracket placeholders render; unknown ones are kept."""
+    text = "Name: {{ project }}\nConcept: \\[INSERT YOUR SYSTEM\\]\nTools: \\[list\\_of\\_tools\\]"
+    assert placeholder_keys(text) == ["project", "insert_your_system", "list_of_tools"]
+    out = render_template(text, {"project": "Triage", "insert_your_system": "A crew"})
+    assert out == "Name: Triage\nConcept: A crew\nTools: \\[list\\_of\\_tools\\]"
+
+
+def test_compile_template_is_cached():
+    """Identical template text compiles once and is reused."""
+    text = "Hello {{ who }}"
+    assert compile_template(text) is compile_template(text)
+    assert compile_template(text) == ("Hello ", ("who", "{{ who }}"))
+
+
+def test_parse_set_args_and_load_values(tmpdir):
+    """--set pairs and values files both produce string mappings."""
+    assert parse_set_args(["a=1", "b=x=y"]) == {"a": "1", "b": "x=y"}
+    with pytest.raises(ValueError):
+        parse_set_args(["novalue"])
+
+    (tmpdir / "v.yaml").write_text("project: Triage\ncount: 3\n")
+    assert load_values(tmpdir / "v.yaml") == {"project": "Triage", "count": "3"}
+    (tmpdir / "v.json").write_text(json.dumps({"project": "Triage"}))
+    assert load_values(tmpdir / "v.json") == {"project": "Triage"}
+
+
+def test_extract_artifacts_renders_bundled_templates(tmpdir):
+    """Template values are rendered into .cursor/templates/ during extraction."""
+    extract_artifacts(
+        tmpdir,
+        values={"insert_your_multi_agent_system_description": "Support triage crew"},
+    )
+    prd = (tmpdir / ".cursor" / "templates" / "prd-template.md").read_text()
+    assert "**System Concept**: Support triage crew" in prd
+    # Placeholders without values stay for agents to fill in
+    assert "\\[PASTE YOUR COMPLETED DEEP RESEARCH REPORT HERE\\]" in prd
+
+
+def test_malformed_values_file_is_a_usage_error(tmpdir, monkeypatch, capsys):
+    """Unparseable values files raise ValueError, which init reports as a usage error."""
+    bad = tmpdir / "bad.yaml"
+    bad.write_text("project: Triage\n  nested: [unclosed\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid YAML"):
+        load_values(bad)
+    (tmpdir / "bad.json").write_text("{", encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid JSON"):
+        load_values(tmpdir / "bad.json")
+
+    monkeypatch.setenv("AAMAD_NO_DAEMON", "1")
+    with pytest.raises(SystemExit) as exc:
+        main(["init", "--dest", str(tmpdir / "proj"), "--values", str(bad)])
+    assert exc.value.code == 2
+    assert "invalid YAML" in capsys.readouterr().err
+
+    # Without PyYAML, failures of the fallback parser are wrapped the same way
+    def broken(text):
+        raise IndexError("unexpected end of document")
+
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    monkeypatch.setattr(miniyaml, "safe_load", broken)
+    miniyaml._load_cached.cache_clear()
+    with pytest.raises(ValueError, match="unexpected end of document"):
+        load_values(bad)
+    miniyaml._load_cached.cache_clear()
@@ -0,0 +1,100 @@
+"""Unit tests for installation integrity verification."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.cli import main
+from aamad.installer import extract_artifacts, get_bundle_path
+from aamad.verify import MANIFEST_PATH, file_crc32, load_manifest, verify_installation
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_fresh_install_verifies_from_manifest_without_hashing(tmpdir):
+    """extract_artifacts records a manifest so a clean tree needs no hashing."""
+    extract_artifacts(tmpdir, ide="cursor")
+    assert (tmpdir / MANIFEST_PATH).exists()
+    result = verify_installation(tmpdir, get_bundle_path("cursor"))
+    assert result.ok
+    assert result.checked > 0
+    assert result.hashed == 0
+
+
+def test_drift_reported_and_touched_files_rehashed(tmpdir):
+    """Edited and deleted files are drift; touched-but-equal files are re-recorded."""
+    extract_artifacts(tmpdir, ide="cursor")
+    (tmpdir / "CHECKLIST.md").write_text("edited")
+    (tmpdir / ".cursor" / "rules" / "epics-index.mdc").unlink()
+    readme = tmpdir / "README.md"
+    st = readme.stat()
+    os.utime(readme, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    result = verify_installation(tmpdir, get_bundle_path("cursor"), workers=4)
+    assert not result.ok
+    assert result.modified == ["CHECKLIST.md"]
+    assert result.missing == [".cursor/rules/epics-index.mdc"]
+    assert result.hashed == 2
+
+    # README verified by hash and was recorded; only the edited file is hashed again
+    assert verify_installation(tmpdir, get_bundle_path("cursor")).hashed == 1
+
+
+def test_rendered_templates_are_not_drift(tmpdir, capsys):
+    """Files transformed at install time verify against what was installed."""
+    extract_artifacts(tmpdir, ide="cursor", values={"feature_1": "Chat"})
+    (tmpdir / MANIFEST_PATH).unlink()
+    assert main(["verify", "--dest", str(tmpdir), "--json"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["modified"] == [".cursor/templates/prd-template.md"]
+
+    extract_artifacts(tmpdir, ide="cursor", overwrite=True, values={"feature_1": "Chat"})
+    assert main(["verify", "--dest", str(tmpdir)]) == 0
+
+
+
+def test_recorded_sha256_catches_crc_collisions(tmpdir, capsys):
+    """Files with a recorded SHA-256 are compared by it; --full ignores unchanged mtimes."""
+    extract_artifacts(tmpdir, ide="cursor")
+    path = tmpdir / "CHECKLIST.md"
+    st = path.stat()
+    data = path.read_bytes()
+    path.write_bytes(data[:-1] + (b"x" if data[-1:] != b"x" else b"y"))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    # Same size and mtime: only a full check hashes the file
+    assert verify_installation(tmpdir, get_bundle_path("cursor")).ok
+    assert verify_installation(tmpdir, get_bundle_path("cursor"), full=True).modified == ["CHECKLIST.md"]
+
+    # Even if the edit kept the CRC-32, the recorded SHA-256 differs
+    manifest = json.loads((tmpdir / MANIFEST_PATH).read_text(encoding="utf-8"))
+    entry = manifest["files"]["CHECKLIST.md"]
+    assert len(entry["sha256"]) == 64
+    entry["crc"] = file_crc32(path)
+    (tmpdir / MANIFEST_PATH).write_text(json.dumps(manifest), encoding="utf-8")
+    assert main(["verify", "--dest", str(tmpdir), "--full"]) == 1
+    assert "modified: CHECKLIST.md" in capsys.readouterr().out
+
+
+def test_converted_outputs_are_recorded_and_verified(tmpdir):
+    """Files the vscode converter writes are pinned in the manifest and verified."""
+    extract_artifacts(tmpdir, ide="vscode")
+    files = load_manifest(tmpdir)
+    assert files[".github/agents/qa-eng.agent.md"]["generated"] is True
+    assert ".vscode/settings.json" not in files
+    assert verify_installation(tmpdir, get_bundle_path("vscode")).ok
+
+    (tmpdir / ".github" / "agents" / "qa-eng.agent.md").write_text("edited", encoding="utf-8")
+    (tmpdir / ".github" / "instructions" / "aamad-core.instructions.md").unlink()
+    result = verify_installation(tmpdir, get_bundle_path("vscode"))
+    assert result.modified == [".github/agents/qa-eng.agent.md"]
+    assert result.missing == [".github/instructions/aamad-core.instructions.md"]
@@ -148,11 +148,22 @@ def test_rule_apply_to_always_apply():
 
 
 def test_rule_apply_to_globs():
-    """globs list -> first element as applyTo."""
+    """globs list -> every element, comma-joined, as applyTo."""
     from aamad.vscode_copilot import _rule_apply_to
 
     assert _rule_apply_to({"globs": ["src/**/*.py"]}) == "src/**/*.py"
-    assert _rule_apply_to({"globs": ["a", "b"]}) == "a"
+    assert _rule_apply_to({"globs": ["a", "b"]}) == "a,b"
+
+
+def test_rule_apply_to_comma_strings_braces_and_negations():
+    """Comma-joined globs are split, braces expanded, negations dropped."""
+    from aamad.vscode_copilot import _rule_apply_to
+
+    assert _rule_apply_to({"globs": "src/**/*.py, tests/**/*.py"}) == "src/**/*.py,tests/**/*.py"
+    assert _rule_apply_to({"globs": ["web/**/*.{ts,tsx}"]}) == "web/**/*.ts,web/**/*.tsx"
+    assert _rule_apply_to({"globs": ["src/**", "!src/vendor/**"]}) == "src/**"
+    assert _rule_apply_to({"globs": ["!docs/**"]}) == "**"
+    assert _rule_apply_to({"globs": ["a", "a", "**"]}) == "**"
 
 
 def test_rule_apply_to_empty_globs():
@@ -181,7 +192,7 @@ def test_convert_rules_creates_instructions(tmpdir, sample_mdc):
 
 
 def test_convert_rules_globs_mapping(tmpdir):
-    """Rule with globs gets applyTo from first glob."""
+    """Rule with globs gets applyTo from its globs."""
     rules_dir = tmpdir / "rules"
     rules_dir.mkdir()
     (rules_dir / "aamad-core.mdc").write_text(
@@ -436,3 +447,36 @@ def test_extract_artifacts_vscode_creates_github_and_agents_md(tmpdir):
     agents_md = (tmpdir / "AGENTS.md").read_text()
     assert ".github/agents/" in agents_md
     assert "VS Code" in agents_md or "Copilot" in agents_md
+
+
+def test_convert_rules_compact_dedupes(tmpdir):
+    """compact=True emits a paragraph shared by two rules only once."""
+    rules_dir = tmpdir / "rules"
+    rules_dir.mkdir()
+    shared = "Shared boilerplate paragraph for every adapter."
+    (rules_dir / "adapter-crewai.mdc").write_text(
+        f"---\ndescription: CrewAI\nalwaysApply: true\n---\n\n## Purpose\nCrewAI.\n\n{shared}\n"
+    )
+    (rules_dir / "adapter-cursor-sdk.mdc").write_text(
+        f"---\ndescription: Cursor SDK\nalwaysApply: true\n---\n\n## Purpose\nCursor.\n\n{shared}\n"
+    )
+
+    out = convert_rules(rules_dir, tmpdir, compact=True)
+    texts = [p.read_text() for p in out]
+    assert sum(t.count(shared) for t in texts) == 1
+    assert all("applyTo" in t for t in texts)
+
+
+def test_convert_agents_rewrites_cursor_references(tmpdir):
+    """Agent bodies point at the converted .github/ locations."""
+    agents_dir = tmpdir / "agents"
+    agents_dir.mkdir()
+    (agents_dir / "qa-eng.md").write_text(
+        "---\nagent:\n  name: QA\n  id: qa-eng\n---\n\n"
+        "Follow .cursor/rules/aamad-core.mdc and hand off to .cursor/agents/backend-eng.md.\n"
+    )
+    out = convert_agents(agents_dir, tmpdir)
+    text = out[0].read_text()
+    assert ".github/instructions/aamad-core.instructions.md" in text
+    assert ".github/agents/backend-eng.agent.md" in text
+    assert ".cursor/rules/" not in text
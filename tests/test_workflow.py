@@ -0,0 +1,77 @@
+"""Unit tests for the workflow graph and staleness status."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from aamad.workflow import (
+    STATE_MISSING,
+    STATE_OK,
+    STATE_STALE,
+    build_workflow,
+    load_workflow,
+    record_steps,
+    workflow_status,
+)
+
+AGENTS = [
+    ("pm", {"outputs": ["docs/prd.md", "handoff checklist"]}),
+    ("arch", {"agent": {"name": "Arch"}, "inputs": ["docs/prd.md"], "outputs": ["docs/sad.md"]}),
+    ("fe", {"inputs": ["docs/x.md"], "outputs": ["build/fe.md", "build/sfs/<id>.md"]}),
+    ("be", {"inputs": ["docs/sad.md"], "outputs": ["build/be.md"]}),
+]
+HANDOFFS = {"arch": [{"agent": "fe"}]}
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def _write(root: Path, rel: str, text: str = "x") -> None:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _states(root: Path) -> dict[str, str]:
+    workflow = build_workflow(AGENTS, HANDOFFS)
+    return {s.id: s.state for s in workflow_status(root, workflow)}
+
+
+def test_graph_from_outputs_and_handoffs():
+    """Edges come from matching outputs/inputs and from handoffs; prose entries are dropped."""
+    workflow = build_workflow(AGENTS, HANDOFFS)
+    assert workflow.order == ["pm", "arch", "be", "fe"]
+    assert workflow.steps["pm"].outputs == ["docs/prd.md"]
+    assert workflow.steps["fe"].after == ["arch"]
+    assert "docs/sad.md" in workflow.steps["fe"].inputs
+    assert workflow.steps["fe"].outputs[1] == "build/sfs/*.md"
+    assert workflow.downstream("arch") == ["be", "fe"]
+
+
+def test_bundled_workflow_follows_phases(tmpdir):
+    """The bundled agents form the Define -> Build chain."""
+    workflow = load_workflow(tmpdir)
+    order = workflow.order
+    assert order.index("product-mgr") < order.index("system-arch") < order.index("project-mgr")
+    assert order.index("integration-eng") < order.index("qa-eng")
+    assert {"frontend-eng", "backend-eng"} <= set(workflow.steps["integration-eng"].after)
+
+
+def test_status_reports_changed_inputs_downstream(tmpdir):
+    """Editing an upstream artifact marks its consumers and their dependents stale."""
+    for rel in ("docs/prd.md", "docs/sad.md", "build/fe.md", "build/be.md"):
+        _write(tmpdir, rel)
+    record_steps(tmpdir, ["pm", "arch", "fe", "be"], build_workflow(AGENTS, HANDOFFS))
+    assert set(_states(tmpdir).values()) == {STATE_OK}
+
+    _write(tmpdir, "docs/prd.md", "changed")
+    assert _states(tmpdir) == {"pm": STATE_OK, "arch": STATE_STALE, "be": STATE_STALE, "fe": STATE_STALE}
+
+    (tmpdir / "build" / "be.md").unlink()
+    assert _states(tmpdir)["be"] == STATE_MISSING
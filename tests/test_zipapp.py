@@ -0,0 +1,74 @@
+"""Unit tests for the single-file zipapp and its PyYAML-free fallback."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+from aamad.miniyaml import safe_dump, safe_load
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def tmpdir():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_miniyaml_matches_pyyaml_on_frontmatter_subset():
+    """The fallback parser agrees with PyYAML on the constructs artifacts use."""
+    text = (
+        "agent:\n"
+        "  name: QA Engineer  # comment\n"
+        "instructions:\n"
+        "- Plain item\n"
+        "- 'Quoted: item'\n"
+        "- Use context: PRD.\n"
+        "globs: [\"**/*.py\", 'src/**']\n"
+        "alwaysApply: false\n"
+        "handoffs:\n"
+        "  - label: Go\n"
+        "    send: true\n"
+    )
+    assert safe_load(text) == yaml.safe_load(text)
+
+
+def test_miniyaml_dump_round_trips_through_pyyaml():
+    """Emitted YAML quotes what needs quoting and parses back unchanged."""
+    data = {
+        "applyTo": "**",
+        "name": "Core: rules",
+        "tools": ["read", "edit"],
+        "handoffs": [{"label": "Go", "prompt": "Do it: now", "send": False}],
+        "description": "",
+    }
+    assert yaml.safe_load(safe_dump(data)) == data
+    assert safe_load(safe_dump(data)) == data
+
+
+def test_zipapp_runs_without_site_packages(tmpdir):
+    """aamad.pyz installs for VS Code using only the standard library."""
+    pyz = tmpdir / "aamad.pyz"
+    subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "build_zipapp.py"), "--output", str(pyz)],
+        check=True,
+        capture_output=True,
+    )
+    dest = tmpdir / "proj"
+    # -S: no site-packages, so neither PyYAML nor an installed aamad is importable
+    proc = subprocess.run(
+        [sys.executable, "-S", str(pyz), "init", "--ide", "vscode", "--dest", str(dest)],
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    agent = (dest / ".github" / "agents" / "product-mgr.agent.md").read_text(encoding="utf-8")
+    fm = yaml.safe_load(agent.split("---")[1])
+    assert fm["name"] == "Product Manager"
+    assert fm["handoffs"][0]["agent"] == "system-arch"